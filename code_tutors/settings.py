@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from django.contrib.messages import constants as messages
 
@@ -43,6 +44,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'tutorials.query_budget.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -82,9 +84,22 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # SQLite ignores select_for_update(), so take the write lock when a
+            # transaction starts rather than failing when two writers collide.
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
+        # Tests use an in-memory database unless the concurrency tests are
+        # asked for, as they need a file-backed one to see real locking (the
+        # shared in-memory one raises instead of waiting for the lock).
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'} if os.environ.get('CONCURRENCY_TESTS') else {},
     }
 }
 
+# Run the threaded concurrency tests: CONCURRENCY_TESTS=1 python manage.py test
+CONCURRENCY_TESTS = bool(os.environ.get('CONCURRENCY_TESTS'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -140,6 +155,21 @@ LOGIN_URL = 'log_in'
 # URL where @login_prohibited redirects to
 REDIRECT_URL_WHEN_LOGGED_IN = 'dashboard'
 
+# Book a freed tutor slot for the best pending student request when a lesson is cancelled
+AUTO_REMATCH = True
+
+# Where bank statement uploads write their reports of payments that matched no invoice
+PAYMENT_REPORT_DIR = BASE_DIR / 'payment_reports'
+
+# Outgoing mail (overdue invoice reminders) goes to the console while debugging;
+# set EMAIL_BACKEND (and EMAIL_FILE_PATH for the file backend) in the environment otherwise
+EMAIL_BACKEND = os.environ.get(
+    'EMAIL_BACKEND',
+    'django.core.mail.backends.console.EmailBackend' if DEBUG else 'django.core.mail.backends.smtp.EmailBackend',
+)
+EMAIL_FILE_PATH = os.environ.get('EMAIL_FILE_PATH', BASE_DIR / 'sent_emails')
+DEFAULT_FROM_EMAIL = 'invoices@codetutors.example'
+
 # Convert Django ERROR messages to Bootstrap DANGER messages
 MESSAGE_TAGS = {
     messages.ERROR: 'danger',
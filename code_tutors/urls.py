@@ -26,15 +26,24 @@ from tutorials.views import student_dashboard, tutor_dashboard, admin_dashboard,
 
 urlpatterns = [
     path('admin/analytics/', views.admin_analytics, name='admin_analytics'),
+    path('admin/api/<str:table>/', views.table_rows, name='table_rows'),
+    path('admin/analytics/revenue/', views.revenue_series, name='revenue_series'),
     path('admin/create_invoice/', views.create_invoice, name="create_invoice"),
     path('admin/dashboard/', views.admin_dashboard, name='admin_dashboard'), 
     path('admin/delete-invoice/<int:invoice_id>/', views.delete_invoice, name='delete_invoice'),
+    path('admin/export/<str:table>/', views.export_table, name='export_table'),
     path('admin/feedback/', views.admin_feedback, name='admin_feedback'),
+    path('admin/feedback/search/', views.feedback_search, name='feedback_search'),
     path('admin/invoices/', views.admin_invoices, name='admin_invoices'),
+    path('admin/invoices/bulk/', views.bulk_invoice_action, name='bulk_invoice_action'),
+    path('admin/payments/import/', views.import_payments, name='import_payments'),
+    path('admin/payments/reports/<str:name>/', views.payment_report, name='payment_report'),
     path('admin/lesson/<int:pk>/edit/', views.edit_lesson, name='edit_lesson'),
     path('admin/lesson/<int:pk>/delete/', views.delete_lesson, name='delete_lesson'),
     path('admin/requests/', views.admin_request_list, name='admin_request_list'),
+    path('admin/requests/pair/', views.pair_batch_requests, name='pair_batch_requests'),
     path('admin/pair/<int:student_request_id>/<int:tutor_request_id>/', views.pair_request, name='pair_request'),
+    path('admin/auto-pair/', views.auto_pair_requests, name='auto_pair_requests'),
     path('admin/', admin.site.urls),  # Built-in Django admin
     path('', views.home, name='home'),
     path('dashboard/', views.dashboard, name='dashboard'),
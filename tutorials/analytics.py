@@ -0,0 +1,143 @@
+"""The admin analytics summary: one aggregate query behind a short-lived cached snapshot."""
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Subquery, Sum, Value
+from django.db.models.functions import TruncMonth
+
+from .models import DailyRequestRollup, DailyRollup, Invoice, User
+
+SNAPSHOT_KEY = "analytics:summary"
+FRESH_KEY = "analytics:summary:fresh"
+LOCK_KEY = "analytics:summary:lock"
+SNAPSHOT_TTL = 60         # seconds a snapshot is served without recomputing
+STALE_TTL = 60 * 60       # seconds a stale snapshot may be served while another request recomputes it
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 0.05
+MAX_SERIES_MONTHS = 120   # longest range the revenue series endpoint serves
+
+
+def _whole_table(queryset):
+    """Group ``queryset`` by a constant, so annotations aggregate every row into one."""
+    return queryset.order_by().annotate(_all=Value(1)).values("_all")
+
+
+def _total(queryset, aggregate):
+    """A scalar subquery aggregating the whole queryset, e.g. (SELECT SUM(amount) FROM invoice)."""
+    return Subquery(_whole_table(queryset).annotate(total=aggregate).values("total"))
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(day, months):
+    """Return the first of the month ``months`` after the month of ``day``."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def compute_summary():
+    """Compute the analytics summary in a single query.
+
+    People are counted with conditional aggregates over the user table and
+    its profile joins; revenue, hours, feedback and pending requests are
+    scalar subqueries over the daily rollups in the same SELECT, so no fact
+    table is scanned.
+    """
+    this_month = month_start(date.today())
+    revenue = Sum(F("revenue_paid") + F("revenue_unpaid"), default=Decimal(0))
+    return _whole_table(User.objects).annotate(
+        total_tutors=Count("tutor_profile"),
+        total_students=Count("student_profile"),
+        active_tutors=Count("tutor_profile", filter=Q(is_active=True)),
+        active_students=Count("student_profile", filter=Q(is_active=True)),
+        hours_taught=_total(DailyRollup.objects, Sum("lesson_minutes", default=0)),
+        total_feedback=_total(DailyRollup.objects, Sum("feedback_count", default=0)),
+        total_revenue=_total(DailyRollup.objects, revenue),
+        monthly_revenue=_total(
+            DailyRollup.objects.filter(date__gte=this_month, date__lt=add_months(this_month, 1)), revenue
+        ),
+        pending_requests=_total(DailyRequestRollup.objects.filter(status="pending"), Sum("count", default=0)),
+    ).values(
+        "total_tutors", "total_students", "active_tutors", "active_students", "hours_taught",
+        "total_feedback", "total_revenue", "monthly_revenue", "pending_requests",
+    ).get()
+
+
+def summary():
+    """Return the cached analytics summary, recomputing it at most once at a time.
+
+    A snapshot is fresh for SNAPSHOT_TTL seconds or until a signal marks it
+    stale. Only the request that wins the cache lock recomputes it; the
+    others keep serving the stale snapshot, or wait briefly for the winner
+    when there is none yet.
+    """
+    snapshot = cache.get(SNAPSHOT_KEY)
+    if snapshot is not None and cache.get(FRESH_KEY):
+        return snapshot
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while not cache.add(LOCK_KEY, True, LOCK_TIMEOUT):
+        if snapshot is not None:
+            return snapshot
+        if time.monotonic() >= deadline:
+            return compute_summary()
+        time.sleep(LOCK_WAIT)
+        snapshot = cache.get(SNAPSHOT_KEY)
+        if snapshot is not None:
+            return snapshot
+    try:
+        snapshot = compute_summary()
+        cache.set(SNAPSHOT_KEY, snapshot, STALE_TTL)
+        cache.set(FRESH_KEY, True, SNAPSHOT_TTL)
+    finally:
+        cache.delete(LOCK_KEY)
+    return snapshot
+
+
+def invalidate():
+    """Mark the snapshot stale; the next request recomputes it."""
+    cache.delete(FRESH_KEY)
+
+
+def revenue_series(start, end):
+    """Return invoiced revenue per month and status for due dates in [start, end).
+
+    Rows are grouped by TruncMonth('due_date') and status in the database,
+    reading the (due_date, status) index for the range; statuses are stored
+    lower-case, so the column is grouped on as it is.
+    Every month of the range is present in the result, with zeros where
+    nothing was due, so it can be charted directly.
+    """
+    rows = (
+        Invoice.objects.filter(due_date__gte=start, due_date__lt=end)
+        .annotate(month=TruncMonth("due_date"))
+        .order_by()
+        .values("month", "status")
+        .annotate(total=Sum("amount"), invoices=Count("id"))
+    )
+    months = []
+    month = month_start(start)
+    while month < end:
+        months.append(month)
+        month = add_months(month, 1)
+    positions = {month: position for position, month in enumerate(months)}
+    series = {
+        status: {"total": [0.0] * len(months), "invoices": [0] * len(months)}
+        for status in ("paid", "unpaid")
+    }
+    for row in rows:
+        status = series.setdefault(
+            row["status"], {"total": [0.0] * len(months), "invoices": [0] * len(months)}
+        )
+        position = positions[row["month"]]
+        status["total"][position] = float(row["total"])
+        status["invoices"][position] = row["invoices"]
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "months": [month.strftime("%Y-%m") for month in months],
+        "series": series,
+    }
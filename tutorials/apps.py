@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class TutorialsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'tutorials'
\ No newline at end of file
+    name = 'tutorials'
+
+    def ready(self):
+        from . import signals  # noqa: F401
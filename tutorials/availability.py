@@ -0,0 +1,128 @@
+"""Weekly availability bitmaps: one bit per 30-minute slot, 7 x 48 bits per user."""
+from datetime import time
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from .models import LessonSchedule, TutorRequest
+from .scheduling import DAYS, lesson_intervals
+
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+AVAILABILITY_WINDOW = 120  # minutes a tutor stays free after a request's available_time
+FULL_DAY = (1 << SLOTS_PER_DAY) - 1
+BITMAP_TTL = 600  # bounds how long a bitmap cached from a write's pre-commit rows, or in another process, is used
+
+
+def slot_mask(day_of_week, start_time, duration):
+    """Return the bits covered by a lesson, rounded out to whole slots."""
+    mask = 0
+    for day, start, end in lesson_intervals(day_of_week, start_time, duration):
+        first, last = start // SLOT_MINUTES, -(-end // SLOT_MINUTES)
+        mask |= ((1 << (last - first)) - 1) << (DAYS.index(day) * SLOTS_PER_DAY + first)
+    return mask
+
+
+def day_mask(day_of_week):
+    """Return the bits of a whole weekday."""
+    day = (day_of_week or "").lower()
+    return FULL_DAY << (DAYS.index(day) * SLOTS_PER_DAY) if day in DAYS else 0
+
+
+def _busy_key(user_id):
+    return f"availability:busy:{user_id}"
+
+
+def _open_key(user_id):
+    return f"availability:open:{user_id}"
+
+
+def _busy_bitmaps(user_ids):
+    bitmaps = dict.fromkeys(user_ids, 0)
+    lessons = LessonSchedule.objects.filter(status="scheduled").filter(
+        Q(tutor_id__in=user_ids) | Q(student_id__in=user_ids)
+    )
+    rows = lessons.values_list("tutor_id", "student_id", "day_of_week", "start_time", "duration")
+    for tutor_id, student_id, day_of_week, start_time, duration in rows:
+        mask = slot_mask(day_of_week, start_time, duration)
+        for user_id in {tutor_id, student_id} & bitmaps.keys():
+            bitmaps[user_id] |= mask
+    return bitmaps
+
+
+def _open_bitmaps(user_ids):
+    bitmaps = dict.fromkeys(user_ids, 0)
+    tutor_requests = TutorRequest.objects.filter(tutor_id__in=user_ids, status="available")
+    for tutor_id, day_of_week, available_time in tutor_requests.values_list("tutor_id", "day_of_week", "available_time"):
+        if available_time is None:
+            bitmaps[tutor_id] |= day_mask(day_of_week)
+        else:
+            bitmaps[tutor_id] |= slot_mask(day_of_week, available_time, AVAILABILITY_WINDOW)
+    return bitmaps
+
+
+def busy_bitmap(user_id):
+    """Return the slots taken by the user's scheduled lessons, as tutor or student."""
+    bitmap = cache.get(_busy_key(user_id))
+    if bitmap is None:
+        bitmap = _busy_bitmaps({user_id})[user_id]
+        cache.set(_busy_key(user_id), bitmap, BITMAP_TTL)
+    return bitmap
+
+
+def open_bitmap(user_id):
+    """Return the slots a tutor has offered through available tutor requests.
+
+    A request with an available_time opens AVAILABILITY_WINDOW minutes from
+    that time; one without a time opens the whole day.
+    """
+    bitmap = cache.get(_open_key(user_id))
+    if bitmap is None:
+        bitmap = _open_bitmaps({user_id})[user_id]
+        cache.set(_open_key(user_id), bitmap, BITMAP_TTL)
+    return bitmap
+
+
+def warm(user_ids):
+    """Cache the busy and open bitmaps of many users with one query of each kind.
+
+    Pages that suggest times for a list of tutors call this first, so the
+    per-tutor lookups that follow are cache hits instead of queries.
+    """
+    user_ids = set(user_ids)
+    cached = cache.get_many([key for user_id in user_ids for key in (_busy_key(user_id), _open_key(user_id))])
+    missing_busy = {user_id for user_id in user_ids if _busy_key(user_id) not in cached}
+    missing_open = {user_id for user_id in user_ids if _open_key(user_id) not in cached}
+    bitmaps = {}
+    if missing_busy:
+        bitmaps.update({_busy_key(user_id): bitmap for user_id, bitmap in _busy_bitmaps(missing_busy).items()})
+    if missing_open:
+        bitmaps.update({_open_key(user_id): bitmap for user_id, bitmap in _open_bitmaps(missing_open).items()})
+    cache.set_many(bitmaps, BITMAP_TTL)
+
+
+def invalidate(*user_ids):
+    """Forget the cached bitmaps of the given users."""
+    cache.delete_many([key for user_id in user_ids for key in (_busy_key(user_id), _open_key(user_id))])
+
+
+def suggest_start_times(tutor_id, student_id, day_of_week, duration, limit=None):
+    """Return start times on the day when the tutor is open and neither side is busy."""
+    day = (day_of_week or "").lower()
+    if day not in DAYS:
+        return []
+    free = open_bitmap(tutor_id) & ~busy_bitmap(tutor_id) & ~busy_bitmap(student_id) & day_mask(day)
+    # Keep the slots that start a run of free slots long enough for the lesson.
+    runs = free
+    for offset in range(1, -(-int(duration) // SLOT_MINUTES)):
+        runs &= free >> offset
+    runs >>= DAYS.index(day) * SLOTS_PER_DAY
+    suggestions = []
+    slot = 0
+    while runs and (limit is None or len(suggestions) < limit):
+        if runs & 1:
+            minutes = slot * SLOT_MINUTES
+            suggestions.append(time(minutes // 60, minutes % 60))
+        runs >>= 1
+        slot += 1
+    return suggestions
@@ -0,0 +1,191 @@
+"""Billing runs: invoices for the scheduled lessons of a period, priced from tutor hourly rates.
+
+Also the bulk invoice actions of the admin invoices page, which write with
+one set-based statement and so apply what the invoice signals would have.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from time import perf_counter
+
+from django.db import IntegrityError, transaction
+
+from . import analytics, fragments, rollups
+from .filters import INVOICE_STATUSES
+from .models import BillingRun, Invoice, InvoiceLine, LessonSchedule, OutboxEmail, Student, Tutor
+from .scheduling import occurrence_count
+
+PAYMENT_TERMS = timedelta(days=14)  # invoices fall due this long after the period ends
+CENT = Decimal("0.01")
+INVOICE_FIELDS = ["id", "student_id", "due_date", "status", "amount"]  # what an invoice's rollup deltas read
+LESSON_FIELDS = ["id", "tutor_id", "student_id", "subject", "day_of_week", "start_time", "duration", "frequency", "starts_on"]
+
+
+# delete_invoices() removes these itself before its single DELETE of the invoices
+INVOICE_DEPENDANTS = {InvoiceLine, OutboxEmail}
+assert {relation.related_model for relation in Invoice._meta.related_objects} == INVOICE_DEPENDANTS, (
+    "delete_invoices() must delete every model referencing Invoice"
+)
+
+
+class BillingError(Exception):
+    """Raised when a period cannot be billed."""
+
+
+@dataclass
+class BillingResult:
+    run: BillingRun
+    created: bool = False
+    invoices: int = 0
+    total: Decimal = Decimal(0)
+    unbilled_lessons: int = 0  # lessons whose tutor or student has no profile to invoice
+    seconds: float = 0.0
+
+
+def lesson_price(hourly_rate, duration):
+    """Return the price of one occurrence of a lesson of ``duration`` minutes, to the cent."""
+    return (hourly_rate * duration / 60).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def plan_invoices(period_start, period_end, chunk_size=2000):
+    """Return the period's invoice lines per (student, tutor) profile pair and the unbilled lesson count.
+
+    Each line is (lesson id, subject, occurrences, unit price). Lessons are
+    streamed as named tuples and their occurrences counted, not expanded.
+    """
+    tutors = {
+        user_id: (tutor_id, rate) for user_id, tutor_id, rate in Tutor.objects.values_list("user_id", "id", "hourly_rate")
+    }
+    students = dict(Student.objects.values_list("user_id", "id"))
+    lessons = LessonSchedule.objects.filter(
+        status="scheduled", starts_on__lt=period_end
+    ).order_by().values_list(*LESSON_FIELDS, named=True)
+
+    lines, unbilled = defaultdict(list), 0
+    for lesson in lessons.iterator(chunk_size=chunk_size):
+        count = occurrence_count(lesson, period_start, period_end)
+        if not count:
+            continue
+        if lesson.tutor_id not in tutors or lesson.student_id not in students:
+            unbilled += 1
+            continue
+        tutor_id, rate = tutors[lesson.tutor_id]
+        price = lesson_price(rate, lesson.duration or 0)
+        lines[(students[lesson.student_id], tutor_id)].append((lesson.id, lesson.subject, count, price))
+    return lines, unbilled
+
+
+def bill_period(period_start, period_end, due_date=None, chunk_size=2000):
+    """Invoice every scheduled lesson occurrence from period_start up to period_end, once.
+
+    Each (student, tutor) pair with something to pay gets one invoice,
+    priced from the tutor's hourly rate, bulk created with its lines and the
+    BillingRun in one transaction. Billing the same period again returns the
+    existing run; a period overlapping another run is refused.
+    """
+    if period_start >= period_end:
+        raise BillingError("The billing period must end after it starts.")
+    started = perf_counter()
+    due_date = due_date or period_end + PAYMENT_TERMS
+
+    with transaction.atomic():
+        overlapping = BillingRun.objects.filter(period_start__lt=period_end, period_end__gt=period_start).first()
+        if overlapping is not None:
+            if (overlapping.period_start, overlapping.period_end) != (period_start, period_end):
+                raise BillingError(f"The period overlaps {overlapping}.")
+            return _existing_result(overlapping, started)
+        try:
+            with transaction.atomic():
+                run = BillingRun.objects.create(period_start=period_start, period_end=period_end)
+        except IntegrityError:
+            return _existing_result(BillingRun.objects.get(period_start=period_start, period_end=period_end), started)
+
+        lines, unbilled = plan_invoices(period_start, period_end, chunk_size=chunk_size)
+        invoices, groups = [], []
+        for (student_id, tutor_id), group in lines.items():
+            amount = sum((count * price for _, _, count, price in group), Decimal(0))
+            if amount:
+                invoices.append(Invoice(
+                    student_id=student_id, tutor_id=tutor_id, amount=amount,
+                    status="unpaid", due_date=due_date, billing_run=run,
+                ))
+                groups.append(group)
+        Invoice.objects.bulk_create(invoices, batch_size=chunk_size)
+        InvoiceLine.objects.bulk_create(
+            [
+                InvoiceLine(
+                    invoice=invoice, lesson_id=lesson_id, description=subject or "Lesson",
+                    quantity=count, unit_price=price, amount=count * price,
+                )
+                for invoice, group in zip(invoices, groups)
+                for lesson_id, subject, count, price in group
+            ],
+            batch_size=chunk_size,
+        )
+        # bulk_create skips the signals that keep rollups, balances, analytics and fragments current
+        rollups.apply([delta for invoice in invoices for delta in rollups.deltas(invoice)])
+        _invalidate_on_commit(invoices)
+
+    return BillingResult(
+        run=run, created=True, invoices=len(invoices), total=sum((invoice.amount for invoice in invoices), Decimal(0)),
+        unbilled_lessons=unbilled, seconds=perf_counter() - started,
+    )
+
+
+def _existing_result(run, started):
+    invoices = list(run.invoices.values_list("amount", flat=True))
+    return BillingResult(run=run, invoices=len(invoices), total=sum(invoices, Decimal(0)), seconds=perf_counter() - started)
+
+
+def _invalidate_on_commit(invoices):
+    student_ids = {invoice.student_id for invoice in invoices}
+    transaction.on_commit(analytics.invalidate)
+    transaction.on_commit(lambda: fragments.bump(fragments.INVOICES, *student_ids))
+
+
+def _locked_invoices(invoice_ids):
+    # only() reads just the columns the rollup and balance contributions need
+    return list(Invoice.objects.filter(id__in=invoice_ids).select_for_update().only(*INVOICE_FIELDS))
+
+
+def set_invoice_status(invoice_ids, status):
+    """Give the invoices ``status`` with one UPDATE and return how many changed.
+
+    Invoices that already have the status are left out, so the count is of
+    real changes. The rows are read once, under lock, for their rollup and
+    balance contributions.
+    """
+    if status not in INVOICE_STATUSES:
+        raise BillingError(f"Unknown invoice status {status!r}.")
+    with transaction.atomic():
+        invoices = [invoice for invoice in _locked_invoices(invoice_ids) if invoice.status != status]
+        if not invoices:
+            return 0
+        changed = Invoice.objects.filter(id__in=[invoice.id for invoice in invoices]).update(status=status)
+        changes = [delta for invoice in invoices for delta in rollups.deltas(invoice, -1)]
+        for invoice in invoices:
+            invoice.status = status
+        rollups.apply(changes + [delta for invoice in invoices for delta in rollups.deltas(invoice)])
+        _invalidate_on_commit(invoices)
+    return changed
+
+
+def delete_invoices(invoice_ids):
+    """Delete the invoices, their lines and emails with one DELETE each and return how many invoices went.
+
+    The rows are read once, under lock, for their rollup and balance
+    contributions, which are then taken off in one go rather than by the
+    per-row delete signals.
+    """
+    with transaction.atomic():
+        invoices = _locked_invoices(invoice_ids)
+        if not invoices:
+            return 0
+        ids = [invoice.id for invoice in invoices]
+        InvoiceLine.objects.filter(invoice_id__in=ids).delete()
+        OutboxEmail.objects.filter(invoice_id__in=ids).delete()
+        deleted = Invoice.objects.filter(id__in=ids).delete_rows()
+        rollups.apply([delta for invoice in invoices for delta in rollups.deltas(invoice, -1)])
+        _invalidate_on_commit(invoices)
+    return deleted
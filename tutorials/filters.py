@@ -0,0 +1,52 @@
+"""The language and status filters of the admin tables.
+
+The dashboard, the exports and the table API read the same ?language= and
+?status= parameters. A status only filters the tables it is a status of,
+so one set of parameters can be applied to every table.
+"""
+STUDENT_REQUEST_STATUSES = ["pending", "approved"]
+TUTOR_REQUEST_STATUSES = ["available", "scheduled"]
+LESSON_STATUSES = ["scheduled", "cancelled"]
+INVOICE_STATUSES = ["paid", "unpaid"]
+
+
+def dashboard_filters(params):
+    """Return the filters submitted in a query dict."""
+    return {
+        "language": params.get("language", ""),
+        "status": params.get("status", ""),
+    }
+
+
+def student_requests(queryset, filters):
+    if filters["language"]:
+        queryset = queryset.filter(language=filters["language"])
+    if filters["status"] in STUDENT_REQUEST_STATUSES:
+        queryset = queryset.filter(status=filters["status"])
+    return queryset
+
+
+def tutor_requests(queryset, filters):
+    if filters["language"]:
+        queryset = queryset.teaching(filters["language"])
+    if filters["status"] in TUTOR_REQUEST_STATUSES:
+        queryset = queryset.filter(status=filters["status"])
+    return queryset
+
+
+def lessons(queryset, filters):
+    if filters["language"]:
+        queryset = queryset.filter(subject__iexact=filters["language"])
+    if filters["status"] in LESSON_STATUSES:
+        queryset = queryset.filter(status=filters["status"])
+    return queryset
+
+
+def invoices(queryset, filters):
+    if filters["status"] in INVOICE_STATUSES:
+        queryset = queryset.filter(status=filters["status"])
+    return queryset
+
+
+def feedback(queryset, filters):
+    return queryset
@@ -3,6 +3,7 @@ from django import forms
 from django.contrib.auth import authenticate
 from django.core.validators import RegexValidator
 from .models import User, Feedback, LessonSchedule, StudentRequest, TutorRequest
+from .scheduling import find_conflict
 
 class LogInForm(forms.Form):
     """Form enabling registered users to log in."""
@@ -160,6 +161,25 @@ class LessonScheduleForm(forms.ModelForm):
         self.fields['tutor'].disabled = True
         self.fields['student'].disabled = True
 
+    def clean(self):
+        """Reject a scheduled lesson that double-books its tutor or student."""
+        cleaned_data = super().clean()
+        tutor = cleaned_data.get('tutor')
+        student = cleaned_data.get('student')
+        start_time = cleaned_data.get('start_time')
+        duration = cleaned_data.get('duration')
+        if tutor and student and start_time and duration and cleaned_data.get('status') == 'scheduled':
+            conflict = find_conflict(
+                tutor.id, student.id, cleaned_data.get('day_of_week'), start_time, duration,
+                exclude=self.instance.pk, frequency=cleaned_data.get('frequency'), starts_on=self.instance.starts_on,
+            )
+            if conflict is not None:
+                raise forms.ValidationError(
+                    f"This lesson overlaps with {conflict.subject} on {conflict.day_of_week} at "
+                    f"{conflict.start_time:%H:%M}."
+                )
+        return cleaned_data
+
 class StudentRequestForm(forms.ModelForm):
     class Meta:
         model = StudentRequest
@@ -0,0 +1,45 @@
+"""Versioned cache keys for the per-user table fragments of the dashboards.
+
+Each rendered table is cached under its owner's current version of the
+fragment kind, and signals bump that version when a row the table shows
+changes, so stale fragments are never read again and simply expire.
+"""
+import time
+
+from django.core.cache import cache
+
+FRAGMENT_TTL = 300  # also bounds how long a renamed tutor or student shows in someone else's table
+
+LESSONS = "lessons"     # owned by the tutor's and the student's user id
+REQUESTS = "requests"   # owned by the requesting student's or tutor's user id
+INVOICES = "invoices"   # owned by the student profile id, as stored on Invoice.student_id
+
+
+def _version_key(kind, owner_id):
+    return f"fragments:{kind}:{owner_id}"
+
+
+def version(kind, owner_id):
+    """Return the owner's current version of a fragment kind, starting one if needed."""
+    key = _version_key(kind, owner_id)
+    current = cache.get(key)
+    if current is None:
+        # Start from the clock rather than 1, so a version lost to eviction never
+        # comes back to a number some still-cached fragment was stored under.
+        cache.add(key, time.time_ns(), None)
+        current = cache.get(key)
+    return current
+
+
+def context(kind, owner_id):
+    """Return the template context the {% cache %} tag of a fragment needs."""
+    return {"fragment_ttl": FRAGMENT_TTL, "fragment_version": version(kind, owner_id)}
+
+
+def bump(kind, *owner_ids):
+    """Move the given owners to a new version of a fragment kind."""
+    for owner_id in set(owner_ids):
+        try:
+            cache.incr(_version_key(kind, owner_id))
+        except ValueError:
+            pass  # no version yet, so no fragment was cached under one
@@ -0,0 +1,92 @@
+"""Background jobs drained from the Request priority queue."""
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .analytics import add_months, month_start
+from .billing import bill_period
+from .matching import auto_pair
+from .models import Request
+from .reminders import deliver, scan_overdue
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+def handler(job_type):
+    """Register the decorated function as the handler for requests of ``job_type``."""
+    def register(function):
+        HANDLERS[job_type] = function
+        return function
+    return register
+
+
+def enqueue(user, job_type, priority="medium", payload=None):
+    """Queue a job on behalf of ``user``; workers pick it up in priority order.
+
+    ``payload`` holds JSON arguments fixed at queueing time, which the
+    handler reads from ``job.payload``.
+    """
+    if job_type not in HANDLERS:
+        raise ValueError(f"No handler registered for job type {job_type!r}.")
+    return Request.objects.create(student=user, type=job_type, priority=priority, payload=payload or {})
+
+
+def enqueue_billing_run(user, period_start=None, period_end=None, priority="medium"):
+    """Queue a billing run for [period_start, period_end), by default the calendar month before today.
+
+    The period is worked out now and stored with the job, so a job that
+    waits in the queue past the end of the month still bills the right one.
+    """
+    if period_start is None or period_end is None:
+        period_end = month_start(timezone.localdate())
+        period_start = add_months(period_end, -1)
+    payload = {"period_start": period_start.isoformat(), "period_end": period_end.isoformat()}
+    return enqueue(user, "billing_run", priority=priority, payload=payload)
+
+
+def run_jobs(batch_size=10):
+    """Claim and run queued jobs until the queue is empty; return (completed, failed).
+
+    Each job runs in its own transaction. A failing job is logged and left
+    allocated and in progress, so it is not retried blindly by every worker.
+    """
+    completed = failed = 0
+    while batch := Request.objects.claim(batch_size, types=HANDLERS):
+        for job in batch:
+            try:
+                with transaction.atomic():
+                    HANDLERS[job.type](job)
+                    Request.objects.filter(id=job.id).update(status="completed")
+                completed += 1
+            except Exception:
+                logger.exception("Job %s (%s) failed", job.id, job.type)
+                failed += 1
+    return completed, failed
+
+
+@handler("auto_pair")
+def run_auto_pair(job):
+    return auto_pair()
+
+
+@handler("billing_run")
+def run_billing(job):
+    """Bill the period stored in the job's payload by enqueue_billing_run().
+
+    A job queued without a period bills the calendar month before the one
+    it runs in.
+    """
+    if "period_start" in job.payload:
+        return bill_period(parse_date(job.payload["period_start"]), parse_date(job.payload["period_end"]))
+    this_month = month_start(timezone.localdate())
+    return bill_period(add_months(this_month, -1), this_month)
+
+
+@handler("overdue_reminders")
+def run_overdue_reminders(job):
+    """Queue reminders for overdue invoices and send what the outbox holds."""
+    return scan_overdue(), deliver()
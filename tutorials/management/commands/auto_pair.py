@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from tutorials.matching import auto_pair
+
+
+class Command(BaseCommand):
+    """Pair every pending student request with an available tutor slot."""
+
+    help = 'Pairs all pending student requests with available tutor slots in one pass'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Compute the matching and report on it without writing lessons.',
+        )
+
+    def handle(self, *args, **options):
+        result = auto_pair(dry_run=options['dry_run'])
+        verb = "Would pair" if result.dry_run else "Paired"
+        self.stdout.write(
+            f"{verb} {result.matched}/{result.pending} pending requests "
+            f"({result.match_rate:.1%}) in {result.seconds:.2f}s"
+        )
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from tutorials.analytics import add_months, month_start
+from tutorials.billing import BillingError, bill_period
+
+
+def _date(value):
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise CommandError(f"{value!r} is not a date in YYYY-MM-DD format.")
+    return day
+
+
+class Command(BaseCommand):
+    """Invoice the scheduled lessons of a billing period."""
+
+    help = 'Creates one invoice per student and tutor for the lessons in a period; re-running a period is a no-op'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=_date, help='First day of the period (default: first of last month).')
+        parser.add_argument('--end', type=_date, help='Day after the period (default: a month after --start).')
+        parser.add_argument('--due-date', type=_date, help='Due date of the invoices (default: 14 days after --end).')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Lessons fetched and invoices inserted per round trip (default: %(default)s).',
+        )
+
+    def handle(self, *args, **options):
+        this_month = month_start(timezone.localdate())
+        start = options['start'] or add_months(this_month, -1)
+        end = options['end'] or add_months(start, 1)
+        try:
+            result = bill_period(start, end, due_date=options['due_date'], chunk_size=options['chunk_size'])
+        except BillingError as error:
+            raise CommandError(str(error))
+        if not result.created:
+            self.stdout.write(f"{start} to {end} was already billed: {result.invoices} invoices totalling {result.total}")
+            return
+        self.stdout.write(
+            f"Billed {start} to {end}: {result.invoices} invoices totalling {result.total} "
+            f"in {result.seconds:.2f}s ({result.unbilled_lessons} lessons without a tutor or student profile)"
+        )
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from tutorials.payments import PaymentImportError, import_payments
+
+
+class Command(BaseCommand):
+    """Mark invoices paid from a bank statement CSV."""
+
+    help = 'Matches the payments in a CSV with reference and amount columns to unpaid invoices and marks them paid'
+
+    def add_arguments(self, parser):
+        parser.add_argument('statement', help='Path of the bank statement CSV.')
+        parser.add_argument(
+            '--report',
+            help='Where to write the rows that matched no invoice (default: the statement path + .unmatched.csv).',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Invoices fetched and updated per round trip (default: %(default)s).',
+        )
+
+    def handle(self, *args, **options):
+        report_path = options['report'] or f"{options['statement']}.unmatched.csv"
+        try:
+            with open(options['statement'], newline='', encoding='utf-8-sig') as statement, \
+                    open(report_path, 'w', newline='', encoding='utf-8') as report:
+                result = import_payments(statement, report, chunk_size=options['chunk_size'])
+        except (OSError, PaymentImportError) as error:
+            raise CommandError(str(error))
+        self.stdout.write(
+            f"Read {result.rows} payments in {result.seconds:.2f}s: {result.paid} invoices marked paid, "
+            f"{result.unmatched} unmatched rows written to {report_path}"
+        )
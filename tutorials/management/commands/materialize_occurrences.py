@@ -0,0 +1,26 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from tutorials.models import LessonOccurrence, LessonSchedule
+from tutorials.scheduling import OCCURRENCE_HORIZON, materialize_occurrences
+
+
+class Command(BaseCommand):
+    """Roll the materialised lesson occurrence table forward."""
+
+    help = 'Expands scheduled lessons into LessonOccurrence rows for the rolling horizon'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=OCCURRENCE_HORIZON.days,
+            help='Number of days ahead to materialise (default: %(default)s).',
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        end = today + timedelta(days=options['days'])
+        removed, _ = LessonOccurrence.objects.filter(date__gte=today).exclude(lesson__status='scheduled').delete()
+        count = materialize_occurrences(LessonSchedule.objects.filter(status='scheduled'), today, end)
+        self.stdout.write(f"Expanded {count} occurrences up to {end} and removed {removed} stale ones")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from tutorials.rollups import rebuild
+
+
+class Command(BaseCommand):
+    """Recompute the daily analytics rollups from the fact tables."""
+
+    help = 'Rebuilds the daily rollup tables with a streaming scan of invoices, lessons, requests, feedback and users'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Rows fetched per round trip while scanning (default: %(default)s).',
+        )
+
+    def handle(self, *args, **options):
+        days, request_rows = rebuild(chunk_size=options['chunk_size'])
+        self.stdout.write(f"Rebuilt rollups for {days} days and {request_rows} request groups")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from tutorials.jobs import run_jobs
+
+
+class Command(BaseCommand):
+    """Drain the Request priority queue."""
+
+    help = 'Claims queued jobs in priority order and runs them until the queue is empty'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10,
+            help='Number of jobs to claim at a time.',
+        )
+
+    def handle(self, *args, **options):
+        completed, failed = run_jobs(batch_size=options['batch_size'])
+        self.stdout.write(f"Completed {completed} jobs, {failed} failed")
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from tutorials.models import User
+from tutorials.scheduling import overlap_report
+
+
+class Command(BaseCommand):
+    """Report every pair of scheduled lessons that double-books a user."""
+
+    help = 'Lists all overlapping scheduled lessons in the database'
+
+    def handle(self, *args, **options):
+        overlaps = list(overlap_report())
+        usernames = dict(
+            User.objects.filter(id__in={user_id for user_id, *_ in overlaps}).values_list('id', 'username')
+        )
+        for user_id, day, lesson_id, other_id in overlaps:
+            self.stdout.write(f"{usernames.get(user_id, user_id)} on {day}: lesson {lesson_id} overlaps lesson {other_id}")
+        self.stdout.write(f"Found {len(overlaps)} overlapping lesson pairs")
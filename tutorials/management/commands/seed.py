@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
-from tutorials.models import User, Student, Tutor, StudentRequest, TutorRequest, LessonSchedule, Feedback
+from tutorials.models import User, Student, Tutor, StudentRequest, TutorRequest, TutorLanguage, LessonSchedule, Feedback
+from tutorials.rollups import rebuild as rebuild_rollups
 import pytz
 from faker import Faker
 from random import choice
@@ -35,6 +36,8 @@ class Command(BaseCommand):
         self.generate_tutor_requests()
         self.generate_lessons()
         self.generate_feedback()
+        # bulk_create skips the signals that maintain the analytics rollups
+        rebuild_rollups()
         print("Seeding complete!")
 
     def create_user(self, data):
@@ -289,6 +292,9 @@ class Command(BaseCommand):
         if tutor_requests:
             TutorRequest.objects.bulk_create(tutor_requests)
 
+        # bulk_create skips TutorRequest.save(), so index the languages here
+        TutorLanguage.rebuild(TutorRequest.objects.filter(language_tokens__isnull=True))
+
         print(f"Created {self.TUTOR_REQUEST_COUNT} tutor requests")
 
 def create_username(first_name, last_name, existing_emails):
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from tutorials.reminders import BATCH_SIZE, deliver, scan_overdue
+
+
+class Command(BaseCommand):
+    """Remind students about overdue invoices through the email outbox."""
+
+    help = 'Writes reminders for unpaid invoices past their due date to the outbox and sends the outbox in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Emails handed to the email backend at a time (default: %(default)s).',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Overdue invoices fetched and reminders inserted per round trip (default: %(default)s).',
+        )
+        parser.add_argument('--scan-only', action='store_true', help='Fill the outbox without sending anything.')
+
+    def handle(self, *args, **options):
+        written = scan_overdue(chunk_size=options['chunk_size'])
+        self.stdout.write(f"Queued {written} overdue invoice reminders")
+        if options['scan_only']:
+            return
+        result = deliver(batch_size=options['batch_size'])
+        self.stdout.write(f"Sent {result.sent} emails ({result.failed} failed)")
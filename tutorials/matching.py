@@ -0,0 +1,283 @@
+"""Automatic pairing of pending student requests with available tutor slots."""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from django.db import transaction
+
+from .models import LEVEL_CHOICES, LessonSchedule, StudentRequest, TutorLanguage, TutorRequest, tokenize_languages
+from .pairing import book
+from .scheduling import ScheduleIndex
+
+LEVELS = [level for level, _ in LEVEL_CHOICES]
+DEFAULT_DURATION = 60
+LEVEL_GAP_COST = 120       # one level of over-qualification costs as much as two hours of time drift
+UNMATCHED_COST = 10 ** 9   # larger than any sum of pair costs, so more matches always win
+INCOMPATIBLE_COST = 10 ** 12
+INLINE_GROUP_LIMIT = 100   # largest group auto-paired within a web request; bigger ones go to the job queue
+
+
+class GroupTooLargeError(Exception):
+    """Raised when a (language, day) group is larger than auto_pair was allowed to solve."""
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def _level(value):
+    value = (value or "").lower()
+    return LEVELS.index(value) if value in LEVELS else None
+
+
+def match_cost(student_request, tutor_request):
+    """Return the cost of pairing a student request with a tutor request.
+
+    Language and day are hard constraints handled by grouping, so the cost
+    only weighs the level gap and the distance between the preferred and
+    available times. Pairs that cannot be scheduled cost INCOMPATIBLE_COST.
+    """
+    student_level = _level(student_request.difficulty)
+    tutor_level = _level(tutor_request.level_can_teach)
+    if student_level is None or tutor_level is None or tutor_level < student_level:
+        return INCOMPATIBLE_COST
+    preferred, available = student_request.preferred_time, tutor_request.available_time
+    if preferred is None and available is None:
+        return INCOMPATIBLE_COST
+    time_cost = abs(_minutes(preferred) - _minutes(available)) if preferred and available else 0
+    return (tutor_level - student_level) * LEVEL_GAP_COST + time_cost
+
+
+def min_cost_assignment(cost):
+    """Solve a rectangular assignment problem with the Hungarian algorithm.
+
+    ``cost`` is a list of n rows of m costs with n <= m. Returns, for each
+    row, the index of the column it was assigned to.
+    """
+    n = len(cost)
+    m = len(cost[0]) if n else 0
+    u, v = [0] * (n + 1), [0] * (m + 1)
+    owner, way = [0] * (m + 1), [0] * (m + 1)
+    for row in range(1, n + 1):
+        owner[0] = row
+        col0 = 0
+        min_slack = [float("inf")] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[col0] = True
+            row0 = owner[col0]
+            row_costs = cost[row0 - 1]
+            delta, col1 = float("inf"), 0
+            for col in range(1, m + 1):
+                if not used[col]:
+                    slack = row_costs[col - 1] - u[row0] - v[col]
+                    if slack < min_slack[col]:
+                        min_slack[col] = slack
+                        way[col] = col0
+                    if min_slack[col] < delta:
+                        delta, col1 = min_slack[col], col
+            for col in range(m + 1):
+                if used[col]:
+                    u[owner[col]] += delta
+                    v[col] -= delta
+                else:
+                    min_slack[col] -= delta
+            col0 = col1
+            if owner[col0] == 0:
+                break
+        while col0:
+            col1 = way[col0]
+            owner[col0] = owner[col1]
+            col0 = col1
+    assignment = [None] * n
+    for col in range(1, m + 1):
+        if owner[col]:
+            assignment[owner[col] - 1] = col - 1
+    return assignment
+
+
+def plan_matches(student_requests, tutor_requests):
+    """Return the min-cost list of (student_request, tutor_request) pairs for one group."""
+    tutor_requests = [
+        tutor_request for tutor_request in tutor_requests
+        if any(match_cost(sr, tutor_request) < INCOMPATIBLE_COST for sr in student_requests)
+    ]
+    if not student_requests or not tutor_requests:
+        return []
+    # One "unmatched" column per student keeps the problem feasible and rectangular.
+    dummies = [UNMATCHED_COST] * len(student_requests)
+    cost = [
+        [match_cost(student_request, tutor_request) for tutor_request in tutor_requests] + dummies
+        for student_request in student_requests
+    ]
+    pairs = []
+    for row, col in enumerate(min_cost_assignment(cost)):
+        if col < len(tutor_requests) and cost[row][col] < INCOMPATIBLE_COST:
+            pairs.append((student_requests[row], tutor_requests[col]))
+    return pairs
+
+
+def _group_key(language, day_of_week):
+    return (language or "").strip().casefold(), (day_of_week or "").lower()
+
+
+@dataclass
+class AutoPairResult:
+    pending: int = 0
+    pairs: list = field(default_factory=list)
+    seconds: float = 0.0
+    dry_run: bool = False
+
+    @property
+    def matched(self):
+        return len(self.pairs)
+
+    @property
+    def match_rate(self):
+        return self.matched / self.pending if self.pending else 0.0
+
+
+def auto_pair(dry_run=False, max_group=None):
+    """Match every pending student request to an available tutor slot in one pass.
+
+    Requests are grouped by (language, day), each group is solved as a
+    min-cost bipartite assignment, and the resulting lessons and status
+    updates are written in a single transaction unless ``dry_run`` is set.
+    A tutor slot teaching several languages is offered to later groups only
+    if an earlier group did not take it.
+
+    The assignment is cubic in the group size, so callers that must answer
+    quickly pass ``max_group``: a group with more requests or slots than
+    that raises GroupTooLargeError before anything is solved.
+    """
+    started = perf_counter()
+    student_groups = defaultdict(list)
+    for student_request in StudentRequest.objects.filter(status="pending").order_by("created_at", "id"):
+        student_groups[_group_key(student_request.language, student_request.day_of_week)].append(student_request)
+
+    tutor_groups = defaultdict(list)
+    tokens = TutorLanguage.objects.filter(tutor_request__status="available").select_related("tutor_request")
+    for token in tokens.order_by("tutor_request_id"):
+        tutor_groups[(token.language, token.day_of_week)].append(token.tutor_request)
+
+    if max_group is not None:
+        for key, group in student_groups.items():
+            size = max(len(group), len(tutor_groups.get(key, [])))
+            if size > max_group:
+                language, day = key
+                raise GroupTooLargeError(
+                    f"{language} on {day} has {size} requests or slots to pair, more than the {max_group} "
+                    f"paired within a request."
+                )
+
+    result = AutoPairResult(pending=sum(len(group) for group in student_groups.values()), dry_run=dry_run)
+    planned, taken = [], set()
+    for key in sorted(student_groups):
+        available = [tutor_request for tutor_request in tutor_groups.get(key, []) if tutor_request.id not in taken]
+        for student_request, tutor_request in plan_matches(student_groups[key], available):
+            taken.add(tutor_request.id)
+            planned.append((student_request, tutor_request))
+
+    # Drop pairs that would double-book a tutor or student, including against each other.
+    user_ids = {sr.student_id for sr, _ in planned} | {tr.tutor_id for _, tr in planned}
+    timetable = ScheduleIndex.for_users(user_ids)
+    result.pairs = [pair for pair in planned if timetable.reserve(lesson_for(*pair))]
+
+    if not dry_run and result.pairs:
+        result.pairs = apply_pairs(result.pairs)
+    result.seconds = perf_counter() - started
+    return result
+
+
+def lesson_for(student_request, tutor_request, duration=DEFAULT_DURATION):
+    """Return an unsaved lesson pairing a student request with a tutor slot."""
+    return LessonSchedule(
+        tutor_id=tutor_request.tutor_id,
+        tutor_request=tutor_request,
+        student_id=student_request.student_id,
+        subject=student_request.language,
+        day_of_week=student_request.day_of_week,
+        start_time=tutor_request.available_time or student_request.preferred_time,
+        duration=duration,
+        frequency=student_request.frequency,
+        status="scheduled",
+    )
+
+
+def apply_pairs(pairs, duration=DEFAULT_DURATION):
+    """Create lessons for the given pairs and mark both requests as taken.
+
+    The request rows are locked and re-read first, so pairs whose student
+    request or tutor slot was taken since planning are dropped rather than
+    booked twice. Returns the pairs that were applied.
+    """
+    with transaction.atomic():
+        pending = set(StudentRequest.objects.select_for_update().filter(
+            id__in=[sr.id for sr, _ in pairs], status="pending"
+        ).values_list("id", flat=True))
+        available = set(TutorRequest.objects.select_for_update().filter(
+            id__in=[tr.id for _, tr in pairs], status="available"
+        ).values_list("id", flat=True))
+        pairs = [(sr, tr) for sr, tr in pairs if sr.id in pending and tr.id in available]
+        book([(sr, tr, lesson_for(sr, tr, duration)) for sr, tr in pairs])
+    return pairs
+
+
+def rematch_slot(tutor_request):
+    """Offer one freed tutor slot to the best compatible pending student request.
+
+    Only pending requests for a language the slot teaches on its day are
+    read, through the partial studentrequest_pending_idx index, so the
+    global match is never re-run. The cheapest candidate that does not
+    double-book anyone is booked. Returns the (student_request,
+    tutor_request) pair booked, or None.
+    """
+    if tutor_request.status != "available":
+        return None
+    candidates = StudentRequest.objects.pending_for(
+        tokenize_languages(tutor_request.languages), tutor_request.day_of_week
+    ).order_by("created_at", "id")
+    ranked = sorted(
+        (cost, position, student_request)
+        for position, student_request in enumerate(candidates)
+        if (cost := match_cost(student_request, tutor_request)) < INCOMPATIBLE_COST
+    )
+    if not ranked:
+        return None
+    timetable = ScheduleIndex.for_users({tutor_request.tutor_id} | {sr.student_id for _, _, sr in ranked})
+    for _, _, student_request in ranked:
+        if timetable.reserve(lesson_for(student_request, tutor_request)):
+            applied = apply_pairs([(student_request, tutor_request)])
+            return applied[0] if applied else None
+    return None
+
+
+def reopen_slot(lesson):
+    """Make the tutor request a cancelled lesson was booked into available again.
+
+    Returns the reopened request, or None when the lesson was not booked
+    from a tutor request or its slot is no longer scheduled.
+    """
+    if lesson.tutor_request_id is None:
+        return None
+    with transaction.atomic():
+        tutor_request = TutorRequest.objects.select_for_update().filter(
+            id=lesson.tutor_request_id, status="scheduled"
+        ).first()
+        if tutor_request is None:
+            return None
+        tutor_request.status = "available"
+        tutor_request.save(update_fields=["status"])
+    return tutor_request
+
+
+def rematch_cancelled_lesson(lesson):
+    """Reopen the tutor request behind a cancelled lesson and book it for the best waiting student.
+
+    Returns the (student_request, tutor_request) pair booked, or None when
+    no slot was reopened or nobody could take it.
+    """
+    tutor_request = reopen_slot(lesson)
+    if tutor_request is None:
+        return None
+    return rematch_slot(tutor_request)
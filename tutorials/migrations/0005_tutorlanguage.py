@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:38
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_language_tokens(apps, schema_editor):
+    TutorRequest = apps.get_model("tutorials", "TutorRequest")
+    TutorLanguage = apps.get_model("tutorials", "TutorLanguage")
+    tokens = []
+    for tutor_request in TutorRequest.objects.iterator(chunk_size=2000):
+        languages = {
+            token.strip().casefold()
+            for token in re.split(r"[,;/]", tutor_request.languages or "")
+            if token.strip()
+        }
+        for language in languages:
+            tokens.append(
+                TutorLanguage(
+                    tutor_request_id=tutor_request.id,
+                    language=language,
+                    day_of_week=(tutor_request.day_of_week or "").lower(),
+                    level_can_teach=(tutor_request.level_can_teach or "").lower(),
+                )
+            )
+        if len(tokens) >= 2000:
+            TutorLanguage.objects.bulk_create(tokens)
+            tokens.clear()
+    TutorLanguage.objects.bulk_create(tokens)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0004_feedback_user"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TutorLanguage",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("language", models.CharField(max_length=100)),
+                ("day_of_week", models.CharField(choices=[("monday", "Monday"), ("tuesday", "Tuesday"), ("wednesday", "Wednesday"), ("thursday", "Thursday"), ("friday", "Friday"), ("saturday", "Saturday"), ("sunday", "Sunday")], max_length=10)),
+                ("level_can_teach", models.CharField(choices=[("beginner", "Beginner"), ("intermediate", "Intermediate"), ("advanced", "Advanced")], max_length=20)),
+                ("tutor_request", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="language_tokens", to="tutorials.tutorrequest")),
+            ],
+            options={
+                "indexes": [models.Index(fields=["language", "day_of_week", "level_can_teach"], name="tutorlanguage_lookup_idx")],
+                "constraints": [models.UniqueConstraint(fields=("tutor_request", "language"), name="unique_tutor_request_language")],
+            },
+        ),
+        migrations.RunPython(backfill_language_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:44
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0005_tutorlanguage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lessonschedule",
+            name="starts_on",
+            field=models.DateField(default=django.utils.timezone.localdate, help_text="Date from which the lesson recurs"),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0006_lessonschedule_starts_on"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LessonOccurrence",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("starts_at", models.DateTimeField()),
+                ("ends_at", models.DateTimeField()),
+                ("lesson", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="occurrences", to="tutorials.lessonschedule")),
+                ("student", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="student_occurrences", to=settings.AUTH_USER_MODEL)),
+                ("tutor", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="tutor_occurrences", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["tutor", "date"], name="occurrence_tutor_date_idx"), models.Index(fields=["student", "date"], name="occurrence_student_date_idx")],
+                "constraints": [models.UniqueConstraint(fields=("lesson", "date"), name="unique_lesson_occurrence_date")],
+            },
+        ),
+    ]
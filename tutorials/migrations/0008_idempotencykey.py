@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0007_lessonoccurrence"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IdempotencyKey",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("key", models.CharField(max_length=64, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("lesson", models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="+", to="tutorials.lessonschedule")),
+            ],
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0008_idempotencykey"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="request",
+            name="priority_rank",
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(priority="high", then=0), models.When(priority="medium", then=1), default=2), output_field=models.PositiveSmallIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name="request",
+            index=models.Index(fields=["status", "priority_rank", "id"], name="request_queue_idx"),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:10
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0009_request_queue"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="studentrequest",
+            index=models.Index(django.db.models.functions.text.Lower("day_of_week"), django.db.models.functions.text.Lower("language"), condition=models.Q(("status", "pending")), name="studentrequest_pending_idx"),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:40
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def _day(value):
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+
+def backfill_rollups(apps, schema_editor):
+    Invoice = apps.get_model("tutorials", "Invoice")
+    LessonSchedule = apps.get_model("tutorials", "LessonSchedule")
+    Feedback = apps.get_model("tutorials", "Feedback")
+    User = apps.get_model("tutorials", "User")
+    StudentRequest = apps.get_model("tutorials", "StudentRequest")
+    DailyRollup = apps.get_model("tutorials", "DailyRollup")
+    DailyRequestRollup = apps.get_model("tutorials", "DailyRequestRollup")
+    totals = defaultdict(lambda: defaultdict(int))
+    request_counts = defaultdict(int)
+    for due_date, status, amount in Invoice.objects.values_list("due_date", "status", "amount").iterator(chunk_size=2000):
+        totals[due_date]["revenue_paid" if (status or "").lower() == "paid" else "revenue_unpaid"] += amount
+    for starts_on, duration in LessonSchedule.objects.values_list("starts_on", "duration").iterator(chunk_size=2000):
+        totals[starts_on]["lesson_minutes"] += duration or 0
+    for posted in Feedback.objects.values_list("posted", flat=True).iterator(chunk_size=2000):
+        totals[_day(posted)]["feedback_count"] += 1
+    for date_joined in User.objects.order_by().values_list("date_joined", flat=True).iterator(chunk_size=2000):
+        totals[_day(date_joined)]["signups"] += 1
+    student_requests = StudentRequest.objects.values_list("created_at", "status", "language")
+    for created_at, status, language in student_requests.iterator(chunk_size=2000):
+        request_counts[(_day(created_at), (status or "").lower(), (language or "").strip().casefold())] += 1
+    DailyRollup.objects.bulk_create(
+        [DailyRollup(date=day, **fields) for day, fields in totals.items()], batch_size=2000
+    )
+    DailyRequestRollup.objects.bulk_create(
+        [
+            DailyRequestRollup(date=day, status=status, language=language, count=count)
+            for (day, status, language), count in request_counts.items()
+        ],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0010_studentrequest_pending_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField(unique=True)),
+                ("revenue_paid", models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ("revenue_unpaid", models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ("lesson_minutes", models.IntegerField(default=0)),
+                ("feedback_count", models.IntegerField(default=0)),
+                ("signups", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="DailyRequestRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("status", models.CharField(max_length=20)),
+                ("language", models.CharField(max_length=100)),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("date", "status", "language"), name="unique_request_rollup")],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0011_rollups"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(fields=["due_date", "status"], name="invoice_due_date_status_idx"),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0012_invoice_due_date_status_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="feedback",
+            index=models.Index(fields=["-posted"], name="feedback_posted_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(fields=["student", "-due_date"], name="invoice_student_due_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(fields=["-created_at"], name="invoice_created_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="lessonschedule",
+            index=models.Index(fields=["student", "start_time"], name="lesson_student_start_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="lessonschedule",
+            index=models.Index(fields=["tutor", "start_time"], name="lesson_tutor_start_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="studentrequest",
+            index=models.Index(fields=["student", "-created_at"], name="studentrequest_student_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="studentrequest",
+            index=models.Index(fields=["status", "created_at"], name="studentrequest_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tutorrequest",
+            index=models.Index(fields=["tutor", "status"], name="tutorrequest_tutor_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tutorrequest",
+            index=models.Index(fields=["status", "day_of_week", "level_can_teach"], name="tutorrequest_slot_idx"),
+        ),
+    ]
@@ -0,0 +1,71 @@
+from django.db import migrations
+
+SQLITE_CREATE = [
+    """
+    CREATE VIRTUAL TABLE tutorials_feedback_fts USING fts5(
+        name, email, message,
+        content='tutorials_feedback', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER tutorials_feedback_fts_insert AFTER INSERT ON tutorials_feedback BEGIN
+        INSERT INTO tutorials_feedback_fts(rowid, name, email, message)
+        VALUES (new.id, new.name, new.email, new.message);
+    END
+    """,
+    """
+    CREATE TRIGGER tutorials_feedback_fts_delete AFTER DELETE ON tutorials_feedback BEGIN
+        INSERT INTO tutorials_feedback_fts(tutorials_feedback_fts, rowid, name, email, message)
+        VALUES ('delete', old.id, old.name, old.email, old.message);
+    END
+    """,
+    """
+    CREATE TRIGGER tutorials_feedback_fts_update AFTER UPDATE OF name, email, message ON tutorials_feedback BEGIN
+        INSERT INTO tutorials_feedback_fts(tutorials_feedback_fts, rowid, name, email, message)
+        VALUES ('delete', old.id, old.name, old.email, old.message);
+        INSERT INTO tutorials_feedback_fts(rowid, name, email, message)
+        VALUES (new.id, new.name, new.email, new.message);
+    END
+    """,
+    "INSERT INTO tutorials_feedback_fts(tutorials_feedback_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS tutorials_feedback_fts_update",
+    "DROP TRIGGER IF EXISTS tutorials_feedback_fts_delete",
+    "DROP TRIGGER IF EXISTS tutorials_feedback_fts_insert",
+    "DROP TABLE IF EXISTS tutorials_feedback_fts",
+]
+
+# Postgres keeps an expression index in step by itself, so no triggers are needed.
+POSTGRES_CREATE = [
+    """
+    CREATE INDEX tutorials_feedback_search_idx ON tutorials_feedback
+    USING GIN (to_tsvector('english', name || ' ' || email || ' ' || message))
+    """,
+]
+
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS tutorials_feedback_search_idx",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0013_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_CREATE, "postgresql": POSTGRES_CREATE}),
+            _run({"sqlite": SQLITE_DROP, "postgresql": POSTGRES_DROP}),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0014_feedback_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BillingRun",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("period_start", models.DateField()),
+                ("period_end", models.DateField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("period_start", "period_end"), name="unique_billing_period")],
+            },
+        ),
+        migrations.AddField(
+            model_name="invoice",
+            name="billing_run",
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name="invoices", to="tutorials.billingrun"),
+        ),
+        migrations.AddConstraint(
+            model_name="invoice",
+            constraint=models.UniqueConstraint(fields=("billing_run", "student", "tutor"), name="unique_billing_run_invoice"),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:47
+
+import django.db.models.deletion
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def backfill_lines_and_balances(apps, schema_editor):
+    Invoice = apps.get_model("tutorials", "Invoice")
+    InvoiceLine = apps.get_model("tutorials", "InvoiceLine")
+    StudentBalance = apps.get_model("tutorials", "StudentBalance")
+    balances = defaultdict(lambda: {"outstanding": 0, "paid": 0})
+    lines = []
+    invoices = Invoice.objects.values_list("id", "student_id", "status", "amount")
+    for invoice_id, student_id, status, amount in invoices.iterator(chunk_size=2000):
+        balances[student_id]["paid" if (status or "").lower() == "paid" else "outstanding"] += amount
+        lines.append(InvoiceLine(invoice_id=invoice_id, description="Tuition", unit_price=amount, amount=amount))
+        if len(lines) >= 2000:
+            InvoiceLine.objects.bulk_create(lines)
+            lines.clear()
+    InvoiceLine.objects.bulk_create(lines)
+    StudentBalance.objects.bulk_create(
+        [StudentBalance(student_id=student_id, **fields) for student_id, fields in balances.items()], batch_size=2000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0015_billing_run"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InvoiceLine",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("description", models.CharField(max_length=200)),
+                ("quantity", models.PositiveIntegerField(default=1)),
+                ("unit_price", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("invoice", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="lines", to="tutorials.invoice")),
+                ("lesson", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="invoice_lines", to="tutorials.lessonschedule")),
+            ],
+        ),
+        migrations.CreateModel(
+            name="StudentBalance",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("outstanding", models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ("paid", models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ("student", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="balance", to="tutorials.student")),
+            ],
+        ),
+        migrations.RunPython(backfill_lines_and_balances, migrations.RunPython.noop),
+    ]
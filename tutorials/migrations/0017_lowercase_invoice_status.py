@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:05
+
+from django.db import migrations
+from django.db.models.functions import Lower
+
+
+def lowercase_invoice_status(apps, schema_editor):
+    Invoice = apps.get_model("tutorials", "Invoice")
+    Invoice.objects.exclude(status__in=["paid", "unpaid"]).update(status=Lower("status"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0016_invoice_lines_and_balances"),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_invoice_status, migrations.RunPython.noop),
+    ]
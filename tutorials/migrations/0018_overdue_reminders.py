@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0017_lowercase_invoice_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEmail",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("to", models.EmailField(max_length=254)),
+                ("subject", models.CharField(max_length=200)),
+                ("body", models.TextField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(condition=models.Q(("status", "unpaid")), fields=["status", "due_date"], name="invoice_unpaid_due_idx"),
+        ),
+        migrations.AddField(
+            model_name="outboxemail",
+            name="invoice",
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name="emails", to="tutorials.invoice"),
+        ),
+        migrations.AddIndex(
+            model_name="outboxemail",
+            index=models.Index(condition=models.Q(("sent_at__isnull", True)), fields=["id"], name="outbox_unsent_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="outboxemail",
+            index=models.Index(fields=["invoice", "-created_at"], name="outbox_invoice_idx"),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:18
+
+import django.db.models.deletion
+import re
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def link_booked_slots(apps, schema_editor):
+    """Link existing lessons to their tutor request where only one slot can be theirs."""
+    LessonSchedule = apps.get_model("tutorials", "LessonSchedule")
+    TutorRequest = apps.get_model("tutorials", "TutorRequest")
+    slots = defaultdict(list)
+    for tutor_request in TutorRequest.objects.filter(status="scheduled").iterator(chunk_size=2000):
+        for language in re.split(r"[,;/]", tutor_request.languages or ""):
+            key = (tutor_request.tutor_id, (tutor_request.day_of_week or "").lower(), language.strip().casefold())
+            slots[key].append(tutor_request)
+    lessons = defaultdict(list)
+    for lesson in LessonSchedule.objects.filter(status="scheduled").iterator(chunk_size=2000):
+        key = (lesson.tutor_id, (lesson.day_of_week or "").lower(), (lesson.subject or "").strip().casefold())
+        if len(slots.get(key, [])) == 1:
+            lessons[slots[key][0].id].append(lesson)
+    linked = []
+    for tutor_request_id, candidates in lessons.items():
+        if len(candidates) == 1:
+            candidates[0].tutor_request_id = tutor_request_id
+            linked.append(candidates[0])
+    LessonSchedule.objects.bulk_update(linked, ["tutor_request"], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0018_overdue_reminders"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lessonschedule",
+            name="tutor_request",
+            field=models.ForeignKey(blank=True, help_text="The tutor slot the lesson was booked into, reopened if the lesson is cancelled", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="lessons", to="tutorials.tutorrequest"),
+        ),
+        migrations.RunPython(link_booked_slots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tutorials", "0019_lessonschedule_tutor_request"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="request",
+            name="payload",
+            field=models.JSONField(blank=True, default=dict, help_text="Arguments fixed when the job was queued"),
+        ),
+    ]
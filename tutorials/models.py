@@ -1,6 +1,10 @@
+import re
+from datetime import timedelta
 from django.core.validators import RegexValidator
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
 from libgravatar import Gravatar
 from django.db import models
 from django.conf import settings
@@ -56,6 +60,40 @@ class Tutor(models.Model):
     def __str__(self):
         return f"Tutor: {self.user.full_name()}"
 
+class BillingRun(models.Model):
+    """One invoicing of the scheduled lessons from period_start up to, not including, period_end."""
+
+    period_start = models.DateField()
+    period_end = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["period_start", "period_end"], name="unique_billing_period"),
+        ]
+
+    def __str__(self):
+        return f"Billing run {self.period_start} to {self.period_end}"
+
+
+class InvoiceQuerySet(models.QuerySet):
+    def delete_rows(self):
+        """Delete the matched invoices with one DELETE statement and return how many went.
+
+        Unlike delete(), this skips the collector and the per-row delete
+        signals: rows referencing the invoices must already be gone, and
+        the caller applies what the signals would have.
+        """
+        select, params = self.order_by().values("pk").query.sql_with_params()
+        quote = connections[self.db].ops.quote_name
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {quote(self.model._meta.db_table)} WHERE {quote(self.model._meta.pk.column)} IN ({select})",
+                params,
+            )
+            return cursor.rowcount
+
+
 class Invoice(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="invoices")
     tutor = models.ForeignKey(Tutor, on_delete=models.CASCADE, related_name="invoices")
@@ -63,11 +101,143 @@ class Invoice(models.Model):
     status = models.CharField(max_length=20, choices=[('paid', 'Paid'), ('unpaid', 'Unpaid')], default='unpaid')
     created_at = models.DateTimeField(auto_now_add=True)
     due_date = models.DateField()
+    billing_run = models.ForeignKey(
+        BillingRun, on_delete=models.PROTECT, null=True, blank=True, related_name="invoices"
+    )
+
+    objects = InvoiceQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["billing_run", "student", "tutor"], name="unique_billing_run_invoice"),
+        ]
+        indexes = [
+            models.Index(fields=["due_date", "status"], name="invoice_due_date_status_idx"),
+            models.Index(fields=["student", "-due_date"], name="invoice_student_due_date_idx"),
+            models.Index(fields=["-created_at"], name="invoice_created_at_idx"),
+            models.Index(
+                fields=["status", "due_date"], name="invoice_unpaid_due_idx", condition=models.Q(status="unpaid"),
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """Save the invoice with its status as the lower-case choice value, so filters match it exactly."""
+        if "status" not in self.get_deferred_fields():
+            self.status = (self.status or "").lower()
+        super().save(*args, **kwargs)
+
+    @property
+    def reference(self):
+        """The reference students quote when paying, which bank statement imports match on."""
+        return f"INV-{self.pk}"
 
     def __str__(self):
         return f"Invoice {self.id} - {self.student.user.username} to {self.tutor.user.username}"
 
 
+class InvoiceLine(models.Model):
+    """One priced item of an invoice, such as a lesson's occurrences in the billed period."""
+
+    invoice = models.ForeignKey(Invoice, on_delete=models.CASCADE, related_name="lines")
+    lesson = models.ForeignKey(
+        "LessonSchedule", on_delete=models.SET_NULL, null=True, blank=True, related_name="invoice_lines"
+    )
+    description = models.CharField(max_length=200)
+    quantity = models.PositiveIntegerField(default=1)
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+
+    def __str__(self):
+        return f"{self.quantity} x {self.description} on invoice {self.invoice_id}"
+
+
+class StudentBalance(models.Model):
+    """What a student has paid and still owes, kept in step with their invoices; see tutorials.rollups."""
+
+    student = models.OneToOneField(Student, on_delete=models.CASCADE, related_name="balance")
+    outstanding = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    paid = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.student} owes {self.outstanding}"
+
+
+class OutboxEmail(models.Model):
+    """An email waiting to be sent, written in bulk and delivered in batches; see tutorials.reminders."""
+
+    invoice = models.ForeignKey(Invoice, on_delete=models.CASCADE, null=True, blank=True, related_name="emails")
+    to = models.EmailField()
+    subject = models.CharField(max_length=200)
+    body = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["id"], name="outbox_unsent_idx", condition=models.Q(sent_at__isnull=True)),
+            models.Index(fields=["invoice", "-created_at"], name="outbox_invoice_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {self.to}"
+
+
+class DailyRollup(models.Model):
+    """Per-day totals kept up to date from the fact tables; see tutorials.rollups."""
+
+    date = models.DateField(unique=True)
+    revenue_paid = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    revenue_unpaid = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    lesson_minutes = models.IntegerField(default=0)
+    feedback_count = models.IntegerField(default=0)
+    signups = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Rollup for {self.date}"
+
+
+class DailyRequestRollup(models.Model):
+    """New student requests per day, status and language."""
+
+    date = models.DateField()
+    status = models.CharField(max_length=20)
+    language = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["date", "status", "language"], name="unique_request_rollup"),
+        ]
+
+    def __str__(self):
+        return f"{self.count} {self.status} {self.language} requests on {self.date}"
+
+
+class RequestQuerySet(models.QuerySet):
+    def queue(self):
+        """Unallocated pending requests, highest priority first and oldest first within a priority."""
+        return self.filter(status="pending", allocated=False).order_by("priority_rank", "id")
+
+    def claim(self, batch_size=10, types=None):
+        """Atomically allocate and return the next ``batch_size`` queued requests.
+
+        Candidate rows are locked with select_for_update(skip_locked=True) where
+        the database supports it (SQLite serialises writers through IMMEDIATE
+        transactions instead), and the allocating UPDATE re-checks ``allocated``
+        so concurrent workers never claim the same request twice.
+        """
+        with transaction.atomic():
+            queued = self.queue()
+            if types is not None:
+                queued = queued.filter(type__in=list(types))
+            ids = list(queued.select_for_update(skip_locked=True).values_list("id", flat=True)[:batch_size])
+            claimed = self.filter(id__in=ids, allocated=False)
+            claimed.update(allocated=True, status="in_progress")
+            return list(self.filter(id__in=ids, status="in_progress").order_by("priority_rank", "id"))
+
+
 class Request(models.Model):
     PRIORITY_CHOICES = [
         ('low', 'Low'),
@@ -86,6 +256,23 @@ class Request(models.Model):
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='low')
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='pending')
     allocated = models.BooleanField(default=False)
+    payload = models.JSONField(default=dict, blank=True, help_text="Arguments fixed when the job was queued")
+    priority_rank = models.GeneratedField(
+        expression=models.Case(
+            models.When(priority="high", then=0),
+            models.When(priority="medium", then=1),
+            default=2,
+        ),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
+
+    objects = RequestQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "priority_rank", "id"], name="request_queue_idx"),
+        ]
 
     def __str__(self):
         return f"{self.type} ({self.student.username})"
@@ -104,6 +291,11 @@ class Feedback(models.Model):
     message = models.TextField(max_length=500)
     posted = models.DateTimeField(auto_now_add=True)  
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-posted"], name="feedback_posted_idx"),
+        ]
+
     def __str__(self):
         return f"Feedback from {self.name} at {self.posted}"
     
@@ -131,10 +323,77 @@ class LessonSchedule(models.Model):
         choices=[('scheduled', 'Scheduled'), ('cancelled', 'Cancelled')],
         default='scheduled'
     )
+    starts_on = models.DateField(default=timezone.localdate, help_text="Date from which the lesson recurs")
+    tutor_request = models.ForeignKey(
+        "TutorRequest", on_delete=models.SET_NULL, null=True, blank=True, related_name="lessons",
+        help_text="The tutor slot the lesson was booked into, reopened if the lesson is cancelled",
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["student", "start_time"], name="lesson_student_start_idx"),
+            models.Index(fields=["tutor", "start_time"], name="lesson_tutor_start_idx"),
+        ]
 
     def __str__(self):
         return f"{self.subject} - {self.student} with {self.tutor}"
     
+class LessonOccurrenceQuerySet(models.QuerySet):
+    def upcoming(self):
+        """Occurrences that have not started yet, soonest first."""
+        now = timezone.now()
+        return self.filter(date__gte=timezone.localdate(now), starts_at__gte=now).order_by("date", "starts_at")
+
+    def in_week(self, day):
+        """Occurrences in the Monday-to-Sunday week containing ``day``."""
+        monday = day - timedelta(days=day.weekday())
+        return self.filter(date__gte=monday, date__lt=monday + timedelta(weeks=1)).order_by("date", "starts_at")
+
+
+class LessonOccurrence(models.Model):
+    """A concrete, dated occurrence of a recurring LessonSchedule."""
+
+    lesson = models.ForeignKey(LessonSchedule, on_delete=models.CASCADE, related_name="occurrences")
+    tutor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="tutor_occurrences")
+    student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="student_occurrences")
+    date = models.DateField()
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+
+    objects = LessonOccurrenceQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["tutor", "date"], name="occurrence_tutor_date_idx"),
+            models.Index(fields=["student", "date"], name="occurrence_student_date_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["lesson", "date"], name="unique_lesson_occurrence_date"),
+        ]
+
+    def __str__(self):
+        return f"{self.lesson.subject} on {self.starts_at:%Y-%m-%d %H:%M}"
+
+
+class IdempotencyKey(models.Model):
+    """A form submission key recording the lesson it created, so retries do not pair twice."""
+
+    key = models.CharField(max_length=64, unique=True)
+    lesson = models.ForeignKey(LessonSchedule, on_delete=models.SET_NULL, null=True, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.key
+
+
+class StudentRequestQuerySet(models.QuerySet):
+    def pending_for(self, languages, day_of_week):
+        """Pending requests for any of ``languages`` on a day, through the partial match index."""
+        return self.alias(
+            day_key=Lower("day_of_week"), language_key=Lower("language"),
+        ).filter(status="pending", day_key=(day_of_week or "").lower(), language_key__in=list(languages))
+
+
 class StudentRequest(models.Model):
     student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="student_requests")
     language = models.CharField(max_length=100)
@@ -146,9 +405,38 @@ class StudentRequest(models.Model):
     status = models.CharField(max_length=20, choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('cancelled', 'Cancelled')], default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = StudentRequestQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                Lower("day_of_week"), Lower("language"),
+                name="studentrequest_pending_idx", condition=models.Q(status="pending"),
+            ),
+            models.Index(fields=["student", "-created_at"], name="studentrequest_student_idx"),
+            models.Index(fields=["status", "created_at"], name="studentrequest_status_idx"),
+        ]
+
     def __str__(self):
         return f"Request by {self.student.get_full_name()} for {self.language}"
     
+def tokenize_languages(languages):
+    """Split a free-text languages field into normalised language tokens."""
+    tokens = (token.strip().casefold() for token in re.split(r"[,;/]", languages or ""))
+    return sorted({token for token in tokens if token})
+
+
+class TutorRequestQuerySet(models.QuerySet):
+    def teaching(self, language, day_of_week=None, level_can_teach=None):
+        """Filter tutor requests through the indexed language token table."""
+        lookup = {"language_tokens__language": language.strip().casefold()}
+        if day_of_week:
+            lookup["language_tokens__day_of_week"] = day_of_week.lower()
+        if level_can_teach:
+            lookup["language_tokens__level_can_teach"] = level_can_teach.lower()
+        return self.filter(**lookup)
+
+
 class TutorRequest(models.Model):
     tutor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="tutor_requests")
     languages = models.CharField(max_length=200)  
@@ -159,10 +447,66 @@ class TutorRequest(models.Model):
     status = models.CharField(max_length=20, choices=[('available', 'Available'), ('busy', 'Busy'),('cancelled', 'Cancelled')], default='available')
     available_time = models.TimeField(null=True, blank=True)
 
+    objects = TutorRequestQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["tutor", "status"], name="tutorrequest_tutor_status_idx"),
+            models.Index(fields=["status", "day_of_week", "level_can_teach"], name="tutorrequest_slot_idx"),
+        ]
+
     def __str__(self):
         tutor_name = self.tutor.full_name()
         return f"Request by {tutor_name} for teaching {self.languages}"
 
+    def save(self, *args, **kwargs):
+        """Save the request and keep its language tokens in sync."""
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"languages", "day_of_week", "level_can_teach"} & set(update_fields):
+            TutorLanguage.rebuild([self])
+
+
+class TutorLanguage(models.Model):
+    """Normalised language token of a tutor request, indexed for candidate lookups."""
+
+    tutor_request = models.ForeignKey(TutorRequest, on_delete=models.CASCADE, related_name="language_tokens")
+    language = models.CharField(max_length=100)
+    day_of_week = models.CharField(max_length=10, choices=DAY_CHOICES)
+    level_can_teach = models.CharField(max_length=20, choices=LEVEL_CHOICES)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["language", "day_of_week", "level_can_teach"], name="tutorlanguage_lookup_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["tutor_request", "language"], name="unique_tutor_request_language"),
+        ]
+
+    def __str__(self):
+        return f"{self.language} on {self.day_of_week} ({self.level_can_teach})"
+
+    @classmethod
+    def tokens_for(cls, tutor_request):
+        """Return unsaved language tokens for a tutor request."""
+        return [
+            cls(
+                tutor_request=tutor_request,
+                language=language,
+                day_of_week=(tutor_request.day_of_week or "").lower(),
+                level_can_teach=(tutor_request.level_can_teach or "").lower(),
+            )
+            for language in tokenize_languages(tutor_request.languages)
+        ]
+
+    @classmethod
+    def rebuild(cls, tutor_requests, batch_size=1000):
+        """Replace the language tokens of the given tutor requests."""
+        tutor_requests = list(tutor_requests)
+        cls.objects.filter(tutor_request__in=tutor_requests).delete()
+        tokens = [token for tutor_request in tutor_requests for token in cls.tokens_for(tutor_request)]
+        cls.objects.bulk_create(tokens, batch_size=batch_size)
+
 
 
 
@@ -0,0 +1,92 @@
+"""Keyset (cursor) pagination, over the primary key or a whitelisted sort field."""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from datetime import date, time
+from decimal import Decimal
+
+from django.db.models import Q
+
+PAGE_SIZE = 25
+
+
+def parse_cursor(value):
+    """Return the id encoded in a cursor query parameter, or None for the first page."""
+    try:
+        cursor = int(value)
+    except (TypeError, ValueError):
+        return None
+    return cursor if cursor > 0 else None
+
+
+def keyset_page(queryset, cursor=None, page_size=PAGE_SIZE):
+    """Return (page, next_cursor) for the rows of ``queryset`` with an id below ``cursor``.
+
+    Rows are ordered by descending id so every page is a range scan of the
+    primary key index, however deep it is; ``next_cursor`` is None on the
+    last page. The page is evaluated here and stays a queryset, so its
+    cached rows are reused by the template.
+    """
+    queryset = queryset.order_by("-id")
+    if cursor is not None:
+        queryset = queryset.filter(id__lt=cursor)
+    page = queryset[:page_size]
+    rows = list(page)
+    next_cursor = None
+    if len(rows) == page_size and queryset.filter(id__lt=rows[-1].id).exists():
+        next_cursor = rows[-1].id
+    return page, next_cursor
+
+
+def _cursor_value(value):
+    # Full isoformat, since DjangoJSONEncoder would drop the microseconds a
+    # cursor needs to find its row again.
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} values cannot be encoded in a cursor")
+
+
+def encode_cursor(value, row_id):
+    """Return an opaque cursor for the row with ``value`` in the sort field and id ``row_id``."""
+    payload = json.dumps([value, row_id], default=_cursor_value)
+    return urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return the (value, id) pair of a cursor from encode_cursor, or None if it is malformed."""
+    try:
+        value, row_id = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (AttributeError, TypeError, ValueError):
+        return None
+    return (value, row_id) if isinstance(row_id, int) else None
+
+
+def sorted_keyset_page(queryset, sort="-id", cursor=None, page_size=PAGE_SIZE):
+    """Return (rows, next_cursor) for one page of ``queryset`` ordered by ``sort``.
+
+    ``sort`` is a field name, prefixed with "-" for descending order, and ties
+    are broken by id in the same direction, so a cursor names one position
+    in the order. The field must not be nullable. Fetching one row more than
+    the page tells whether there is a next page without another query.
+    """
+    field = sort.lstrip("-")
+    descending = sort.startswith("-")
+    queryset = queryset.order_by(sort, "-id" if descending else "id")
+    if cursor is not None:
+        value, row_id = cursor
+        after = "lt" if descending else "gt"
+        if field == "id":
+            queryset = queryset.filter(**{f"id__{after}": row_id})
+        else:
+            queryset = queryset.filter(
+                Q(**{f"{field}__{after}": value}) | Q(**{field: value, f"id__{after}": row_id})
+            )
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.id)
+    return rows, next_cursor
@@ -0,0 +1,166 @@
+"""Pairing student requests with tutor slots, safely under concurrent admins."""
+from datetime import time
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_time
+
+from . import analytics, availability, fragments, rollups
+from .models import IdempotencyKey, LessonSchedule, StudentRequest, TutorRequest
+from .scheduling import ScheduleIndex, find_conflict, sync_occurrences
+
+
+class PairingError(Exception):
+    """Raised when a student request and tutor slot can no longer be paired."""
+
+
+class BatchPairingError(PairingError):
+    """Raised when any row of a batch cannot be paired; ``errors`` lists (row, message)."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} of the pairs could not be made.")
+        self.errors = errors
+
+
+def pair_requests(student_request_id, tutor_request_id, start_time, duration, idempotency_key=None):
+    """Create the lesson for a student request and tutor slot exactly once.
+
+    Both request rows are locked with select_for_update (SQLite takes the
+    whole database through IMMEDIATE transactions instead), their statuses
+    are re-checked under the lock, and the idempotency key is recorded in
+    the same transaction. Replaying a key returns the lesson it created.
+    """
+    with transaction.atomic():
+        student_request = StudentRequest.objects.select_for_update().get(id=student_request_id)
+        if idempotency_key:
+            previous = IdempotencyKey.objects.filter(key=idempotency_key).select_related("lesson").first()
+            if previous is not None:
+                return previous.lesson
+        tutor_request = TutorRequest.objects.select_for_update().get(id=tutor_request_id)
+
+        if student_request.status != "pending":
+            raise PairingError("This student request cannot be paired as it is not in 'pending' status.")
+        if tutor_request.status != "available":
+            raise PairingError("This tutor slot is no longer available.")
+        conflict = find_conflict(
+            tutor_request.tutor_id, student_request.student_id, student_request.day_of_week, start_time, duration,
+            frequency=student_request.frequency, starts_on=timezone.localdate(),
+        )
+        if conflict is not None:
+            raise PairingError(
+                f"This lesson overlaps with {conflict.subject} on {conflict.day_of_week} "
+                f"at {conflict.start_time:%H:%M}."
+            )
+
+        lesson = LessonSchedule.objects.create(
+            tutor_id=tutor_request.tutor_id,
+            tutor_request=tutor_request,
+            student_id=student_request.student_id,
+            subject=student_request.language,
+            day_of_week=student_request.day_of_week,
+            start_time=start_time,
+            duration=duration,
+            frequency=student_request.frequency,
+            status="scheduled",
+        )
+        student_request.status = "approved"
+        student_request.save(update_fields=["status"])
+        tutor_request.status = "scheduled"
+        tutor_request.save(update_fields=["status"])
+        if idempotency_key:
+            IdempotencyKey.objects.create(key=idempotency_key, lesson=lesson)
+        sync_occurrences([lesson])
+    return lesson
+
+
+def book(pairs):
+    """Bulk write (student_request, tutor_request, lesson) triples in the current transaction."""
+    lessons = [lesson for _, _, lesson in pairs]
+    # bulk writes skip the signals that maintain the rollups, so apply their deltas here
+    changes = [delta for sr, _, _ in pairs for delta in rollups.deltas(sr, -1)]
+    for student_request, tutor_request, _ in pairs:
+        student_request.status = "approved"
+        tutor_request.status = "scheduled"
+    LessonSchedule.objects.bulk_create(lessons, batch_size=1000)
+    StudentRequest.objects.bulk_update([sr for sr, _, _ in pairs], ["status"], batch_size=1000)
+    TutorRequest.objects.bulk_update([tr for _, tr, _ in pairs], ["status"], batch_size=1000)
+    changes += [delta for sr, _, lesson in pairs for delta in rollups.deltas(sr) + rollups.deltas(lesson)]
+    rollups.apply(changes)
+    sync_occurrences(lessons)
+    # bulk writes skip the signals that normally drop cached bitmaps, fragments and analytics
+    user_ids = {lesson.tutor_id for lesson in lessons} | {lesson.student_id for lesson in lessons}
+    transaction.on_commit(analytics.invalidate)
+    transaction.on_commit(lambda: availability.invalidate(*user_ids))
+    transaction.on_commit(lambda: fragments.bump(fragments.LESSONS, *user_ids))
+    transaction.on_commit(lambda: fragments.bump(fragments.REQUESTS, *user_ids))
+    return lessons
+
+
+def _clean_row(row):
+    """Return (student_request_id, tutor_request_id, start_time, duration) from a submitted row."""
+    try:
+        student_request_id = int(row["student_request_id"])
+        tutor_request_id = int(row["tutor_request_id"])
+        duration = int(row["duration"])
+        start_time = row["start_time"] if isinstance(row["start_time"], time) else parse_time(str(row["start_time"]))
+    except (KeyError, TypeError, ValueError):
+        start_time = None
+    if start_time is None:
+        raise PairingError("Each pair needs a student request, tutor request, valid start time and duration.")
+    if duration <= 0:
+        raise PairingError("Duration must be a positive number of minutes.")
+    return student_request_id, tutor_request_id, start_time, duration
+
+
+def pair_batch(rows):
+    """Pair many student requests with tutor slots in one all-or-nothing transaction.
+
+    ``rows`` are mappings with student_request_id, tutor_request_id,
+    start_time and duration. Every row is validated against rows fetched
+    in two queries and one interval index covering every user involved;
+    if any row fails, nothing is written and BatchPairingError lists why.
+    """
+    errors, cleaned = [], []
+    for number, row in enumerate(rows, start=1):
+        try:
+            cleaned.append((number, *_clean_row(row)))
+        except PairingError as error:
+            errors.append((number, str(error)))
+
+    with transaction.atomic():
+        student_requests = StudentRequest.objects.select_for_update().in_bulk([row[1] for row in cleaned])
+        tutor_requests = TutorRequest.objects.select_for_update().in_bulk([row[2] for row in cleaned])
+        timetable = ScheduleIndex.for_users(
+            {sr.student_id for sr in student_requests.values()} | {tr.tutor_id for tr in tutor_requests.values()}
+        )
+        pairs, used_students, used_tutors = [], set(), set()
+        for number, student_request_id, tutor_request_id, start_time, duration in cleaned:
+            student_request = student_requests.get(student_request_id)
+            tutor_request = tutor_requests.get(tutor_request_id)
+            if student_request is None or tutor_request is None:
+                errors.append((number, "Student or tutor request not found."))
+            elif student_request.status != "pending" or student_request_id in used_students:
+                errors.append((number, f"Student request {student_request_id} is not pending."))
+            elif tutor_request.status != "available" or tutor_request_id in used_tutors:
+                errors.append((number, f"Tutor request {tutor_request_id} is not available."))
+            else:
+                lesson = LessonSchedule(
+                    tutor_id=tutor_request.tutor_id,
+                    tutor_request=tutor_request,
+                    student_id=student_request.student_id,
+                    subject=student_request.language,
+                    day_of_week=student_request.day_of_week,
+                    start_time=start_time,
+                    duration=duration,
+                    frequency=student_request.frequency,
+                    status="scheduled",
+                )
+                if not timetable.reserve(lesson):
+                    errors.append((number, "This lesson overlaps with another lesson of the tutor or student."))
+                    continue
+                used_students.add(student_request_id)
+                used_tutors.add(tutor_request_id)
+                pairs.append((student_request, tutor_request, lesson))
+        if errors:
+            raise BatchPairingError(sorted(errors))
+        return book(pairs)
@@ -0,0 +1,110 @@
+"""Bank statement reconciliation: mark invoices paid from a CSV of payments.
+
+The statement is read row by row, so its size does not matter. Each row
+needs a ``reference`` naming an invoice (its INV-<id> reference, as shown
+to students) and an ``amount``. Rows are matched against a hash index of
+every unpaid invoice keyed on (invoice id, amount), built with one query;
+the matched invoices are then marked paid in batched UPDATEs in one
+transaction, and every row that did not match goes to a CSV report with
+the reason.
+"""
+import csv
+import re
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from time import perf_counter
+
+from django.db import transaction
+
+from .billing import CENT, set_invoice_status
+from .models import Invoice
+
+REQUIRED_COLUMNS = {"reference", "amount"}
+REPORT_COLUMNS = ["line", "reference", "amount", "reason"]
+_REFERENCE = re.compile(r"INV[\s-]*0*(\d+)", re.IGNORECASE)
+
+
+class PaymentImportError(Exception):
+    """Raised when a statement cannot be read at all."""
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    matched: int = 0
+    unmatched: int = 0
+    paid: int = 0  # invoices marked paid; fewer than matched if some were paid meanwhile
+    seconds: float = 0.0
+
+
+def parse_reference(text):
+    """Return the invoice id a payment reference names, or None.
+
+    Bank references carry extra words, so INV-<id> is searched for anywhere
+    in the text; a reference that is only digits is taken as the id itself.
+    """
+    text = (text or "").strip()
+    if text.isdigit():
+        return int(text)
+    match = _REFERENCE.search(text)
+    return int(match.group(1)) if match else None
+
+
+def parse_amount(text):
+    """Return a statement amount as Decimal to the cent, or None if it is not a positive amount."""
+    text = re.sub(r"[^\d.\-]", "", text or "")
+    try:
+        amount = Decimal(text).quantize(CENT)
+    except InvalidOperation:
+        return None
+    return amount if amount > 0 else None
+
+
+def unpaid_index(chunk_size=2000):
+    """Return {(invoice id, amount): invoice id} for every unpaid invoice, from one query."""
+    invoices = Invoice.objects.filter(status="unpaid").order_by().values_list("id", "amount")
+    return {(invoice_id, amount): invoice_id for invoice_id, amount in invoices.iterator(chunk_size=chunk_size)}
+
+
+def import_payments(lines, report, chunk_size=2000):
+    """Match the payments read from ``lines`` to unpaid invoices and mark those invoices paid.
+
+    ``lines`` is any iterable of CSV text lines, such as an open file, and
+    unmatched rows are written as CSV to the ``report`` file object. Each
+    invoice is matched at most once; a second payment for it is reported.
+    """
+    started = perf_counter()
+    reader = csv.DictReader(lines)
+    columns = {(name or "").strip().lower() for name in reader.fieldnames or []}
+    if not REQUIRED_COLUMNS <= columns:
+        raise PaymentImportError(f"The statement needs {' and '.join(sorted(REQUIRED_COLUMNS))} columns.")
+
+    index = unpaid_index(chunk_size=chunk_size)
+    writer = csv.writer(report)
+    writer.writerow(REPORT_COLUMNS)
+    result, matched_ids = ImportResult(), set()
+    for row in reader:
+        row = {(name or "").strip().lower(): (value or "").strip() for name, value in row.items() if name}
+        result.rows += 1
+        invoice_id, amount = parse_reference(row["reference"]), parse_amount(row["amount"])
+        if invoice_id is None:
+            reason = "no invoice reference"
+        elif amount is None:
+            reason = "not a valid amount"
+        elif (matched := index.pop((invoice_id, amount), None)) is not None:
+            matched_ids.add(matched)
+            continue
+        elif invoice_id in matched_ids:
+            reason = "invoice already matched by an earlier row"
+        else:
+            reason = "no unpaid invoice with this reference and amount"
+        result.unmatched += 1
+        writer.writerow([reader.line_num, row["reference"], row["amount"], reason])
+
+    result.matched = len(matched_ids)
+    matched_ids = sorted(matched_ids)
+    with transaction.atomic():
+        for start in range(0, len(matched_ids), chunk_size):
+            result.paid += set_invoice_status(matched_ids[start:start + chunk_size], "paid")
+    result.seconds = perf_counter() - started
+    return result
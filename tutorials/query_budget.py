@@ -0,0 +1,84 @@
+"""Per-view database query budgets.
+
+Views declare the most queries a request may make with @query_budget;
+QueryBudgetMiddleware reports overruns while DEBUG is on and the
+test_query_budgets suite enforces every budget against a seeded dataset.
+"""
+import logging
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY_BUDGET = 10
+
+
+def query_budget(max_queries):
+    """Declare the most database queries one request to the decorated view may make.
+
+    Apply it above @login_required and friends so the budget is set on the
+    function the URLconf routes to. Class-based views set a ``query_budget``
+    class attribute instead.
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+def budget_for(view):
+    """Return the query budget of a routed view, or DEFAULT_QUERY_BUDGET."""
+    budget = getattr(view, "query_budget", None)
+    if budget is None:
+        budget = getattr(getattr(view, "view_class", None), "query_budget", None)
+    return DEFAULT_QUERY_BUDGET if budget is None else budget
+
+
+class QueryCounter:
+    """Database execute wrapper that counts the queries run through it."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries():
+    """Count the queries run on the default connection inside the block."""
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        yield counter
+
+
+class QueryBudgetMiddleware:
+    """Flag responses whose view went over its query budget; only active when DEBUG is on.
+
+    Every response carries an X-Query-Count header, and overruns are logged
+    as warnings and tagged with X-Query-Budget-Exceeded.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DEBUG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with count_queries() as counter:
+            response = self.get_response(request)
+        match = request.resolver_match
+        if match is None:
+            return response
+        budget = budget_for(match.func)
+        response["X-Query-Count"] = str(counter.count)
+        if counter.count > budget:
+            response["X-Query-Budget-Exceeded"] = f"{counter.count}/{budget}"
+            logger.warning(
+                "%s made %d queries, over its budget of %d", match.view_name, counter.count, budget
+            )
+        return response
@@ -0,0 +1,105 @@
+"""Overdue invoice reminders, written to the OutboxEmail table and sent in batches.
+
+scan_overdue() finds the unpaid invoices past their due date through the
+partial invoice_unpaid_due_idx index and bulk creates one reminder for
+each that has not had one in the last REMIND_EVERY. deliver() then sends
+unsent emails BATCH_SIZE at a time over a single connection of the
+configured email backend, so no request waits on mail and the mail
+server is not reconnected per invoice.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from .models import Invoice, OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+REMIND_EVERY = timedelta(days=7)  # an invoice is reminded about at most this often
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5  # emails that failed this often are left for someone to look at
+
+REMINDER_SUBJECT = "Invoice {reference} is overdue"
+REMINDER_BODY = """Dear {name},
+
+Invoice {reference} for ${amount} was due on {due_date:%d %B %Y} and has not been paid yet.
+Please pay it quoting the reference {reference}. If you have already paid, thank you, and
+please ignore this reminder.
+"""
+
+
+@dataclass
+class DeliveryResult:
+    sent: int = 0
+    failed: int = 0
+
+
+def overdue_invoices(today=None):
+    """Return the unpaid invoices due before ``today`` that have not been reminded about lately."""
+    today = today or timezone.localdate()
+    reminded = OutboxEmail.objects.filter(invoice=OuterRef("pk"), created_at__gte=timezone.now() - REMIND_EVERY)
+    return Invoice.objects.filter(status="unpaid", due_date__lt=today).exclude(Exists(reminded))
+
+
+def scan_overdue(today=None, chunk_size=2000):
+    """Write a reminder to the outbox for every overdue invoice and return how many were written."""
+    invoices = (
+        overdue_invoices(today)
+        .exclude(student__user__email="")
+        .order_by()
+        .values_list("id", "amount", "due_date", "student__user__email", "student__user__first_name")
+    )
+    emails, written = [], 0
+    for invoice_id, amount, due_date, email, first_name in invoices.iterator(chunk_size=chunk_size):
+        details = {
+            "reference": f"INV-{invoice_id}", "amount": amount, "due_date": due_date, "name": first_name or "student",
+        }
+        emails.append(OutboxEmail(
+            invoice_id=invoice_id, to=email,
+            subject=REMINDER_SUBJECT.format(**details), body=REMINDER_BODY.format(**details),
+        ))
+        if len(emails) >= chunk_size:
+            written += len(OutboxEmail.objects.bulk_create(emails))
+            emails.clear()
+    written += len(OutboxEmail.objects.bulk_create(emails))
+    return written
+
+
+def deliver(batch_size=BATCH_SIZE, connection=None):
+    """Send the unsent outbox emails in batches over one connection and mark them sent.
+
+    Each batch is handed to the backend's send_messages() and recorded with
+    one UPDATE. A batch the backend fails on counts an attempt against each
+    of its emails and ends the run, as the connection may be gone; emails
+    of it that did go out are sent again next time.
+    """
+    connection = connection or get_connection()
+    result, last_id = DeliveryResult(), 0
+    with connection:
+        while True:
+            batch = list(
+                OutboxEmail.objects.filter(sent_at__isnull=True, attempts__lt=MAX_ATTEMPTS, id__gt=last_id)
+                .order_by("id")[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+            ids = [email.id for email in batch]
+            try:
+                connection.send_messages([
+                    EmailMessage(email.subject, email.body, to=[email.to], connection=connection) for email in batch
+                ])
+            except Exception as error:
+                logger.exception("Sending %d outbox emails failed", len(batch))
+                OutboxEmail.objects.filter(id__in=ids).update(attempts=F("attempts") + 1, last_error=str(error))
+                result.failed += len(batch)
+                break
+            OutboxEmail.objects.filter(id__in=ids).update(
+                sent_at=timezone.now(), attempts=F("attempts") + 1, last_error=""
+            )
+            result.sent += len(batch)
+    return result
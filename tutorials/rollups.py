@@ -0,0 +1,155 @@
+"""Daily rollup tables kept in step with the fact tables they summarise.
+
+Each tracked row contributes deltas of the form (rollup model, key, field,
+amount). Signals apply a row's new contribution minus its old one with
+F() increments; code that writes in bulk applies the deltas itself, and
+rebuild() recomputes every rollup from scratch.
+
+Per-student balances ride on the same deltas: an invoice adds its amount
+to its student's StudentBalance as paid or outstanding, so they change in
+the transaction that writes the invoice.
+"""
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import (
+    DailyRequestRollup, DailyRollup, Feedback, Invoice, LessonSchedule, StudentBalance, StudentRequest, User,
+)
+
+
+def _day(value):
+    if isinstance(value, datetime):
+        return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+    if isinstance(value, str):
+        return parse_date(value)
+    return value
+
+
+def invoice_deltas(invoice):
+    paid = (invoice.status or "").lower() == "paid"
+    amount = Decimal(str(invoice.amount or 0))
+    return [
+        (DailyRollup, (("date", _day(invoice.due_date)),), "revenue_paid" if paid else "revenue_unpaid", amount),
+        (StudentBalance, (("student_id", invoice.student_id),), "paid" if paid else "outstanding", amount),
+    ]
+
+
+def lesson_deltas(lesson):
+    return [(DailyRollup, (("date", _day(lesson.starts_on)),), "lesson_minutes", int(lesson.duration or 0))]
+
+
+def request_deltas(student_request):
+    key = (
+        ("date", _day(student_request.created_at or timezone.now())),
+        ("status", (student_request.status or "").lower()),
+        ("language", (student_request.language or "").strip().casefold()),
+    )
+    return [(DailyRequestRollup, key, "count", 1)]
+
+
+def feedback_deltas(feedback):
+    return [(DailyRollup, (("date", _day(feedback.posted or timezone.now())),), "feedback_count", 1)]
+
+
+def signup_deltas(user):
+    return [(DailyRollup, (("date", _day(user.date_joined)),), "signups", 1)]
+
+
+CONTRIBUTIONS = {
+    Invoice: invoice_deltas,
+    LessonSchedule: lesson_deltas,
+    StudentRequest: request_deltas,
+    Feedback: feedback_deltas,
+    User: signup_deltas,
+}
+
+
+def deltas(instance, sign=1):
+    """Return the rollup deltas of one fact row, negated when ``sign`` is -1."""
+    return [
+        (model, key, field, amount * sign)
+        for model, key, field, amount in CONTRIBUTIONS[type(instance)](instance)
+    ]
+
+
+def apply(changes):
+    """Add the deltas to their rollup rows, one F() UPDATE per row touched.
+
+    Rows that do not exist yet are created; a concurrent creation is caught
+    by the unique constraint and turned back into an increment. A missing
+    row that would only be decremented is left alone: that happens when a
+    student is deleted, as their balance goes before their invoices do.
+    """
+    rows = defaultdict(lambda: defaultdict(int))
+    for model, key, field, amount in changes:
+        rows[(model, key)][field] += amount
+    for (model, key), fields in rows.items():
+        fields = {field: amount for field, amount in fields.items() if amount}
+        if not fields:
+            continue
+        lookup = dict(key)
+        increments = {field: F(field) + amount for field, amount in fields.items()}
+        if model.objects.filter(**lookup).update(**increments):
+            continue
+        if all(amount < 0 for amount in fields.values()):
+            continue
+        try:
+            with transaction.atomic():
+                model.objects.create(**lookup, **fields)
+        except IntegrityError:
+            model.objects.filter(**lookup).update(**increments)
+
+
+def rebuild(chunk_size=2000):
+    """Recompute every rollup row with one streaming scan per fact table.
+
+    Only the columns the rollups need are read, through iterator(), so the
+    fact tables never have to fit in memory; the totals do, as they hold
+    one entry per day (and status and language for requests) and one
+    balance per student with invoices.
+    """
+    totals = defaultdict(lambda: defaultdict(int))
+    request_counts = defaultdict(int)
+    balances = defaultdict(lambda: defaultdict(int))
+
+    invoices = Invoice.objects.values_list("student_id", "due_date", "status", "amount")
+    for student_id, due_date, status, amount in invoices.iterator(chunk_size=chunk_size):
+        paid = (status or "").lower() == "paid"
+        totals[due_date]["revenue_paid" if paid else "revenue_unpaid"] += amount
+        balances[student_id]["paid" if paid else "outstanding"] += amount
+    lessons = LessonSchedule.objects.values_list("starts_on", "duration")
+    for starts_on, duration in lessons.iterator(chunk_size=chunk_size):
+        totals[starts_on]["lesson_minutes"] += duration or 0
+    for posted in Feedback.objects.values_list("posted", flat=True).iterator(chunk_size=chunk_size):
+        totals[_day(posted)]["feedback_count"] += 1
+    for date_joined in User.objects.order_by().values_list("date_joined", flat=True).iterator(chunk_size=chunk_size):
+        totals[_day(date_joined)]["signups"] += 1
+    student_requests = StudentRequest.objects.values_list("created_at", "status", "language")
+    for created_at, status, language in student_requests.iterator(chunk_size=chunk_size):
+        request_counts[(_day(created_at), (status or "").lower(), (language or "").strip().casefold())] += 1
+
+    with transaction.atomic():
+        DailyRollup.objects.all().delete()
+        DailyRequestRollup.objects.all().delete()
+        StudentBalance.objects.all().delete()
+        DailyRollup.objects.bulk_create(
+            [DailyRollup(date=day, **fields) for day, fields in totals.items()], batch_size=chunk_size
+        )
+        DailyRequestRollup.objects.bulk_create(
+            [
+                DailyRequestRollup(date=day, status=status, language=language, count=count)
+                for (day, status, language), count in request_counts.items()
+            ],
+            batch_size=chunk_size,
+        )
+        StudentBalance.objects.bulk_create(
+            [StudentBalance(student_id=student_id, **fields) for student_id, fields in balances.items()],
+            batch_size=chunk_size,
+        )
+    return len(totals), len(request_counts)
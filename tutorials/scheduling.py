@@ -0,0 +1,312 @@
+"""Lesson timetable helpers: interval indexes, double-booking detection and occurrences."""
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+from datetime import date, datetime, timedelta
+from itertools import islice
+from operator import attrgetter
+import heapq
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import DAY_CHOICES, LessonOccurrence, LessonSchedule
+
+DAYS = [day for day, _ in DAY_CHOICES]
+MINUTES_PER_DAY = 24 * 60
+OCCURRENCE_HORIZON = timedelta(days=90)
+FORTNIGHT_EPOCH = date(1970, 1, 5)  # a Monday; fortnightly lessons alternate weeks counted from it
+
+
+def lesson_intervals(day_of_week, start_time, duration):
+    """Split a lesson into (day, start_minute, end_minute) pieces.
+
+    A lesson running past midnight yields a second piece on the next day.
+    """
+    day = (day_of_week or "").lower()
+    if day not in DAYS or start_time is None or not duration:
+        return []
+    start = start_time.hour * 60 + start_time.minute
+    end = start + int(duration)
+    pieces = [(day, start, min(end, MINUTES_PER_DAY))]
+    if end > MINUTES_PER_DAY:
+        next_day = DAYS[(DAYS.index(day) + 1) % len(DAYS)]
+        pieces.append((next_day, 0, end - MINUTES_PER_DAY))
+    return pieces
+
+
+def week_parity(day_of_week, frequency, starts_on):
+    """Return which week (0 or 1) a fortnightly lesson runs in, or None for a weekly one.
+
+    Weeks run Monday to Sunday from FORTNIGHT_EPOCH, and the parity is that
+    of the week holding the lesson's first occurrence on or after starts_on.
+    """
+    day = (day_of_week or "").lower()
+    if (frequency or "").lower() != "fortnightly" or day not in DAYS or starts_on is None:
+        return None
+    first = starts_on + timedelta(days=(DAYS.index(day) - starts_on.weekday()) % 7)
+    return (first - FORTNIGHT_EPOCH).days // 7 % 2
+
+
+def parity_intervals(day_of_week, start_time, duration, parity):
+    """Yield (day, start_minute, end_minute, parity) for the pieces of a lesson.
+
+    A fortnightly lesson wrapping from Sunday into Monday has its second
+    piece in the next week, so that piece takes the other parity.
+    """
+    for day, start, end in lesson_intervals(day_of_week, start_time, duration):
+        if parity is not None and day == DAYS[0] and (day_of_week or "").lower() != DAYS[0]:
+            yield day, start, end, 1 - parity
+        else:
+            yield day, start, end, parity
+
+
+def same_weeks(parity, other_parity):
+    """Return whether lessons of the two parities can meet; weekly lessons (None) meet every lesson."""
+    return parity is None or other_parity is None or parity == other_parity
+
+
+def _parities(parity):
+    return (None, 0, 1) if parity is None else (None, parity)
+
+
+class IntervalIndex:
+    """Intervals of one user on one weekday, sorted for O(log n) overlap queries."""
+
+    def __init__(self, intervals):
+        self.intervals = sorted(intervals)
+        self.starts = [start for start, _, _ in self.intervals]
+        # Position of the interval with the latest end among the first i + 1.
+        self.latest_end_at = []
+        latest = None
+        for position, (_, end, _) in enumerate(self.intervals):
+            if latest is None or end > self.intervals[latest][1]:
+                latest = position
+            self.latest_end_at.append(latest)
+
+    def overlapping(self, start, end):
+        """Return the key of an interval overlapping [start, end), or None."""
+        candidates = bisect_left(self.starts, end)
+        if not candidates:
+            return None
+        _, latest_end, key = self.intervals[self.latest_end_at[candidates - 1]]
+        return key if latest_end > start else None
+
+
+class ScheduleIndex:
+    """Per (user, weekday, week parity) interval indexes over a set of scheduled lessons.
+
+    Weekly lessons are indexed under parity None and fortnightly ones under
+    the week they run in, so a fortnightly slot is only checked against
+    weekly lessons and fortnightly lessons of the same weeks.
+    """
+
+    def __init__(self, lessons):
+        self.lessons = []
+        intervals = defaultdict(list)
+        for lesson in lessons:
+            for key, interval in self._intervals(lesson):
+                intervals[key].append(interval)
+        self.indexes = {key: IntervalIndex(value) for key, value in intervals.items()}
+
+    def _intervals(self, lesson):
+        position = len(self.lessons)
+        self.lessons.append(lesson)
+        parity = week_parity(lesson.day_of_week, lesson.frequency, lesson.starts_on)
+        for day, start, end, piece_parity in parity_intervals(
+            lesson.day_of_week, lesson.start_time, lesson.duration, parity
+        ):
+            for user_id in {lesson.tutor_id, lesson.student_id}:
+                yield (user_id, day, piece_parity), (start, end, position)
+
+    @classmethod
+    def for_users(cls, user_ids, exclude=None):
+        """Build an index over the scheduled lessons of the given users."""
+        lessons = LessonSchedule.objects.filter(status="scheduled").filter(
+            Q(tutor_id__in=user_ids) | Q(student_id__in=user_ids)
+        )
+        if exclude is not None:
+            lessons = lessons.exclude(pk=exclude)
+        return cls(lessons)
+
+    def conflict(self, user_id, day_of_week, start_time, duration, frequency=None, starts_on=None):
+        """Return a lesson of the user overlapping the given slot, or None.
+
+        Without a frequency the slot is taken to be weekly.
+        """
+        parity = week_parity(day_of_week, frequency, starts_on)
+        for day, start, end, piece_parity in parity_intervals(day_of_week, start_time, duration, parity):
+            for other_parity in _parities(piece_parity):
+                index = self.indexes.get((user_id, day, other_parity))
+                position = index.overlapping(start, end) if index else None
+                if position is not None:
+                    return self.lessons[position]
+        return None
+
+    def reserve(self, lesson):
+        """Add a lesson unless it clashes for its tutor or student; return whether it was added."""
+        for user_id in (lesson.tutor_id, lesson.student_id):
+            conflict = self.conflict(
+                user_id, lesson.day_of_week, lesson.start_time, lesson.duration, lesson.frequency, lesson.starts_on
+            )
+            if conflict is not None:
+                return False
+        for key, interval in self._intervals(lesson):
+            index = self.indexes.get(key)
+            self.indexes[key] = IntervalIndex((index.intervals if index else []) + [interval])
+        return True
+
+
+def find_conflict(
+    tutor_id, student_id, day_of_week, start_time, duration, exclude=None, frequency=None, starts_on=None
+):
+    """Return a scheduled lesson clashing with the slot for the tutor or student, or None.
+
+    A fortnightly slot (``frequency`` and ``starts_on`` given) only clashes
+    with weekly lessons and with fortnightly lessons in the same weeks.
+    """
+    index = ScheduleIndex.for_users([tutor_id, student_id], exclude=exclude)
+    for user_id in (tutor_id, student_id):
+        lesson = index.conflict(user_id, day_of_week, start_time, duration, frequency, starts_on)
+        if lesson is not None:
+            return lesson
+    return None
+
+
+def overlap_report():
+    """Yield (user_id, day, lesson_id, other_lesson_id) for every double booking.
+
+    Scheduled lessons are grouped per (user, weekday) and each group is swept
+    in start order, keeping a heap of the lessons still running. Fortnightly
+    lessons on alternate weeks never meet, so they are not reported.
+    """
+    intervals = defaultdict(list)
+    lessons = LessonSchedule.objects.filter(status="scheduled").values_list(
+        "id", "tutor_id", "student_id", "day_of_week", "start_time", "duration", "frequency", "starts_on"
+    )
+    for lesson_id, tutor_id, student_id, day_of_week, start_time, duration, frequency, starts_on in lessons.iterator(
+        chunk_size=2000
+    ):
+        parity = week_parity(day_of_week, frequency, starts_on)
+        for day, start, end, piece_parity in parity_intervals(day_of_week, start_time, duration, parity):
+            for user_id in {tutor_id, student_id}:
+                intervals[(user_id, day)].append((start, end, lesson_id, piece_parity))
+
+    for (user_id, day), group in sorted(intervals.items(), key=lambda item: (item[0][0], DAYS.index(item[0][1]))):
+        running = []
+        for start, end, lesson_id, parity in sorted(group, key=lambda entry: entry[:3]):
+            while running and running[0][0] <= start:
+                heapq.heappop(running)
+            for _, other_id, other_parity in sorted(running, key=lambda entry: entry[1]):
+                if same_weeks(parity, other_parity):
+                    yield user_id, day, other_id, lesson_id
+            heapq.heappush(running, (end, lesson_id, parity))
+
+
+Occurrence = namedtuple("Occurrence", ["lesson", "starts_at", "ends_at"])
+
+
+def _first_date(lesson, start):
+    """Return (first occurrence date on or after start, step between occurrences), or None."""
+    day = (lesson.day_of_week or "").lower()
+    if day not in DAYS or lesson.start_time is None:
+        return None
+    weekday = DAYS.index(day)
+    step = timedelta(weeks=2 if (lesson.frequency or "").lower() == "fortnightly" else 1)
+    anchor = lesson.starts_on + timedelta(days=(weekday - lesson.starts_on.weekday()) % 7)
+    current = anchor
+    if start > anchor:
+        current += step * -(-(start - anchor).days // step.days)
+    return current, step
+
+
+def occurrence_count(lesson, start, end):
+    """Return how many occurrences lesson_occurrences would yield, without building them."""
+    first = _first_date(lesson, start)
+    if first is None or first[0] >= end:
+        return 0
+    current, step = first
+    return -(-(end - current).days // step.days)
+
+
+def lesson_occurrences(lesson, start, end):
+    """Yield the occurrences of one lesson between the dates start (inclusive) and end (exclusive).
+
+    Weekly lessons repeat every 7 days and fortnightly ones every 14 days,
+    both counted from the first matching weekday on or after ``starts_on``.
+    """
+    first = _first_date(lesson, start)
+    if first is None:
+        return
+    current, step = first
+    duration = timedelta(minutes=lesson.duration or 0)
+    tz = timezone.get_current_timezone()
+    while current < end:
+        starts_at = timezone.make_aware(datetime.combine(current, lesson.start_time), tz)
+        yield Occurrence(lesson, starts_at, starts_at + duration)
+        current += step
+
+
+def occurrences(lessons, start, end):
+    """Lazily yield the occurrences of several lessons in chronological order.
+
+    Only one pending occurrence per lesson is held in memory, so a whole term
+    can be streamed without building it up front.
+    """
+    return heapq.merge(
+        *(lesson_occurrences(lesson, start, end) for lesson in lessons),
+        key=attrgetter("starts_at"),
+    )
+
+
+def occurrences_in_batches(lessons, start, end, batch_size=500):
+    """Yield lists of occurrences, one per batch of ``batch_size`` lessons.
+
+    Querysets are read with ``iterator()`` so thousands of schedules can be
+    expanded for calendars, invoicing and reports without caching every row.
+    Occurrences are chronological within a batch, not across batches.
+    """
+    if hasattr(lessons, "iterator"):
+        lessons = lessons.iterator(chunk_size=batch_size)
+    lessons = iter(lessons)
+    while batch := list(islice(lessons, batch_size)):
+        yield list(occurrences(batch, start, end))
+
+
+def materialize_occurrences(lessons, start, end, batch_size=500):
+    """Bulk insert LessonOccurrence rows for the lessons between start and end.
+
+    Rows that already exist are left alone, so the window can be re-run to
+    roll the horizon forward. Returns the number of occurrences expanded.
+    """
+    count = 0
+    for batch in occurrences_in_batches(lessons, start, end, batch_size=batch_size):
+        LessonOccurrence.objects.bulk_create(
+            [
+                LessonOccurrence(
+                    lesson_id=occurrence.lesson.id,
+                    tutor_id=occurrence.lesson.tutor_id,
+                    student_id=occurrence.lesson.student_id,
+                    date=timezone.localdate(occurrence.starts_at),
+                    starts_at=occurrence.starts_at,
+                    ends_at=occurrence.ends_at,
+                )
+                for occurrence in batch
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+        count += len(batch)
+    return count
+
+
+def sync_occurrences(lessons):
+    """Rebuild the upcoming occurrences of lessons that were created or changed.
+
+    Past occurrences are kept as history; from today onwards the rows are
+    replaced, and lessons that are no longer scheduled simply lose them.
+    """
+    lessons = list(lessons)
+    today = timezone.localdate()
+    LessonOccurrence.objects.filter(lesson__in=lessons, date__gte=today).delete()
+    scheduled = [lesson for lesson in lessons if lesson.status == "scheduled"]
+    return materialize_occurrences(scheduled, today, today + OCCURRENCE_HORIZON)
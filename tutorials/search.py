@@ -0,0 +1,65 @@
+"""Ranked full-text search over feedback.
+
+SQLite answers from the tutorials_feedback_fts FTS5 table, which triggers
+keep in step with the feedback rows (bulk writes included); Postgres uses
+a GIN index over the same columns' tsvector. Both are created by migration
+0014_feedback_search. Other databases fall back to a substring scan.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Feedback
+from .pagination import PAGE_SIZE
+
+_SQLITE_SEARCH = """
+    SELECT tutorials_feedback.*, tutorials_feedback_fts.rank AS score
+    FROM tutorials_feedback_fts
+    JOIN tutorials_feedback ON tutorials_feedback.id = tutorials_feedback_fts.rowid
+    WHERE tutorials_feedback_fts MATCH %s
+    ORDER BY tutorials_feedback_fts.rank
+    LIMIT %s OFFSET %s
+"""
+
+_POSTGRES_SEARCH = """
+    SELECT tutorials_feedback.*, ts_rank(to_tsvector('english', name || ' ' || email || ' ' || message), query) AS score
+    FROM tutorials_feedback, websearch_to_tsquery('english', %s) query
+    WHERE to_tsvector('english', name || ' ' || email || ' ' || message) @@ query
+    ORDER BY score DESC, tutorials_feedback.id DESC
+    LIMIT %s OFFSET %s
+"""
+
+
+def fts5_query(text):
+    """Turn free text into an FTS5 query matching every word, the last one as a prefix.
+
+    Words are quoted, so punctuation in the input is never read as FTS5 syntax.
+    """
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        return ""
+    return " ".join(f'"{word}"' for word in words[:-1]) + f' "{words[-1]}"*'
+
+
+def search_feedback(text, page=1, page_size=PAGE_SIZE):
+    """Return one page of feedback matching ``text``, best match first, and whether a next page exists."""
+    offset = (page - 1) * page_size
+    if connection.vendor == "sqlite":
+        query = fts5_query(text)
+        if not query:
+            return [], False
+        results = list(Feedback.objects.raw(_SQLITE_SEARCH, [query, page_size + 1, offset]))
+    elif connection.vendor == "postgresql":
+        if not (text or "").strip():
+            return [], False
+        results = list(Feedback.objects.raw(_POSTGRES_SEARCH, [text, page_size + 1, offset]))
+    else:
+        words = re.findall(r"\w+", text or "")
+        if not words:
+            return [], False
+        matches = Q()
+        for word in words:
+            matches &= Q(name__icontains=word) | Q(email__icontains=word) | Q(message__icontains=word)
+        results = list(Feedback.objects.filter(matches).order_by("-posted", "-id")[offset:offset + page_size + 1])
+    return results[:page_size], len(results) > page_size
@@ -0,0 +1,82 @@
+"""Signal handlers keeping derived data in step with the models it is built from."""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import analytics, availability, fragments, rollups
+from .models import Feedback, Invoice, LessonSchedule, Student, StudentRequest, Tutor, TutorRequest, User
+
+
+# Cached data is dropped once the write commits: dropped earlier, a reader
+# could cache the old rows again before the new ones are visible.
+@receiver([post_save, post_delete], sender=LessonSchedule)
+def lesson_changed(sender, instance, **kwargs):
+    tutor_id, student_id = instance.tutor_id, instance.student_id
+    transaction.on_commit(lambda: availability.invalidate(tutor_id, student_id))
+    transaction.on_commit(lambda: fragments.bump(fragments.LESSONS, tutor_id, student_id))
+
+
+@receiver([post_save, post_delete], sender=TutorRequest)
+def tutor_request_changed(sender, instance, **kwargs):
+    tutor_id = instance.tutor_id
+    transaction.on_commit(lambda: availability.invalidate(tutor_id))
+    transaction.on_commit(lambda: fragments.bump(fragments.REQUESTS, tutor_id))
+
+
+@receiver([post_save, post_delete], sender=StudentRequest)
+def student_request_changed(sender, instance, **kwargs):
+    student_id = instance.student_id
+    transaction.on_commit(lambda: fragments.bump(fragments.REQUESTS, student_id))
+
+
+@receiver([post_save, post_delete], sender=Invoice)
+def invoice_changed(sender, instance, **kwargs):
+    student_id = instance.student_id
+    transaction.on_commit(lambda: fragments.bump(fragments.INVOICES, student_id))
+
+
+@receiver([post_save, post_delete], sender=User)
+@receiver([post_save, post_delete], sender=Tutor)
+@receiver([post_save, post_delete], sender=Student)
+@receiver([post_save, post_delete], sender=Invoice)
+@receiver([post_save, post_delete], sender=Feedback)
+@receiver([post_save, post_delete], sender=LessonSchedule)
+@receiver([post_save, post_delete], sender=StudentRequest)
+def analytics_source_changed(sender, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return  # logging in does not change any figure
+    transaction.on_commit(analytics.invalidate)
+
+
+# Rows that can change after creation have their stored contribution read
+# just before a save, so the save can apply the difference. Reading it only
+# when saving keeps plain queries free of rollup work.
+@receiver(pre_save, sender=Invoice)
+@receiver(pre_save, sender=LessonSchedule)
+@receiver(pre_save, sender=StudentRequest)
+def load_rollup_contribution(sender, instance, **kwargs):
+    previous = sender.objects.filter(pk=instance.pk).first() if instance.pk is not None else None
+    instance._rollup_deltas = rollups.deltas(previous, -1) if previous is not None else []
+
+
+@receiver(post_save, sender=Invoice)
+@receiver(post_save, sender=LessonSchedule)
+@receiver(post_save, sender=StudentRequest)
+def update_rollups(sender, instance, created, **kwargs):
+    rollups.apply(instance.__dict__.pop("_rollup_deltas", []) + rollups.deltas(instance))
+
+
+@receiver(post_save, sender=Feedback)
+@receiver(post_save, sender=User)
+def count_new_row(sender, instance, created, **kwargs):
+    if created:
+        rollups.apply(rollups.deltas(instance))
+
+
+@receiver(post_delete, sender=Invoice)
+@receiver(post_delete, sender=LessonSchedule)
+@receiver(post_delete, sender=StudentRequest)
+@receiver(post_delete, sender=Feedback)
+@receiver(post_delete, sender=User)
+def remove_from_rollups(sender, instance, **kwargs):
+    rollups.apply(rollups.deltas(instance, -1))
@@ -0,0 +1,101 @@
+"""The admin tables behind the dashboards, exports and the table API.
+
+Each table names its base queryset (with the select_related its columns
+need), the dashboard filter it honours, its columns and its sort keys.
+"""
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Callable
+
+from . import filters
+from .models import Feedback, Invoice, LessonSchedule, StudentRequest, TutorRequest
+
+
+def _full_name(path):
+    user = attrgetter(path)
+    return lambda row: user(row).full_name()
+
+
+@dataclass(frozen=True)
+class Table:
+    queryset: Callable
+    filter: Callable
+    columns: list  # (header, getter) pairs
+    sorts: tuple  # fields rows may be ordered by either way; none may be nullable
+
+
+TABLES = {
+    "invoices": Table(
+        queryset=lambda: Invoice.objects.select_related("student__user", "tutor__user"),
+        filter=filters.invoices,
+        columns=[
+            ("id", attrgetter("id")),
+            ("student", _full_name("student.user")),
+            ("tutor", _full_name("tutor.user")),
+            ("amount", attrgetter("amount")),
+            ("status", attrgetter("status")),
+            ("due_date", attrgetter("due_date")),
+            ("created_at", attrgetter("created_at")),
+        ],
+        sorts=("id", "created_at", "due_date", "amount", "status"),
+    ),
+    "lessons": Table(
+        queryset=lambda: LessonSchedule.objects.select_related("tutor", "student"),
+        filter=filters.lessons,
+        columns=[
+            ("id", attrgetter("id")),
+            ("tutor", _full_name("tutor")),
+            ("student", _full_name("student")),
+            ("subject", attrgetter("subject")),
+            ("day_of_week", attrgetter("day_of_week")),
+            ("start_time", attrgetter("start_time")),
+            ("duration", attrgetter("duration")),
+            ("frequency", attrgetter("frequency")),
+            ("status", attrgetter("status")),
+            ("starts_on", attrgetter("starts_on")),
+        ],
+        sorts=("id", "start_time", "day_of_week", "subject", "status", "starts_on"),
+    ),
+    "student_requests": Table(
+        queryset=lambda: StudentRequest.objects.select_related("student"),
+        filter=filters.student_requests,
+        columns=[
+            ("id", attrgetter("id")),
+            ("student", _full_name("student")),
+            ("language", attrgetter("language")),
+            ("frequency", attrgetter("frequency")),
+            ("day_of_week", attrgetter("day_of_week")),
+            ("preferred_time", attrgetter("preferred_time")),
+            ("difficulty", attrgetter("difficulty")),
+            ("status", attrgetter("status")),
+            ("created_at", attrgetter("created_at")),
+        ],
+        sorts=("id", "created_at", "language", "day_of_week", "status"),
+    ),
+    "tutor_requests": Table(
+        queryset=lambda: TutorRequest.objects.select_related("tutor"),
+        filter=filters.tutor_requests,
+        columns=[
+            ("id", attrgetter("id")),
+            ("tutor", _full_name("tutor")),
+            ("languages", attrgetter("languages")),
+            ("day_of_week", attrgetter("day_of_week")),
+            ("available_time", attrgetter("available_time")),
+            ("level_can_teach", attrgetter("level_can_teach")),
+            ("status", attrgetter("status")),
+        ],
+        sorts=("id", "day_of_week", "level_can_teach", "status"),
+    ),
+    "feedback": Table(
+        queryset=lambda: Feedback.objects.all(),
+        filter=filters.feedback,
+        columns=[
+            ("id", attrgetter("id")),
+            ("name", attrgetter("name")),
+            ("email", attrgetter("email")),
+            ("message", attrgetter("message")),
+            ("posted", attrgetter("posted")),
+        ],
+        sorts=("id", "posted", "name"),
+    ),
+}
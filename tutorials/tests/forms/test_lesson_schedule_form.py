@@ -1,3 +1,4 @@
+from datetime import time
 from django.test import TestCase
 from tutorials.forms import LessonScheduleForm
 from tutorials.models import LessonSchedule, Tutor, Student, User
@@ -38,3 +39,26 @@ class LessonScheduleFormTestCase(TestCase):
         form.instance.tutor = self.tutor.user  # Manually set the tutor
         form.instance.student = self.student.user  # Manually set the student
         self.assertFalse(form.is_valid())
+
+    def test_form_rejects_overlapping_lesson(self):
+        """Test the form rejects a lesson that double-books the tutor."""
+        LessonSchedule.objects.create(
+            tutor=self.tutor.user, student=self.student.user, subject="Physics",
+            day_of_week="monday", start_time=time(10, 30), duration=60, frequency="weekly", status="scheduled",
+        )
+        lesson = LessonSchedule.objects.create(
+            tutor=self.tutor.user, student=self.student.user, subject="Mathematics",
+            day_of_week="monday", start_time=time(8), duration=60, frequency="weekly", status="scheduled",
+        )
+        form = LessonScheduleForm(data=dict(self.form_input, day_of_week="monday", status="scheduled"), instance=lesson)
+        self.assertFalse(form.is_valid())
+        self.assertIn("This lesson overlaps with Physics on monday at 10:30.", form.non_field_errors())
+
+    def test_form_allows_editing_lesson_in_place(self):
+        """Test the form does not treat a lesson as clashing with itself."""
+        lesson = LessonSchedule.objects.create(
+            tutor=self.tutor.user, student=self.student.user, subject="Mathematics",
+            day_of_week="monday", start_time=time(10), duration=60, frequency="weekly", status="scheduled",
+        )
+        form = LessonScheduleForm(data=dict(self.form_input, day_of_week="monday", status="scheduled"), instance=lesson)
+        self.assertTrue(form.is_valid())
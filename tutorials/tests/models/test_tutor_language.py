@@ -0,0 +1,69 @@
+"""Unit tests for the TutorLanguage token index."""
+from django.test import TestCase
+from tutorials.models import TutorLanguage, TutorRequest, User, tokenize_languages
+
+
+class TutorLanguageTestCase(TestCase):
+    """Unit tests for the TutorLanguage token index."""
+
+    def setUp(self):
+        self.tutor = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        )
+        self.tutor_request = TutorRequest.objects.create(
+            tutor=self.tutor,
+            languages="Python, JavaScript",
+            day_of_week="Monday",
+            level_can_teach="Beginner",
+            available_time="10:00",
+        )
+
+    def test_tokenize_languages(self):
+        self.assertEqual(tokenize_languages(" Python,java/ C++ ;python"), ["c++", "java", "python"])
+        self.assertEqual(tokenize_languages(""), [])
+        self.assertEqual(tokenize_languages(None), [])
+
+    def test_tokens_created_on_save(self):
+        tokens = TutorLanguage.objects.filter(tutor_request=self.tutor_request)
+        self.assertEqual(sorted(tokens.values_list("language", flat=True)), ["javascript", "python"])
+        self.assertTrue(all(token.day_of_week == "monday" for token in tokens))
+        self.assertTrue(all(token.level_can_teach == "beginner" for token in tokens))
+
+    def test_tokens_rebuilt_when_languages_change(self):
+        self.tutor_request.languages = "Scala"
+        self.tutor_request.save()
+        tokens = TutorLanguage.objects.filter(tutor_request=self.tutor_request)
+        self.assertEqual(list(tokens.values_list("language", flat=True)), ["scala"])
+
+    def test_tokens_untouched_by_status_only_save(self):
+        token_ids = set(TutorLanguage.objects.values_list("id", flat=True))
+        self.tutor_request.status = "busy"
+        self.tutor_request.save(update_fields=["status"])
+        self.assertEqual(set(TutorLanguage.objects.values_list("id", flat=True)), token_ids)
+
+    def test_teaching_matches_whole_language_tokens(self):
+        self.assertIn(self.tutor_request, TutorRequest.objects.teaching("python"))
+        self.assertIn(self.tutor_request, TutorRequest.objects.teaching("JavaScript"))
+        self.assertNotIn(self.tutor_request, TutorRequest.objects.teaching("Java"))
+
+    def test_teaching_filters_day_and_level(self):
+        self.assertIn(
+            self.tutor_request,
+            TutorRequest.objects.teaching("Python", day_of_week="monday", level_can_teach="beginner"),
+        )
+        self.assertNotIn(
+            self.tutor_request,
+            TutorRequest.objects.teaching("Python", day_of_week="tuesday", level_can_teach="beginner"),
+        )
+        self.assertNotIn(
+            self.tutor_request,
+            TutorRequest.objects.teaching("Python", day_of_week="monday", level_can_teach="advanced"),
+        )
+
+    def test_rebuild_indexes_bulk_created_requests(self):
+        bulk_request = TutorRequest.objects.bulk_create([
+            TutorRequest(tutor=self.tutor, languages="Java", day_of_week="tuesday", level_can_teach="advanced"),
+        ])[0]
+        self.assertNotIn(bulk_request, TutorRequest.objects.teaching("Java"))
+        TutorLanguage.rebuild(TutorRequest.objects.filter(language_tokens__isnull=True))
+        self.assertIn(bulk_request, TutorRequest.objects.teaching("Java"))
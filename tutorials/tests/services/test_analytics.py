@@ -0,0 +1,116 @@
+"""Unit tests for the cached analytics summary."""
+from datetime import date, timedelta
+from threading import Event, Thread
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase
+from tutorials import analytics
+from tutorials.models import Feedback, Invoice, LessonSchedule, Student, StudentRequest, Tutor, User
+
+
+class AnalyticsSummaryTestCase(TestCase):
+    """Unit tests for compute_summary and summary."""
+
+    def setUp(self):
+        cache.clear()
+        tutor_user = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        )
+        student_user = User.objects.create_user(
+            username="@student", email="student@example.com", password="Password123", role="student"
+        )
+        inactive = User.objects.create_user(
+            username="@inactive", email="inactive@example.com", password="Password123", role="student",
+            is_active=False,
+        )
+        self.tutor = Tutor.objects.create(user=tutor_user)
+        self.student = Student.objects.create(user=student_user)
+        Student.objects.create(user=inactive)
+        Invoice.objects.create(student=self.student, tutor=self.tutor, amount=100, due_date=date.today())
+        Invoice.objects.create(student=self.student, tutor=self.tutor, amount=40, due_date=date.today() + timedelta(days=62))
+        LessonSchedule.objects.create(
+            tutor=tutor_user, student=student_user, subject="Python", day_of_week="monday",
+            start_time="10:00", duration=90, frequency="weekly",
+        )
+        Feedback.objects.create(name="A", email="a@example.com", message="Good")
+        StudentRequest.objects.create(student=student_user, language="Python", frequency="weekly", status="pending")
+        StudentRequest.objects.create(student=student_user, language="Java", frequency="weekly", status="approved")
+
+    def test_summary_in_one_query(self):
+        with self.assertNumQueries(1):
+            summary = analytics.compute_summary()
+        self.assertEqual(summary, {
+            "total_tutors": 1,
+            "total_students": 2,
+            "active_tutors": 1,
+            "active_students": 1,
+            "hours_taught": 90,
+            "total_feedback": 1,
+            "total_revenue": 140,
+            "monthly_revenue": 100,
+            "pending_requests": 1,
+        })
+
+    def test_summary_with_empty_tables(self):
+        Invoice.objects.all().delete()
+        LessonSchedule.objects.all().delete()
+        summary = analytics.compute_summary()
+        self.assertEqual((summary["total_revenue"], summary["hours_taught"]), (0, 0))
+
+    def test_snapshot_is_cached_until_invalidated(self):
+        analytics.summary()
+        with self.assertNumQueries(0):
+            analytics.summary()
+        with self.captureOnCommitCallbacks(execute=True):
+            Feedback.objects.create(name="B", email="b@example.com", message="Great")
+        with self.assertNumQueries(1):
+            self.assertEqual(analytics.summary()["total_feedback"], 2)
+
+    def test_snapshot_is_invalidated_only_once_the_write_commits(self):
+        analytics.summary()
+        with self.captureOnCommitCallbacks(execute=True):
+            Feedback.objects.create(name="B", email="b@example.com", message="Great")
+            with self.assertNumQueries(0):
+                self.assertEqual(analytics.summary()["total_feedback"], 1)
+        self.assertEqual(analytics.summary()["total_feedback"], 2)
+
+    def test_logging_in_keeps_snapshot_fresh(self):
+        analytics.summary()
+        user = User.objects.get(username="@tutor")
+        self.client.force_login(user)
+        with self.assertNumQueries(0):
+            analytics.summary()
+
+    def test_stale_snapshot_is_served_while_another_request_recomputes(self):
+        analytics.summary()
+        analytics.invalidate()
+        cache.add(analytics.LOCK_KEY, True)
+        with self.assertNumQueries(0):
+            self.assertEqual(analytics.summary()["total_feedback"], 1)
+
+    def test_concurrent_cold_requests_compute_once(self):
+        started, release = Event(), Event()
+
+        def slow_compute():
+            started.set()
+            release.wait(5)
+            return {"total_feedback": 1}
+
+        results = []
+        with mock.patch.object(analytics, "compute_summary", side_effect=slow_compute) as patched:
+            winner = Thread(target=lambda: results.append(analytics.summary()))
+            winner.start()
+            started.wait(5)
+            waiter = Thread(target=lambda: results.append(analytics.summary()))
+            waiter.start()
+            release.set()
+            winner.join()
+            waiter.join()
+        self.assertEqual(patched.call_count, 1)
+        self.assertEqual(results, [{"total_feedback": 1}] * 2)
+
+    def test_monthly_revenue_ignores_other_years(self):
+        Invoice.objects.create(
+            student=self.student, tutor=self.tutor, amount=1000, due_date=date.today().replace(year=date.today().year - 1, day=1)
+        )
+        self.assertEqual(analytics.compute_summary()["monthly_revenue"], 100)
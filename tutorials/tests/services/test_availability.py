@@ -0,0 +1,110 @@
+"""Unit tests for the weekly availability bitmaps."""
+from datetime import time
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase
+from tutorials.availability import (
+    BITMAP_TTL, SLOTS_PER_DAY, busy_bitmap, open_bitmap, slot_mask, suggest_start_times, warm,
+)
+from tutorials.models import LessonSchedule, TutorRequest, User
+
+
+class AvailabilityTestCase(TestCase):
+    """Unit tests for the availability bitmaps and start time suggestions."""
+
+    def setUp(self):
+        cache.clear()
+        self.tutor = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        )
+        self.student = User.objects.create_user(
+            username="@student", email="student@example.com", password="Password123", role="student"
+        )
+        self.other = User.objects.create_user(
+            username="@other", email="other@example.com", password="Password123", role="student"
+        )
+        self.tutor_request = TutorRequest.objects.create(
+            tutor=self.tutor, languages="Python", day_of_week="monday",
+            level_can_teach="beginner", available_time=time(10),
+        )
+
+    def test_slot_mask(self):
+        self.assertEqual(slot_mask("monday", time(0), 30), 0b1)
+        self.assertEqual(slot_mask("monday", time(0, 15), 30), 0b11)
+        self.assertEqual(slot_mask("tuesday", time(1), 60), 0b11 << (SLOTS_PER_DAY + 2))
+        self.assertEqual(slot_mask("sunday", time(23, 30), 60), (1 << (7 * SLOTS_PER_DAY - 1)) | 1)
+
+    def test_open_bitmap_covers_availability_window(self):
+        self.assertEqual(open_bitmap(self.tutor.id), slot_mask("monday", time(10), 120))
+
+    def test_suggestions_skip_busy_slots(self):
+        LessonSchedule.objects.create(
+            tutor=self.tutor, student=self.other, subject="Java", day_of_week="Monday",
+            start_time=time(10, 30), duration=30, frequency="weekly", status="scheduled",
+        )
+        self.assertEqual(
+            suggest_start_times(self.tutor.id, self.student.id, "monday", 30),
+            [time(10), time(11), time(11, 30)],
+        )
+        self.assertEqual(
+            suggest_start_times(self.tutor.id, self.student.id, "monday", 60),
+            [time(11)],
+        )
+
+    def test_suggestions_respect_student_lessons(self):
+        LessonSchedule.objects.create(
+            tutor=self.other, student=self.student, subject="Java", day_of_week="monday",
+            start_time=time(11), duration=60, frequency="weekly", status="scheduled",
+        )
+        self.assertEqual(suggest_start_times(self.tutor.id, self.student.id, "Monday", 60), [time(10)])
+        self.assertEqual(suggest_start_times(self.tutor.id, self.student.id, "tuesday", 60), [])
+
+    def test_bitmaps_are_cached_and_invalidated_on_change(self):
+        self.assertEqual(busy_bitmap(self.student.id), 0)
+        open_bitmap(self.tutor.id)
+        with self.assertNumQueries(0):
+            busy_bitmap(self.student.id)
+            open_bitmap(self.tutor.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson = LessonSchedule.objects.create(
+                tutor=self.tutor, student=self.student, subject="Python", day_of_week="monday",
+                start_time=time(10), duration=60, frequency="weekly", status="scheduled",
+            )
+        self.assertEqual(busy_bitmap(self.student.id), slot_mask("monday", time(10), 60))
+        lesson.status = "cancelled"
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson.save()
+        self.assertEqual(busy_bitmap(self.student.id), 0)
+        self.tutor_request.status = "scheduled"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tutor_request.save()
+        self.assertEqual(open_bitmap(self.tutor.id), 0)
+
+    def test_bitmaps_are_invalidated_only_once_the_write_commits(self):
+        open_bitmap(self.tutor.id)
+        self.tutor_request.status = "scheduled"
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.tutor_request.save()
+            self.assertEqual(open_bitmap(self.tutor.id), slot_mask("monday", time(10), 120))
+        for callback in callbacks:
+            callback()
+        self.assertEqual(open_bitmap(self.tutor.id), 0)
+
+    def test_bitmaps_are_cached_with_a_finite_timeout(self):
+        with mock.patch.object(cache, "set_many") as set_many:
+            warm([self.tutor.id])
+        self.assertEqual(set_many.call_args.args[1], BITMAP_TTL)
+
+    def test_warm_caches_many_users_in_two_queries(self):
+        LessonSchedule.objects.create(
+            tutor=self.tutor, student=self.student, subject="Java", day_of_week="monday",
+            start_time=time(10), duration=60, frequency="weekly", status="scheduled",
+        )
+        with self.assertNumQueries(2):
+            warm([self.tutor.id, self.student.id, self.other.id])
+        with self.assertNumQueries(0):
+            warm([self.tutor.id, self.student.id, self.other.id])
+            self.assertEqual(busy_bitmap(self.student.id), slot_mask("monday", time(10), 60))
+            self.assertEqual(busy_bitmap(self.tutor.id), slot_mask("monday", time(10), 60))
+            self.assertEqual(open_bitmap(self.tutor.id), slot_mask("monday", time(10), 120))
+            self.assertEqual(open_bitmap(self.other.id), 0)
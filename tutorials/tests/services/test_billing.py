@@ -0,0 +1,232 @@
+"""Unit tests for the billing run engine."""
+from datetime import date, time
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from tutorials.analytics import add_months, month_start
+from tutorials.billing import BillingError, bill_period, delete_invoices, lesson_price, set_invoice_status
+from tutorials.jobs import enqueue_billing_run, run_jobs
+from tutorials.models import (
+    BillingRun, DailyRollup, Invoice, InvoiceLine, LessonSchedule, Student, StudentBalance, Tutor, User,
+)
+from tutorials.tests.services.test_rollups import snapshot
+from tutorials.rollups import rebuild
+
+JANUARY = (date(2024, 1, 1), date(2024, 2, 1))  # five Mondays and five Tuesdays
+
+
+class BillingTestCase(TestCase):
+    """Unit tests for pricing, grouping and idempotency of billing runs."""
+
+    def setUp(self):
+        self.tutor_user = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        )
+        self.other_tutor_user = User.objects.create_user(
+            username="@other", email="other@example.com", password="Password123", role="tutor"
+        )
+        self.student_user = User.objects.create_user(
+            username="@student", email="student@example.com", password="Password123", role="student"
+        )
+        self.tutor = Tutor.objects.create(user=self.tutor_user, hourly_rate=Decimal("30.00"))
+        self.other_tutor = Tutor.objects.create(user=self.other_tutor_user, hourly_rate=Decimal("40.00"))
+        self.student = Student.objects.create(user=self.student_user)
+
+    def create_lesson(self, tutor=None, day="monday", duration=60, frequency="weekly", status="scheduled",
+                      starts_on=date(2023, 12, 1)):
+        return LessonSchedule.objects.create(
+            tutor=tutor or self.tutor_user, student=self.student_user, subject="Python", day_of_week=day,
+            start_time=time(10), duration=duration, frequency=frequency, status=status, starts_on=starts_on,
+        )
+
+    def test_lesson_price(self):
+        self.assertEqual(lesson_price(Decimal("30.00"), 90), Decimal("45.00"))
+        self.assertEqual(lesson_price(Decimal("25.00"), 50), Decimal("20.83"))
+
+    def test_lessons_are_grouped_per_student_and_tutor(self):
+        self.create_lesson(duration=90)                                  # 5 x 45.00
+        self.create_lesson(day="tuesday", frequency="fortnightly")       # 3 x 30.00, from 5 December
+        self.create_lesson(tutor=self.other_tutor_user, day="tuesday")   # 5 x 40.00
+        result = bill_period(*JANUARY)
+        self.assertTrue(result.created)
+        self.assertEqual(result.invoices, 2)
+        self.assertEqual(result.total, Decimal("515.00"))
+        amounts = dict(Invoice.objects.values_list("tutor_id", "amount"))
+        self.assertEqual(amounts, {self.tutor.id: Decimal("315.00"), self.other_tutor.id: Decimal("200.00")})
+        invoice = Invoice.objects.get(tutor=self.tutor)
+        self.assertEqual(invoice.student, self.student)
+        self.assertEqual(invoice.status, "unpaid")
+        self.assertEqual(invoice.due_date, date(2024, 2, 15))
+        self.assertEqual(invoice.billing_run, result.run)
+
+    def test_each_lesson_becomes_an_invoice_line(self):
+        monday = self.create_lesson(duration=90)
+        tuesday = self.create_lesson(day="tuesday", frequency="fortnightly")
+        bill_period(*JANUARY)
+        invoice = Invoice.objects.get()
+        lines = {line.lesson_id: line for line in invoice.lines.all()}
+        self.assertEqual(set(lines), {monday.id, tuesday.id})
+        self.assertEqual((lines[monday.id].quantity, lines[monday.id].unit_price), (5, Decimal("45.00")))
+        self.assertEqual((lines[tuesday.id].quantity, lines[tuesday.id].amount), (3, Decimal("90.00")))
+        self.assertEqual(lines[monday.id].description, "Python")
+        self.assertEqual(sum(line.amount for line in lines.values()), invoice.amount)
+
+    def test_only_scheduled_lessons_inside_the_period_are_billed(self):
+        self.create_lesson(status="cancelled")
+        self.create_lesson(starts_on=date(2024, 2, 1))
+        self.create_lesson(starts_on=date(2024, 1, 20))  # the 22nd and 29th
+        result = bill_period(*JANUARY)
+        self.assertEqual(Invoice.objects.get().amount, Decimal("60.00"))
+        self.assertEqual(result.total, Decimal("60.00"))
+
+    def test_lessons_without_profiles_are_reported(self):
+        stranger = User.objects.create_user(
+            username="@stranger", email="stranger@example.com", password="Password123", role="tutor"
+        )
+        self.create_lesson(tutor=stranger)
+        result = bill_period(*JANUARY)
+        self.assertEqual(result.unbilled_lessons, 1)
+        self.assertEqual(result.invoices, 0)
+
+    def test_billing_a_period_again_creates_nothing(self):
+        self.create_lesson()
+        first = bill_period(*JANUARY)
+        self.create_lesson(day="tuesday")
+        second = bill_period(*JANUARY)
+        self.assertFalse(second.created)
+        self.assertEqual(second.run, first.run)
+        self.assertEqual(second.total, Decimal("150.00"))
+        self.assertEqual(Invoice.objects.count(), 1)
+        self.assertEqual(BillingRun.objects.count(), 1)
+
+    def test_overlapping_and_empty_periods_are_refused(self):
+        bill_period(*JANUARY)
+        with self.assertRaises(BillingError):
+            bill_period(date(2024, 1, 15), date(2024, 2, 15))
+        with self.assertRaises(BillingError):
+            bill_period(date(2024, 3, 1), date(2024, 3, 1))
+        bill_period(date(2024, 2, 1), date(2024, 3, 1))
+        self.assertEqual(BillingRun.objects.count(), 2)
+
+    def test_rollups_follow_bulk_created_invoices(self):
+        self.create_lesson()
+        bill_period(*JANUARY)
+        self.assertEqual(DailyRollup.objects.get(date=date(2024, 2, 15)).revenue_unpaid, Decimal("150.00"))
+        self.assertEqual(StudentBalance.objects.get(student=self.student).outstanding, Decimal("150.00"))
+        incremental = snapshot()
+        rebuild()
+        self.assertEqual(snapshot(), incremental)
+
+    def test_query_count_does_not_grow_with_lessons(self):
+        for day in ["monday", "tuesday", "wednesday"]:
+            self.create_lesson(day=day)
+        with self.assertNumQueries(19):  # including creating the student's balance
+            bill_period(*JANUARY)
+        for day in ["thursday", "friday", "saturday", "sunday"]:
+            self.create_lesson(day=day)
+            self.create_lesson(tutor=self.other_tutor_user, day=day)
+        with self.assertNumQueries(16):
+            bill_period(date(2024, 2, 1), date(2024, 3, 1))
+
+    def test_job_bills_last_month(self):
+        self.create_lesson()
+        job = enqueue_billing_run(self.tutor_user)
+        this_month = month_start(timezone.localdate())
+        self.assertEqual(job.payload, {
+            "period_start": add_months(this_month, -1).isoformat(), "period_end": this_month.isoformat(),
+        })
+        self.assertEqual(run_jobs(), (1, 0))
+        run = BillingRun.objects.get()
+        self.assertEqual((run.period_start, run.period_end), (add_months(this_month, -1), this_month))
+        self.assertEqual(run.invoices.count(), 1)
+
+    def test_job_bills_the_period_it_was_queued_for(self):
+        self.create_lesson()
+        enqueue_billing_run(self.tutor_user, *JANUARY)
+        self.assertEqual(run_jobs(), (1, 0))
+        run = BillingRun.objects.get()
+        self.assertEqual((run.period_start, run.period_end), JANUARY)
+
+    def test_command(self):
+        self.create_lesson()
+        out = StringIO()
+        call_command("bill_period", "--start", "2024-01-01", "--end", "2024-02-01", stdout=out)
+        self.assertIn("1 invoices totalling 150.00", out.getvalue())
+        out = StringIO()
+        call_command("bill_period", "--start", "2024-01-01", "--end", "2024-02-01", stdout=out)
+        self.assertIn("already billed", out.getvalue())
+
+
+class BulkInvoiceActionTestCase(TestCase):
+    """Unit tests for the set-based invoice status updates and deletes."""
+
+    def setUp(self):
+        tutor_user = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        )
+        student_user = User.objects.create_user(
+            username="@student", email="student@example.com", password="Password123", role="student"
+        )
+        self.tutor = Tutor.objects.create(user=tutor_user)
+        self.student = Student.objects.create(user=student_user)
+        self.invoices = [
+            Invoice.objects.create(
+                student=self.student, tutor=self.tutor, amount=amount, due_date=date(2024, 2, 15), status=status
+            )
+            for amount, status in [(10, "unpaid"), (20, "unpaid"), (40, "Paid")]
+        ]
+        for invoice in self.invoices:
+            InvoiceLine.objects.create(invoice=invoice, description="Tuition", unit_price=invoice.amount, amount=invoice.amount)
+
+    def _balance(self):
+        balance = StudentBalance.objects.get(student=self.student)
+        return balance.outstanding, balance.paid
+
+    def test_statuses_are_saved_in_lower_case(self):
+        self.assertEqual(Invoice.objects.filter(status="paid").count(), 1)
+
+    def test_set_status_counts_only_invoices_that_change(self):
+        ids = [invoice.id for invoice in self.invoices]
+        with self.assertNumQueries(6):  # savepoint, read, UPDATE, the day and balance rows, release
+            self.assertEqual(set_invoice_status(ids, "paid"), 2)
+        self.assertEqual(Invoice.objects.filter(status="paid").count(), 3)
+        self.assertEqual(self._balance(), (0, Decimal("70")))
+        self.assertEqual(set_invoice_status(ids[:1], "paid"), 0)
+        self.assertEqual(set_invoice_status(ids[:1], "unpaid"), 1)
+        self.assertEqual(self._balance(), (Decimal("10"), Decimal("60")))
+        rollup = DailyRollup.objects.get(date=date(2024, 2, 15))
+        self.assertEqual((rollup.revenue_paid, rollup.revenue_unpaid), (Decimal("60"), Decimal("10")))
+        incremental = snapshot()
+        rebuild()
+        self.assertEqual(snapshot(), incremental)
+
+    def test_unknown_status_is_refused(self):
+        with self.assertRaises(BillingError):
+            set_invoice_status([self.invoices[0].id], "Paid")
+
+    def test_delete_removes_invoices_lines_and_their_contributions(self):
+        self.assertEqual(delete_invoices([self.invoices[0].id, self.invoices[2].id, 0]), 2)
+        self.assertEqual(list(Invoice.objects.values_list("id", flat=True)), [self.invoices[1].id])
+        self.assertEqual(InvoiceLine.objects.count(), 1)
+        self.assertEqual(self._balance(), (Decimal("20"), 0))
+        incremental = snapshot()
+        rebuild()
+        self.assertEqual(snapshot(), incremental)
+        self.assertEqual(delete_invoices([self.invoices[0].id]), 0)
+
+    def test_delete_query_count_does_not_grow_with_invoices(self):
+        for count in (10, 200):
+            invoices = Invoice.objects.bulk_create(
+                Invoice(student=self.student, tutor=self.tutor, amount=5, due_date=date(2024, 3, 1))
+                for _ in range(count)
+            )
+            InvoiceLine.objects.bulk_create(
+                InvoiceLine(invoice=invoice, description="Tuition", unit_price=5, amount=5) for invoice in invoices
+            )
+            rebuild()
+            # savepoint, locked read, lines, emails, invoices, the day and balance rows, release
+            with self.assertNumQueries(8):
+                self.assertEqual(delete_invoices([invoice.id for invoice in invoices]), count)
+            self.assertEqual(self._balance(), (Decimal("30"), Decimal("40")))
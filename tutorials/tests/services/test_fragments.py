@@ -0,0 +1,140 @@
+"""Unit tests for the versioned per-user dashboard fragments."""
+from datetime import date, time
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from tutorials import fragments
+from tutorials.models import Invoice, LessonSchedule, Student, StudentRequest, Tutor, TutorRequest, User
+from tutorials.pairing import pair_batch
+
+
+class FragmentVersionTestCase(TestCase):
+    """Unit tests for fragment versions and the signals that bump them."""
+
+    def setUp(self):
+        cache.clear()
+        self.tutor = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        )
+        self.student = User.objects.create_user(
+            username="@student", email="student@example.com", password="Password123", role="student"
+        )
+        self.other = User.objects.create_user(
+            username="@other", email="other@example.com", password="Password123", role="student"
+        )
+
+    def create_lesson(self, student=None):
+        return LessonSchedule.objects.create(
+            tutor=self.tutor, student=student or self.student, subject="Python", day_of_week="monday",
+            start_time=time(10), duration=60, frequency="weekly", status="scheduled",
+        )
+
+    def test_version_is_stable_until_bumped(self):
+        version = fragments.version(fragments.LESSONS, self.student.id)
+        self.assertEqual(fragments.version(fragments.LESSONS, self.student.id), version)
+        fragments.bump(fragments.LESSONS, self.student.id)
+        self.assertEqual(fragments.version(fragments.LESSONS, self.student.id), version + 1)
+
+    def test_bump_without_version_is_a_no_op(self):
+        fragments.bump(fragments.LESSONS, self.student.id)
+        self.assertIsNone(cache.get(f"fragments:{fragments.LESSONS}:{self.student.id}"))
+
+    def test_lesson_change_bumps_both_sides_only(self):
+        versions = {user.id: fragments.version(fragments.LESSONS, user.id) for user in (self.tutor, self.student, self.other)}
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson = self.create_lesson()
+        self.assertNotEqual(fragments.version(fragments.LESSONS, self.tutor.id), versions[self.tutor.id])
+        self.assertNotEqual(fragments.version(fragments.LESSONS, self.student.id), versions[self.student.id])
+        self.assertEqual(fragments.version(fragments.LESSONS, self.other.id), versions[self.other.id])
+        before = fragments.version(fragments.LESSONS, self.student.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson.delete()
+        self.assertNotEqual(fragments.version(fragments.LESSONS, self.student.id), before)
+
+    def test_request_changes_bump_their_owner(self):
+        student_version = fragments.version(fragments.REQUESTS, self.student.id)
+        tutor_version = fragments.version(fragments.REQUESTS, self.tutor.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            StudentRequest.objects.create(
+                student=self.student, language="Python", frequency="weekly", day_of_week="monday", status="pending",
+            )
+        self.assertNotEqual(fragments.version(fragments.REQUESTS, self.student.id), student_version)
+        self.assertEqual(fragments.version(fragments.REQUESTS, self.tutor.id), tutor_version)
+        with self.captureOnCommitCallbacks(execute=True):
+            TutorRequest.objects.create(tutor=self.tutor, languages="Python", day_of_week="monday")
+        self.assertNotEqual(fragments.version(fragments.REQUESTS, self.tutor.id), tutor_version)
+
+    def test_invoice_change_bumps_student_profile(self):
+        profile = Student.objects.create(user=self.student)
+        tutor_profile = Tutor.objects.create(user=self.tutor)
+        version = fragments.version(fragments.INVOICES, profile.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            Invoice.objects.create(student=profile, tutor=tutor_profile, amount=50, due_date=date(2025, 1, 31))
+        self.assertNotEqual(fragments.version(fragments.INVOICES, profile.id), version)
+
+    def test_version_is_bumped_only_once_the_write_commits(self):
+        version = fragments.version(fragments.LESSONS, self.student.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_lesson()
+            self.assertEqual(fragments.version(fragments.LESSONS, self.student.id), version)
+        self.assertNotEqual(fragments.version(fragments.LESSONS, self.student.id), version)
+
+    def test_bulk_pairing_bumps_lessons_and_requests(self):
+        student_request = StudentRequest.objects.create(
+            student=self.student, language="Python", frequency="weekly", day_of_week="monday", status="pending",
+        )
+        tutor_request = TutorRequest.objects.create(tutor=self.tutor, languages="Python", day_of_week="monday")
+        lessons = fragments.version(fragments.LESSONS, self.student.id)
+        requests = fragments.version(fragments.REQUESTS, self.tutor.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            pair_batch([{
+                "student_request_id": student_request.id, "tutor_request_id": tutor_request.id,
+                "start_time": "10:00", "duration": 60,
+            }])
+        self.assertNotEqual(fragments.version(fragments.LESSONS, self.student.id), lessons)
+        self.assertNotEqual(fragments.version(fragments.REQUESTS, self.tutor.id), requests)
+
+
+class FragmentCacheViewTestCase(TestCase):
+    """The dashboards serve their tables from the cache until a row changes."""
+
+    def setUp(self):
+        cache.clear()
+        self.tutor = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor",
+            first_name="Tia", last_name="Tutor",
+        )
+        self.student = User.objects.create_user(
+            username="@student", email="student@example.com", password="Password123", role="student",
+        )
+        LessonSchedule.objects.create(
+            tutor=self.tutor, student=self.student, subject="Python", day_of_week="monday",
+            start_time=time(10), duration=60, frequency="weekly", status="scheduled",
+        )
+        self.client.login(username="@student", password="Password123")
+        self.url = reverse("student_dashboard")
+
+    def test_cached_table_skips_the_lesson_query(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(3):  # session, user and next lesson
+            response = self.client.get(self.url)
+        self.assertContains(response, "Tia Tutor")
+
+    def test_saving_a_lesson_refreshes_the_table(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            LessonSchedule.objects.create(
+                tutor=self.tutor, student=self.student, subject="Haskell", day_of_week="tuesday",
+                start_time=time(11), duration=60, frequency="weekly", status="scheduled",
+            )
+        self.assertContains(self.client.get(self.url), "Haskell")
+
+    def test_other_users_do_not_share_the_table(self):
+        self.client.get(self.url)
+        User.objects.create_user(
+            username="@other", email="other@example.com", password="Password123", role="student",
+        )
+        self.client.login(username="@other", password="Password123")
+        response = self.client.get(self.url)
+        self.assertNotContains(response, "Tia Tutor")
+        self.assertContains(response, "No lessons scheduled.")
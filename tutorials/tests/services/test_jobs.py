@@ -0,0 +1,121 @@
+"""Unit and concurrency tests for the Request priority queue and its job runner."""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import time
+from unittest import mock, skipUnless
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from tutorials import jobs
+from tutorials.models import LessonSchedule, Request, StudentRequest, TutorRequest, User
+
+
+class RequestQueueTestCase(TestCase):
+    """Tests for Request.objects.queue() and claim()."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="@queue", email="queue@example.com", password="Password123", role="admin"
+        )
+
+    def _request(self, priority, **kwargs):
+        return Request.objects.create(student=self.user, type=kwargs.pop("type", "auto_pair"), priority=priority, **kwargs)
+
+    def test_queue_orders_by_priority_then_age(self):
+        low = self._request("low")
+        high = self._request("high")
+        medium = self._request("medium")
+        later_high = self._request("high")
+        self._request("high", allocated=True, status="in_progress")
+        self._request("high", status="completed")
+        self.assertEqual(list(Request.objects.queue()), [high, later_high, medium, low])
+
+    def test_priority_rank_follows_priority(self):
+        request = self._request("low")
+        Request.objects.filter(id=request.id).update(priority="high")
+        request.refresh_from_db()
+        self.assertEqual(request.priority_rank, 0)
+
+    def test_claim_allocates_a_batch(self):
+        requests = [self._request("medium") for _ in range(3)]
+        claimed = Request.objects.claim(batch_size=2)
+        self.assertEqual(claimed, requests[:2])
+        self.assertTrue(all(request.allocated and request.status == "in_progress" for request in claimed))
+        self.assertEqual(list(Request.objects.queue()), requests[2:])
+
+    def test_claim_filters_by_type(self):
+        self._request("high", type="Python")
+        job = self._request("low")
+        self.assertEqual(Request.objects.claim(types=["auto_pair"]), [job])
+        self.assertEqual(Request.objects.claim(types=["auto_pair"]), [])
+
+    def test_queue_uses_index(self):
+        with connection.cursor() as cursor:
+            sql, params = Request.objects.queue()[:10].query.sql_with_params()
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn("request_queue_idx", plan)
+
+
+class RunJobsTestCase(TestCase):
+    """Tests for draining the queue with run_jobs."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="@admin", email="admin@example.com", password="Password123", role="admin"
+        )
+        student = User.objects.create_user(
+            username="@student", email="student@example.com", password="Password123", role="student"
+        )
+        tutor = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        )
+        StudentRequest.objects.create(
+            student=student, language="Python", frequency="weekly", day_of_week="monday",
+            preferred_time=time(10), difficulty="beginner",
+        )
+        TutorRequest.objects.create(
+            tutor=tutor, languages="Python", day_of_week="monday",
+            available_time=time(10), level_can_teach="beginner",
+        )
+
+    def test_auto_pair_job_pairs_requests(self):
+        job = jobs.enqueue(self.admin, "auto_pair", priority="high")
+        self.assertEqual(jobs.run_jobs(), (1, 0))
+        self.assertEqual(LessonSchedule.objects.count(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "completed")
+
+    def test_unknown_job_type_is_rejected(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue(self.admin, "unknown")
+
+    def test_failing_job_is_left_in_progress(self):
+        job = jobs.enqueue(self.admin, "auto_pair")
+        with mock.patch.dict(jobs.HANDLERS, {"auto_pair": mock.Mock(side_effect=RuntimeError)}), \
+                self.assertLogs("tutorials.jobs", level="ERROR"):
+            self.assertEqual(jobs.run_jobs(), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.allocated), ("in_progress", True))
+        self.assertEqual(LessonSchedule.objects.count(), 0)
+
+
+@skipUnless(settings.CONCURRENCY_TESTS, "set CONCURRENCY_TESTS=1 to run against a file-backed database")
+class ConcurrentClaimTestCase(TransactionTestCase):
+    """Parallel workers must never claim the same request."""
+
+    def _claim(self, _):
+        try:
+            return [request.id for request in Request.objects.claim(batch_size=3)]
+        finally:
+            connection.close()
+
+    def test_parallel_workers_claim_disjoint_batches(self):
+        user = User.objects.create_user(
+            username="@queue", email="queue@example.com", password="Password123", role="admin"
+        )
+        ids = {Request.objects.create(student=user, type="auto_pair").id for _ in range(20)}
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            batches = list(pool.map(self._claim, range(10)))
+        claimed = [request_id for batch in batches for request_id in batch]
+        self.assertEqual(len(claimed), len(set(claimed)))
+        self.assertEqual(set(claimed), ids)
@@ -0,0 +1,143 @@
+"""Unit tests for the automatic pairing engine."""
+from datetime import time
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from tutorials.matching import GroupTooLargeError, INCOMPATIBLE_COST, auto_pair, match_cost, min_cost_assignment
+from tutorials.models import LessonSchedule, StudentRequest, TutorRequest, User
+
+
+class MinCostAssignmentTestCase(TestCase):
+    """Unit tests for the Hungarian solver."""
+
+    def test_square_assignment(self):
+        cost = [
+            [4, 1, 3],
+            [2, 0, 5],
+            [3, 2, 2],
+        ]
+        self.assertEqual(min_cost_assignment(cost), [1, 0, 2])
+
+    def test_rectangular_assignment(self):
+        cost = [
+            [9, 1, 9, 9],
+            [1, 9, 9, 9],
+        ]
+        self.assertEqual(min_cost_assignment(cost), [1, 0])
+
+    def test_empty_assignment(self):
+        self.assertEqual(min_cost_assignment([]), [])
+
+
+class AutoPairTestCase(TestCase):
+    """Unit tests for auto_pair."""
+
+    def setUp(self):
+        self.students = [
+            User.objects.create_user(
+                username=f"@student{i}", email=f"student{i}@example.com", password="Password123", role="student"
+            )
+            for i in range(3)
+        ]
+        self.tutors = [
+            User.objects.create_user(
+                username=f"@tutor{i}", email=f"tutor{i}@example.com", password="Password123", role="tutor"
+            )
+            for i in range(3)
+        ]
+
+    def _student_request(self, student, preferred_time, difficulty="beginner", language="Python", day="monday"):
+        return StudentRequest.objects.create(
+            student=student, language=language, frequency="weekly", day_of_week=day,
+            preferred_time=preferred_time, difficulty=difficulty,
+        )
+
+    def _tutor_request(self, tutor, available_time, level="beginner", languages="Python", day="monday"):
+        return TutorRequest.objects.create(
+            tutor=tutor, languages=languages, day_of_week=day,
+            available_time=available_time, level_can_teach=level,
+        )
+
+    def test_match_cost_rejects_underqualified_tutor(self):
+        student_request = self._student_request(self.students[0], time(10), difficulty="advanced")
+        tutor_request = self._tutor_request(self.tutors[0], time(10), level="beginner")
+        self.assertEqual(match_cost(student_request, tutor_request), INCOMPATIBLE_COST)
+
+    def test_match_cost_prefers_closer_time(self):
+        student_request = self._student_request(self.students[0], time(10))
+        near = self._tutor_request(self.tutors[0], time(10, 30))
+        far = self._tutor_request(self.tutors[1], time(15))
+        self.assertLess(match_cost(student_request, near), match_cost(student_request, far))
+
+    def test_auto_pair_finds_min_cost_assignment(self):
+        early = self._student_request(self.students[0], time(9))
+        late = self._student_request(self.students[1], time(17))
+        late_slot = self._tutor_request(self.tutors[0], time(16, 30))
+        early_slot = self._tutor_request(self.tutors[1], time(9, 30))
+
+        result = auto_pair()
+
+        self.assertEqual(result.matched, 2)
+        self.assertEqual(result.match_rate, 1.0)
+        self.assertEqual(LessonSchedule.objects.count(), 2)
+        self.assertTrue(LessonSchedule.objects.filter(student=self.students[0], tutor=self.tutors[1], start_time=time(9, 30)).exists())
+        self.assertTrue(LessonSchedule.objects.filter(student=self.students[1], tutor=self.tutors[0], start_time=time(16, 30)).exists())
+        for request in (early, late):
+            request.refresh_from_db()
+            self.assertEqual(request.status, "approved")
+        for request in (early_slot, late_slot):
+            request.refresh_from_db()
+            self.assertEqual(request.status, "scheduled")
+
+    def test_auto_pair_respects_language_and_day(self):
+        self._student_request(self.students[0], time(10), language="Java")
+        self._student_request(self.students[1], time(10), day="tuesday")
+        self._tutor_request(self.tutors[0], time(10), languages="JavaScript, Python")
+
+        result = auto_pair()
+
+        self.assertEqual(result.pending, 2)
+        self.assertEqual(result.matched, 0)
+        self.assertEqual(LessonSchedule.objects.count(), 0)
+
+    def test_tutor_slot_is_used_once(self):
+        self._student_request(self.students[0], time(10))
+        self._student_request(self.students[1], time(10))
+        slot = self._tutor_request(self.tutors[0], time(10))
+
+        result = auto_pair()
+
+        self.assertEqual(result.matched, 1)
+        self.assertEqual(StudentRequest.objects.filter(status="pending").count(), 1)
+        self.assertEqual(LessonSchedule.objects.get().tutor_request_id, slot.id)
+
+    def test_dry_run_writes_nothing(self):
+        self._student_request(self.students[0], time(10))
+        self._tutor_request(self.tutors[0], time(10))
+
+        result = auto_pair(dry_run=True)
+
+        self.assertEqual(result.matched, 1)
+        self.assertEqual(LessonSchedule.objects.count(), 0)
+        self.assertEqual(StudentRequest.objects.filter(status="pending").count(), 1)
+
+    def test_max_group_refuses_larger_groups_before_pairing(self):
+        self._student_request(self.students[0], time(10))
+        self._student_request(self.students[1], time(10))
+        self._tutor_request(self.tutors[0], time(10))
+
+        with self.assertRaisesMessage(GroupTooLargeError, "python on monday has 2 requests or slots"):
+            auto_pair(max_group=1)
+        self.assertEqual(LessonSchedule.objects.count(), 0)
+        self.assertEqual(auto_pair(max_group=2).matched, 1)
+
+    def test_command_dry_run_reports_match_rate(self):
+        self._student_request(self.students[0], time(10))
+        self._student_request(self.students[1], time(10), language="Scala")
+        self._tutor_request(self.tutors[0], time(10))
+        out = StringIO()
+
+        call_command("auto_pair", "--dry-run", stdout=out)
+
+        self.assertIn("Would pair 1/2 pending requests (50.0%)", out.getvalue())
+        self.assertEqual(LessonSchedule.objects.count(), 0)
@@ -0,0 +1,129 @@
+"""Unit tests for the lesson occurrence expander and materialised occurrences."""
+from datetime import date, datetime, time
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from tutorials.models import LessonOccurrence, LessonSchedule, User
+from tutorials.scheduling import (
+    DAYS, OCCURRENCE_HORIZON, lesson_occurrences, occurrence_count, occurrences, occurrences_in_batches,
+    sync_occurrences,
+)
+
+
+class OccurrencesTestCase(TestCase):
+    """Unit tests for lesson_occurrences, occurrences and occurrences_in_batches."""
+
+    def setUp(self):
+        self.tutor = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        )
+        self.student = User.objects.create_user(
+            username="@student", email="student@example.com", password="Password123", role="student"
+        )
+        # 2025-01-01 is a Wednesday.
+        self.weekly = LessonSchedule.objects.create(
+            tutor=self.tutor, student=self.student, subject="Python", day_of_week="Monday",
+            start_time=time(10), duration=60, frequency="weekly", starts_on=date(2025, 1, 1),
+        )
+        self.fortnightly = LessonSchedule.objects.create(
+            tutor=self.tutor, student=self.student, subject="Java", day_of_week="wednesday",
+            start_time=time(9), duration=30, frequency="Fortnightly", starts_on=date(2025, 1, 1),
+        )
+
+    def _dates(self, generator):
+        return [occurrence.starts_at.date() for occurrence in generator]
+
+    def test_weekly_occurrences(self):
+        dates = self._dates(lesson_occurrences(self.weekly, date(2025, 1, 1), date(2025, 1, 21)))
+        self.assertEqual(dates, [date(2025, 1, 6), date(2025, 1, 13), date(2025, 1, 20)])
+
+    def test_fortnightly_occurrences_keep_their_phase(self):
+        dates = self._dates(lesson_occurrences(self.fortnightly, date(2025, 1, 2), date(2025, 2, 1)))
+        self.assertEqual(dates, [date(2025, 1, 15), date(2025, 1, 29)])
+
+    def test_no_occurrences_before_starts_on(self):
+        dates = self._dates(lesson_occurrences(self.weekly, date(2024, 12, 1), date(2025, 1, 7)))
+        self.assertEqual(dates, [date(2025, 1, 6)])
+
+    def test_occurrence_count_matches_expansion(self):
+        for lesson in [self.weekly, self.fortnightly]:
+            for start, end in [(date(2024, 12, 1), date(2025, 1, 7)), (date(2025, 1, 2), date(2025, 2, 1)),
+                               (date(2025, 1, 6), date(2025, 1, 6)), (date(2025, 1, 1), date(2025, 12, 31))]:
+                with self.subTest(lesson=lesson.subject, start=start, end=end):
+                    self.assertEqual(
+                        occurrence_count(lesson, start, end), len(list(lesson_occurrences(lesson, start, end)))
+                    )
+
+    def test_occurrence_times(self):
+        occurrence = next(lesson_occurrences(self.weekly, date(2025, 1, 1), date(2025, 2, 1)))
+        self.assertEqual(occurrence.lesson, self.weekly)
+        self.assertEqual(occurrence.starts_at, timezone.make_aware(datetime(2025, 1, 6, 10)))
+        self.assertEqual(occurrence.ends_at, timezone.make_aware(datetime(2025, 1, 6, 11)))
+
+    def test_occurrences_are_merged_chronologically(self):
+        merged = list(occurrences([self.weekly, self.fortnightly], date(2025, 1, 1), date(2025, 1, 16)))
+        self.assertEqual(
+            [(occurrence.lesson.subject, occurrence.starts_at.date()) for occurrence in merged],
+            [("Java", date(2025, 1, 1)), ("Python", date(2025, 1, 6)),
+             ("Python", date(2025, 1, 13)), ("Java", date(2025, 1, 15))],
+        )
+
+    def test_occurrences_are_lazy(self):
+        stream = occurrences([self.weekly], date(2025, 1, 1), date(9999, 1, 1))
+        self.assertEqual(next(stream).starts_at.date(), date(2025, 1, 6))
+
+    def test_occurrences_in_batches(self):
+        batches = list(occurrences_in_batches(
+            LessonSchedule.objects.order_by("id"), date(2025, 1, 1), date(2025, 1, 16), batch_size=1
+        ))
+        self.assertEqual([len(batch) for batch in batches], [2, 2])
+        self.assertTrue(all(occurrence.lesson == self.weekly for occurrence in batches[0]))
+
+
+class MaterializedOccurrencesTestCase(TestCase):
+    """Unit tests for the LessonOccurrence table and its maintenance."""
+
+    def setUp(self):
+        self.tutor = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        )
+        self.student = User.objects.create_user(
+            username="@student", email="student@example.com", password="Password123", role="student"
+        )
+        self.today = timezone.localdate()
+        self.lesson = LessonSchedule.objects.create(
+            tutor=self.tutor, student=self.student, subject="Python",
+            day_of_week=DAYS[self.today.weekday()], start_time=time(23, 59), duration=1,
+            frequency="weekly", starts_on=self.today,
+        )
+
+    def test_sync_materializes_horizon(self):
+        sync_occurrences([self.lesson])
+        occurrences = LessonOccurrence.objects.filter(lesson=self.lesson)
+        self.assertEqual(occurrences.count(), (OCCURRENCE_HORIZON.days + 6) // 7)
+        self.assertEqual(occurrences.order_by("date").first().date, self.today)
+
+    def test_sync_removes_upcoming_occurrences_of_cancelled_lesson(self):
+        sync_occurrences([self.lesson])
+        past = LessonOccurrence.objects.create(
+            lesson=self.lesson, tutor=self.tutor, student=self.student, date=date(2020, 1, 6),
+            starts_at=timezone.make_aware(datetime(2020, 1, 6, 23, 59)),
+            ends_at=timezone.make_aware(datetime(2020, 1, 7)),
+        )
+        self.lesson.status = "cancelled"
+        self.lesson.save()
+        sync_occurrences([self.lesson])
+        self.assertEqual(list(LessonOccurrence.objects.filter(lesson=self.lesson)), [past])
+
+    def test_upcoming_and_in_week(self):
+        sync_occurrences([self.lesson])
+        upcoming = LessonOccurrence.objects.filter(student=self.student).upcoming()
+        self.assertEqual(upcoming.first().date, self.today)
+        this_week = LessonOccurrence.objects.filter(tutor=self.tutor).in_week(self.today)
+        self.assertEqual([occurrence.date for occurrence in this_week], [self.today])
+
+    def test_materialize_command_is_idempotent(self):
+        call_command("materialize_occurrences", "--days", "14", stdout=StringIO())
+        call_command("materialize_occurrences", "--days", "14", stdout=StringIO())
+        self.assertEqual(LessonOccurrence.objects.filter(lesson=self.lesson).count(), 2)
@@ -0,0 +1,55 @@
+"""Unit tests for cursor pagination over a sort field."""
+from datetime import date
+from django.test import TestCase
+from tutorials.models import Invoice, Student, Tutor, User
+from tutorials.pagination import decode_cursor, encode_cursor, sorted_keyset_page
+
+
+class SortedKeysetPageTestCase(TestCase):
+    """Unit tests for sorted_keyset_page and its cursors."""
+
+    def setUp(self):
+        student = Student.objects.create(user=User.objects.create_user(
+            username="@student", email="student@example.com", password="Password123", role="student"
+        ))
+        tutor = Tutor.objects.create(user=User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        ))
+        # Several invoices share a due date, so ties must be broken by id.
+        self.invoices = [
+            Invoice.objects.create(student=student, tutor=tutor, amount=10 * i, due_date=date(2024, 1, 1 + i % 3))
+            for i in range(1, 8)
+        ]
+
+    def _walk(self, sort, page_size):
+        seen, cursor = [], None
+        while True:
+            rows, next_cursor = sorted_keyset_page(Invoice.objects.all(), sort, cursor, page_size)
+            seen += [row.id for row in rows]
+            if next_cursor is None:
+                return seen
+            cursor = decode_cursor(next_cursor)
+
+    def test_pages_cover_every_row_once_in_order(self):
+        by_due = sorted(self.invoices, key=lambda invoice: (invoice.due_date, invoice.id))
+        self.assertEqual(self._walk("due_date", 2), [invoice.id for invoice in by_due])
+        self.assertEqual(self._walk("-due_date", 3), [invoice.id for invoice in reversed(by_due)])
+        self.assertEqual(self._walk("-id", 4), sorted((invoice.id for invoice in self.invoices), reverse=True))
+
+    def test_datetime_cursor_keeps_microseconds(self):
+        by_created = sorted(self.invoices, key=lambda invoice: (invoice.created_at, invoice.id))
+        self.assertEqual(self._walk("created_at", 2), [invoice.id for invoice in by_created])
+
+    def test_last_page_has_no_cursor(self):
+        rows, next_cursor = sorted_keyset_page(Invoice.objects.all(), "amount", None, 7)
+        self.assertEqual(len(rows), 7)
+        self.assertIsNone(next_cursor)
+
+    def test_page_is_one_query(self):
+        with self.assertNumQueries(1):
+            sorted_keyset_page(Invoice.objects.all(), "-due_date", (date(2024, 1, 3).isoformat(), 5), 2)
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(date(2024, 1, 2), 5)), ("2024-01-02", 5))
+        self.assertIsNone(decode_cursor("not a cursor"))
+        self.assertIsNone(decode_cursor(encode_cursor("2024-01-02", "5")))
@@ -0,0 +1,115 @@
+"""Unit and concurrency tests for pairing a student request with a tutor slot."""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import time
+from unittest import skipUnless
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from tutorials.models import IdempotencyKey, LessonSchedule, StudentRequest, TutorRequest, User
+from tutorials.pairing import PairingError, pair_requests
+
+
+def create_requests(student_count=1, tutor_count=1):
+    students = [
+        User.objects.create_user(
+            username=f"@student{i}", email=f"student{i}@example.com", password="Password123", role="student"
+        )
+        for i in range(student_count)
+    ]
+    tutors = [
+        User.objects.create_user(
+            username=f"@tutor{i}", email=f"tutor{i}@example.com", password="Password123", role="tutor"
+        )
+        for i in range(tutor_count)
+    ]
+    student_requests = [
+        StudentRequest.objects.create(
+            student=student, language="Python", frequency="weekly", day_of_week="monday",
+            preferred_time=time(10), difficulty="beginner",
+        )
+        for student in students
+    ]
+    tutor_requests = [
+        TutorRequest.objects.create(
+            tutor=tutor, languages="Python", day_of_week="monday",
+            available_time=time(10), level_can_teach="beginner",
+        )
+        for tutor in tutors
+    ]
+    return student_requests, tutor_requests
+
+
+class PairRequestsTestCase(TestCase):
+    """Unit tests for pair_requests."""
+
+    def setUp(self):
+        (self.student_request,), (self.tutor_request,) = create_requests()
+
+    def test_pairing_creates_lesson_and_updates_statuses(self):
+        lesson = pair_requests(self.student_request.id, self.tutor_request.id, time(10), 60)
+        self.student_request.refresh_from_db()
+        self.tutor_request.refresh_from_db()
+        self.assertEqual(lesson.start_time, time(10))
+        self.assertEqual(self.student_request.status, "approved")
+        self.assertEqual(self.tutor_request.status, "scheduled")
+        self.assertEqual(lesson.tutor_request, self.tutor_request)
+
+    def test_replayed_key_returns_the_same_lesson(self):
+        first = pair_requests(self.student_request.id, self.tutor_request.id, time(10), 60, idempotency_key="abc")
+        second = pair_requests(self.student_request.id, self.tutor_request.id, time(10), 60, idempotency_key="abc")
+        self.assertEqual(first, second)
+        self.assertEqual(LessonSchedule.objects.count(), 1)
+        self.assertEqual(IdempotencyKey.objects.get().lesson, first)
+
+    def test_second_pairing_is_rejected(self):
+        pair_requests(self.student_request.id, self.tutor_request.id, time(10), 60)
+        with self.assertRaisesMessage(PairingError, "not in 'pending' status"):
+            pair_requests(self.student_request.id, self.tutor_request.id, time(10), 60, idempotency_key="other")
+        self.assertEqual(LessonSchedule.objects.count(), 1)
+
+    def test_booked_tutor_slot_is_rejected(self):
+        other_student = User.objects.create_user(
+            username="@other", email="other@example.com", password="Password123", role="student"
+        )
+        other_request = StudentRequest.objects.create(
+            student=other_student, language="Python", frequency="weekly", day_of_week="monday", difficulty="beginner",
+        )
+        pair_requests(self.student_request.id, self.tutor_request.id, time(10), 60)
+        with self.assertRaisesMessage(PairingError, "This tutor slot is no longer available."):
+            pair_requests(other_request.id, self.tutor_request.id, time(14), 60)
+
+
+@skipUnless(settings.CONCURRENCY_TESTS, "set CONCURRENCY_TESTS=1 to run against a file-backed database")
+class ConcurrentPairingTestCase(TransactionTestCase):
+    """Parallel pair attempts must create each lesson exactly once."""
+
+    def _attempt(self, student_request, tutor_request, key=None):
+        try:
+            pair_requests(student_request.id, tutor_request.id, time(10), 60, idempotency_key=key)
+            return "paired"
+        except PairingError:
+            return "rejected"
+        finally:
+            connection.close()
+
+    def test_parallel_attempts_on_one_request_pair_once(self):
+        (student_request,), (tutor_request,) = create_requests()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            outcomes = list(pool.map(lambda _: self._attempt(student_request, tutor_request), range(16)))
+        self.assertEqual(outcomes.count("paired"), 1)
+        self.assertEqual(LessonSchedule.objects.count(), 1)
+
+    def test_parallel_retries_with_one_key_pair_once(self):
+        (student_request,), (tutor_request,) = create_requests()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            outcomes = list(pool.map(lambda _: self._attempt(student_request, tutor_request, "double-click"), range(16)))
+        self.assertEqual(outcomes, ["paired"] * 16)
+        self.assertEqual(LessonSchedule.objects.count(), 1)
+
+    def test_parallel_students_competing_for_one_slot(self):
+        student_requests, (tutor_request,) = create_requests(student_count=8)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            outcomes = list(pool.map(lambda sr: self._attempt(sr, tutor_request), student_requests))
+        self.assertEqual(outcomes.count("paired"), 1)
+        self.assertEqual(LessonSchedule.objects.filter(tutor=tutor_request.tutor).count(), 1)
+        self.assertEqual(StudentRequest.objects.filter(status="approved").count(), 1)
@@ -0,0 +1,100 @@
+"""Unit tests for bank statement reconciliation."""
+import csv
+import io
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from tutorials.models import Invoice, Student, StudentBalance, Tutor, User
+from tutorials.payments import PaymentImportError, import_payments, parse_amount, parse_reference
+
+
+class PaymentImportTestCase(TestCase):
+    """Unit tests for matching statement rows to unpaid invoices."""
+
+    def setUp(self):
+        tutor_user = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        )
+        student_user = User.objects.create_user(
+            username="@student", email="student@example.com", password="Password123", role="student"
+        )
+        self.tutor = Tutor.objects.create(user=tutor_user)
+        self.student = Student.objects.create(user=student_user)
+        self.invoices = [
+            Invoice.objects.create(student=self.student, tutor=self.tutor, amount=amount, due_date=date(2024, 2, 15))
+            for amount in ("45.00", "30.00", "60.00")
+        ]
+
+    def _import(self, rows, header="reference,amount"):
+        report = io.StringIO()
+        result = import_payments(io.StringIO("\n".join([header, *rows]) + "\n"), report, chunk_size=2)
+        return result, list(csv.DictReader(io.StringIO(report.getvalue())))
+
+    def test_parse_reference_and_amount(self):
+        self.assertEqual(parse_reference("Tuition INV-0042 Jan"), 42)
+        self.assertEqual(parse_reference("inv 7"), 7)
+        self.assertEqual(parse_reference(" 12 "), 12)
+        self.assertIsNone(parse_reference("January tuition"))
+        self.assertEqual(parse_amount("£1,045.5"), Decimal("1045.50"))
+        self.assertIsNone(parse_amount("-5"))
+        self.assertIsNone(parse_amount("n/a"))
+
+    def test_matching_payments_mark_invoices_paid(self):
+        first, second, third = self.invoices
+        result, report = self._import([
+            f"{first.reference},45.00",
+            f"Payment {second.reference},30",
+            f"{third.reference},59.99",
+            "no reference,10.00",
+            f"{first.reference},45.00",
+            f"{second.id},abc",
+        ])
+        self.assertEqual((result.rows, result.matched, result.paid, result.unmatched), (6, 2, 2, 4))
+        self.assertEqual(
+            list(Invoice.objects.order_by("id").values_list("status", flat=True)), ["paid", "paid", "unpaid"]
+        )
+        self.assertEqual(StudentBalance.objects.get(student=self.student).outstanding, Decimal("60.00"))
+        self.assertEqual(
+            [(row["line"], row["reason"]) for row in report],
+            [
+                ("4", "no unpaid invoice with this reference and amount"),
+                ("5", "no invoice reference"),
+                ("6", "invoice already matched by an earlier row"),
+                ("7", "not a valid amount"),
+            ],
+        )
+
+    def test_paid_invoices_are_not_matched(self):
+        invoice = self.invoices[0]
+        invoice.status = "paid"
+        invoice.save()
+        result, report = self._import([f"{invoice.reference},45.00"])
+        self.assertEqual((result.matched, result.unmatched), (0, 1))
+
+    def test_index_is_one_query_and_matches_are_batched(self):
+        rows = [f"{invoice.reference},{invoice.amount}" for invoice in self.invoices] * 50
+        # the index, then one transaction holding two batches of savepoint, read, UPDATE, two rollup rows and release
+        with self.assertNumQueries(1 + 2 + 2 * 6):
+            result, report = self._import(rows)
+        self.assertEqual((result.paid, result.unmatched), (3, 147))
+
+    def test_missing_columns_are_refused(self):
+        with self.assertRaises(PaymentImportError):
+            self._import(["INV-1,10"], header="ref,value")
+
+    def test_command_writes_the_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            statement = os.path.join(directory, "statement.csv")
+            with open(statement, "w", newline="") as file:
+                file.write(f"Reference,Amount,Payer\n{self.invoices[0].reference},45.00,Sam\nINV-999,5.00,Ann\n")
+            out = io.StringIO()
+            call_command("import_payments", statement, stdout=out)
+            self.assertIn("1 invoices marked paid, 1 unmatched rows", out.getvalue())
+            with open(f"{statement}.unmatched.csv") as report:
+                self.assertEqual(len(list(csv.DictReader(report))), 1)
+            with self.assertRaises(CommandError):
+                call_command("import_payments", os.path.join(directory, "missing.csv"), stdout=io.StringIO())
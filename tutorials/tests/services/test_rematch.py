@@ -0,0 +1,101 @@
+"""Unit tests for incremental re-matching of freed tutor slots."""
+from datetime import time
+from django.db import connection
+from django.test import TestCase
+from tutorials.matching import rematch_cancelled_lesson, rematch_slot, reopen_slot
+from tutorials.models import LessonSchedule, StudentRequest, TutorRequest, User
+
+
+class RematchTestCase(TestCase):
+    """Unit tests for rematch_slot and rematch_cancelled_lesson."""
+
+    def setUp(self):
+        self.tutor = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        )
+        self.students = [
+            User.objects.create_user(
+                username=f"@student{i}", email=f"student{i}@example.com", password="Password123", role="student"
+            )
+            for i in range(3)
+        ]
+        self.tutor_request = TutorRequest.objects.create(
+            tutor=self.tutor, languages="Python, Java", day_of_week="monday",
+            available_time=time(10), level_can_teach="intermediate",
+        )
+
+    def _student_request(self, student, **kwargs):
+        fields = dict(
+            student=student, language="Python", frequency="weekly", day_of_week="monday",
+            preferred_time=time(10), difficulty="beginner",
+        )
+        fields.update(kwargs)
+        return StudentRequest.objects.create(**fields)
+
+    def test_books_cheapest_compatible_request(self):
+        self._student_request(self.students[0], preferred_time=time(15))
+        best = self._student_request(self.students[1], language="java", day_of_week="Monday", difficulty="intermediate")
+        self._student_request(self.students[2], language="Python", day_of_week="tuesday")
+        student_request, tutor_request = rematch_slot(self.tutor_request)
+        self.assertEqual((student_request, tutor_request), (best, self.tutor_request))
+        best.refresh_from_db()
+        self.assertEqual(best.status, "approved")
+        self.assertEqual(LessonSchedule.objects.get().student, self.students[1])
+
+    def test_skips_requests_that_would_double_book(self):
+        LessonSchedule.objects.create(
+            tutor=User.objects.create_user(username="@other", email="other@example.com", password="Password123"),
+            student=self.students[0], subject="C", day_of_week="monday", start_time=time(10, 30),
+            duration=60, frequency="weekly", status="scheduled",
+        )
+        self._student_request(self.students[0])
+        later = self._student_request(self.students[1], preferred_time=time(12))
+        self.assertEqual(rematch_slot(self.tutor_request)[0], later)
+
+    def test_no_candidates(self):
+        self._student_request(self.students[0], difficulty="advanced")
+        self.assertIsNone(rematch_slot(self.tutor_request))
+
+    def test_candidates_are_read_through_the_partial_index(self):
+        sql, params = StudentRequest.objects.pending_for(["python"], "monday").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn("studentrequest_pending_idx", plan)
+
+    def test_cancelled_lesson_reopens_and_rebooks_slot(self):
+        self.tutor_request.status = "scheduled"
+        self.tutor_request.save(update_fields=["status"])
+        lesson = LessonSchedule.objects.create(
+            tutor=self.tutor, student=self.students[0], subject="Python", day_of_week="monday",
+            start_time=time(10), duration=60, frequency="weekly", status="cancelled", tutor_request=self.tutor_request,
+        )
+        waiting = self._student_request(self.students[1])
+        self.assertEqual(rematch_cancelled_lesson(lesson), (waiting, self.tutor_request))
+        self.tutor_request.refresh_from_db()
+        self.assertEqual(self.tutor_request.status, "scheduled")
+        self.assertTrue(LessonSchedule.objects.filter(student=self.students[1], status="scheduled").exists())
+
+    def test_cancelled_lesson_without_tutor_request(self):
+        lesson = LessonSchedule.objects.create(
+            tutor=self.tutor, student=self.students[0], subject="Haskell", day_of_week="monday",
+            start_time=time(10), duration=60, frequency="weekly", status="cancelled",
+        )
+        self.assertIsNone(rematch_cancelled_lesson(lesson))
+
+    def test_cancelled_lesson_reopens_its_own_slot(self):
+        self.tutor_request.status = "scheduled"
+        self.tutor_request.save(update_fields=["status"])
+        afternoon = TutorRequest.objects.create(
+            tutor=self.tutor, languages="Python", day_of_week="monday",
+            available_time=time(15), level_can_teach="intermediate", status="scheduled",
+        )
+        lesson = LessonSchedule.objects.create(
+            tutor=self.tutor, student=self.students[0], subject="Python", day_of_week="monday",
+            start_time=time(15), duration=60, frequency="weekly", status="cancelled", tutor_request=afternoon,
+        )
+        self.assertEqual(reopen_slot(lesson), afternoon)
+        self.tutor_request.refresh_from_db()
+        afternoon.refresh_from_db()
+        self.assertEqual((self.tutor_request.status, afternoon.status), ("scheduled", "available"))
+        self.assertIsNone(reopen_slot(lesson))
@@ -0,0 +1,108 @@
+"""Unit tests for the overdue invoice scanner and the email outbox."""
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from tutorials.billing import delete_invoices
+from tutorials.jobs import enqueue, run_jobs
+from tutorials.models import Invoice, OutboxEmail, Student, Tutor, User
+from tutorials.reminders import MAX_ATTEMPTS, REMIND_EVERY, deliver, scan_overdue
+
+
+class ReminderTestCase(TestCase):
+    """Unit tests for writing reminders in bulk and delivering them in batches."""
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        tutor_user = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        )
+        self.tutor = Tutor.objects.create(user=tutor_user)
+        self.students = [
+            Student.objects.create(user=User.objects.create_user(
+                username=f"@student{i}", email=f"student{i}@example.com", password="Password123", role="student",
+                first_name=f"Sam{i}",
+            ))
+            for i in range(5)
+        ]
+        self.overdue = [
+            Invoice.objects.create(
+                student=student, tutor=self.tutor, amount=40, due_date=self.today - timedelta(days=3)
+            )
+            for student in self.students
+        ]
+        Invoice.objects.create(student=self.students[0], tutor=self.tutor, amount=40, due_date=self.today)
+        Invoice.objects.create(
+            student=self.students[0], tutor=self.tutor, amount=40, due_date=self.today - timedelta(days=3), status="paid"
+        )
+
+    def test_scan_writes_one_reminder_per_overdue_invoice(self):
+        with self.assertNumQueries(2):  # the scan and one bulk insert
+            self.assertEqual(scan_overdue(chunk_size=10), 5)
+        email = OutboxEmail.objects.get(invoice=self.overdue[0])
+        self.assertEqual(email.to, "student0@example.com")
+        self.assertEqual(email.subject, f"Invoice {self.overdue[0].reference} is overdue")
+        self.assertIn("Dear Sam0", email.body)
+        self.assertIn("$40.00", email.body)
+
+    def test_invoices_are_reminded_at_most_every_interval(self):
+        scan_overdue()
+        self.assertEqual(scan_overdue(), 0)
+        OutboxEmail.objects.filter(invoice=self.overdue[0]).update(
+            created_at=timezone.now() - REMIND_EVERY - timedelta(minutes=1)
+        )
+        self.assertEqual(scan_overdue(), 1)
+
+    def test_scan_inserts_in_chunks(self):
+        with self.assertNumQueries(4):  # the scan and three bulk inserts of at most two
+            self.assertEqual(scan_overdue(chunk_size=2), 5)
+
+    def test_deliver_sends_batches_over_one_connection(self):
+        scan_overdue()
+        connection = get_connection("django.core.mail.backends.locmem.EmailBackend")
+        with mock.patch.object(connection, "open", wraps=connection.open) as opened, \
+                mock.patch.object(connection, "send_messages", wraps=connection.send_messages) as sent:
+            result = deliver(batch_size=2, connection=connection)
+        self.assertEqual((result.sent, result.failed), (5, 0))
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual([len(call.args[0]) for call in sent.call_args_list], [2, 2, 1])
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [f"student{i}@example.com" for i in range(5)])
+        self.assertFalse(OutboxEmail.objects.filter(sent_at__isnull=True).exists())
+        self.assertEqual(deliver().sent, 0)
+
+    def test_failed_batches_are_retried_then_given_up(self):
+        scan_overdue()
+        connection = get_connection("django.core.mail.backends.locmem.EmailBackend")
+        with mock.patch.object(connection, "send_messages", side_effect=OSError("connection refused")), \
+                self.assertLogs("tutorials.reminders", "ERROR"):
+            result = deliver(batch_size=2, connection=connection)
+        self.assertEqual((result.sent, result.failed), (0, 2))
+        failed = OutboxEmail.objects.filter(attempts=1)
+        self.assertEqual([email.last_error for email in failed], ["connection refused"] * 2)
+        OutboxEmail.objects.update(attempts=MAX_ATTEMPTS)
+        self.assertEqual(deliver().sent, 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_deleting_reminded_invoices(self):
+        scan_overdue()
+        self.assertEqual(delete_invoices([invoice.id for invoice in self.overdue]), 5)
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_command_and_job(self):
+        out = StringIO()
+        call_command("send_overdue_reminders", "--scan-only", stdout=out)
+        self.assertIn("Queued 5 overdue invoice reminders", out.getvalue())
+        self.assertEqual(len(mail.outbox), 0)
+        out = StringIO()
+        call_command("send_overdue_reminders", "--batch-size", "3", stdout=out)
+        self.assertIn("Sent 5 emails (0 failed)", out.getvalue())
+        Invoice.objects.create(
+            student=self.students[1], tutor=self.tutor, amount=10, due_date=self.today - timedelta(days=1)
+        )
+        enqueue(self.students[1].user, "overdue_reminders")
+        self.assertEqual(run_jobs(), (1, 0))
+        self.assertEqual(len(mail.outbox), 6)
@@ -0,0 +1,160 @@
+"""Unit tests for the incrementally maintained daily rollups."""
+from datetime import date, time, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from tutorials.matching import auto_pair
+from tutorials.models import (
+    DailyRequestRollup, DailyRollup, Feedback, Invoice, LessonSchedule, Student, StudentBalance, StudentRequest,
+    Tutor, TutorRequest, User,
+)
+
+
+def snapshot():
+    """Every rollup row as plain values, for comparing incremental and rebuilt tables."""
+    days = {
+        row.pop("date"): row
+        for row in DailyRollup.objects.values(
+            "date", "revenue_paid", "revenue_unpaid", "lesson_minutes", "feedback_count", "signups"
+        )
+        if any(row[field] for field in row if field != "date")
+    }
+    requests = {
+        (row["date"], row["status"], row["language"]): row["count"]
+        for row in DailyRequestRollup.objects.values("date", "status", "language", "count")
+        if row["count"]
+    }
+    balances = {
+        row.pop("student_id"): row
+        for row in StudentBalance.objects.values("student_id", "outstanding", "paid")
+        if row["outstanding"] or row["paid"]
+    }
+    return days, requests, balances
+
+
+class RollupTestCase(TestCase):
+    """Unit tests for the rollup signals and rebuild."""
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.tutor_user = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        )
+        self.student_user = User.objects.create_user(
+            username="@student", email="student@example.com", password="Password123", role="student"
+        )
+        self.tutor = Tutor.objects.create(user=self.tutor_user)
+        self.student = Student.objects.create(user=self.student_user)
+
+    def _day(self, day):
+        return DailyRollup.objects.get(date=day)
+
+    def test_invoice_revenue_follows_status_amount_and_deletion(self):
+        due = date(2025, 3, 1)
+        invoice = Invoice.objects.create(student=self.student, tutor=self.tutor, amount="80.50", due_date="2025-03-01")
+        self.assertEqual(self._day(due).revenue_unpaid, Decimal("80.50"))
+        invoice.status = "Paid"
+        invoice.amount = Decimal("100")
+        invoice.save()
+        rollup = self._day(due)
+        self.assertEqual((rollup.revenue_paid, rollup.revenue_unpaid), (Decimal("100"), Decimal("0")))
+        invoice = Invoice.objects.get()
+        invoice.due_date = due + timedelta(days=1)
+        invoice.save()
+        self.assertEqual(self._day(due).revenue_paid, 0)
+        self.assertEqual(self._day(due + timedelta(days=1)).revenue_paid, Decimal("100"))
+        Invoice.objects.all().delete()
+        self.assertEqual(self._day(due + timedelta(days=1)).revenue_paid, 0)
+
+    def test_student_balance_follows_invoices(self):
+        invoice = Invoice.objects.create(student=self.student, tutor=self.tutor, amount="80.50", due_date=self.today)
+        Invoice.objects.create(student=self.student, tutor=self.tutor, amount="20", due_date=self.today)
+        balance = StudentBalance.objects.get(student=self.student)
+        self.assertEqual((balance.outstanding, balance.paid), (Decimal("100.50"), 0))
+        invoice.status = "Paid"
+        invoice.save()
+        balance.refresh_from_db()
+        self.assertEqual((balance.outstanding, balance.paid), (Decimal("20"), Decimal("80.50")))
+        invoice.delete()
+        balance.refresh_from_db()
+        self.assertEqual((balance.outstanding, balance.paid), (Decimal("20"), 0))
+
+    def test_deleting_a_student_does_not_recreate_their_balance(self):
+        Invoice.objects.create(student=self.student, tutor=self.tutor, amount="20", due_date=self.today)
+        self.student_user.delete()
+        self.assertFalse(StudentBalance.objects.exists())
+        self.assertEqual(self._day(self.today).revenue_unpaid, 0)
+
+    def test_lesson_minutes_and_signups(self):
+        lesson = LessonSchedule.objects.create(
+            tutor=self.tutor_user, student=self.student_user, subject="Python", day_of_week="monday",
+            start_time=time(10), duration=45, frequency="weekly",
+        )
+        self.assertEqual(self._day(self.today).lesson_minutes, 45)
+        self.assertEqual(self._day(self.today).signups, 2)
+        lesson.duration = 60
+        lesson.save(update_fields=["duration"])
+        self.assertEqual(self._day(self.today).lesson_minutes, 60)
+        self.student_user.delete()
+        self.assertEqual((self._day(self.today).lesson_minutes, self._day(self.today).signups), (0, 1))
+
+    def test_request_counts_by_status_and_language(self):
+        student_request = StudentRequest.objects.create(
+            student=self.student_user, language=" Python", frequency="weekly", status="pending"
+        )
+        Feedback.objects.create(name="A", email="a@example.com", message="Good")
+        self.assertEqual(DailyRequestRollup.objects.get(status="pending", language="python").count, 1)
+        self.assertEqual(self._day(self.today).feedback_count, 1)
+        reloaded = StudentRequest.objects.get(pk=student_request.pk)
+        reloaded.status = "Cancelled"
+        reloaded.save()
+        self.assertEqual(DailyRequestRollup.objects.get(status="pending").count, 0)
+        self.assertEqual(DailyRequestRollup.objects.get(status="cancelled").count, 1)
+
+    def test_saving_a_deferred_instance_reads_its_old_contribution(self):
+        Invoice.objects.create(student=self.student, tutor=self.tutor, amount=10, due_date=self.today)
+        invoice = Invoice.objects.only("id", "status").get()
+        invoice.status = "paid"
+        invoice.save()
+        self.assertEqual((self._day(self.today).revenue_paid, self._day(self.today).revenue_unpaid), (10, 0))
+
+    def test_loading_rows_does_no_rollup_work(self):
+        Invoice.objects.create(student=self.student, tutor=self.tutor, amount=10, due_date=self.today)
+        with mock.patch("tutorials.rollups.deltas") as deltas:
+            list(Invoice.objects.all())
+        deltas.assert_not_called()
+
+    def test_bulk_pairing_keeps_rollups_in_step(self):
+        StudentRequest.objects.create(
+            student=self.student_user, language="Python", frequency="weekly", day_of_week="monday",
+            preferred_time=time(10), difficulty="beginner",
+        )
+        TutorRequest.objects.create(
+            tutor=self.tutor_user, languages="Python", day_of_week="monday",
+            available_time=time(10), level_can_teach="beginner",
+        )
+        auto_pair()
+        incremental = snapshot()
+        self.assertEqual(DailyRequestRollup.objects.get(status="approved").count, 1)
+        call_command("rebuild_rollups", stdout=StringIO())
+        self.assertEqual(snapshot(), incremental)
+
+    def test_rebuild_matches_incremental_rollups(self):
+        for i in range(5):
+            Invoice.objects.create(
+                student=self.student, tutor=self.tutor, amount=10 * i, due_date=self.today - timedelta(days=i),
+                status="paid" if i % 2 else "unpaid",
+            )
+            StudentRequest.objects.create(
+                student=self.student_user, language="Java" if i % 2 else "Python", frequency="weekly",
+                status="pending" if i % 3 else "approved",
+            )
+        Feedback.objects.create(name="A", email="a@example.com", message="Good")
+        incremental = snapshot()
+        out = StringIO()
+        call_command("rebuild_rollups", chunk_size=2, stdout=out)
+        self.assertIn("Rebuilt rollups for 5 days", out.getvalue())
+        self.assertEqual(snapshot(), incremental)
@@ -0,0 +1,127 @@
+"""Unit tests for lesson interval indexes and double-booking detection."""
+from datetime import date, time
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from tutorials.models import LessonSchedule, User
+from tutorials.scheduling import (
+    IntervalIndex, ScheduleIndex, find_conflict, lesson_intervals, overlap_report, week_parity,
+)
+
+
+class IntervalIndexTestCase(TestCase):
+    """Unit tests for IntervalIndex."""
+
+    def test_overlapping(self):
+        index = IntervalIndex([(600, 660, "a"), (720, 780, "b")])
+        self.assertEqual(index.overlapping(630, 700), "a")
+        self.assertEqual(index.overlapping(770, 800), "b")
+        self.assertIsNone(index.overlapping(660, 720))
+        self.assertIsNone(index.overlapping(500, 600))
+
+    def test_overlapping_with_nested_intervals(self):
+        index = IntervalIndex([(480, 900, "long"), (600, 630, "short")])
+        self.assertEqual(index.overlapping(700, 710), "long")
+
+    def test_lesson_intervals_wrap_past_midnight(self):
+        self.assertEqual(
+            lesson_intervals("Sunday", time(23, 30), 60),
+            [("sunday", 1410, 1440), ("monday", 0, 30)],
+        )
+        self.assertEqual(lesson_intervals("someday", time(10), 60), [])
+
+
+class ConflictDetectionTestCase(TestCase):
+    """Unit tests for find_conflict and overlap_report."""
+
+    def setUp(self):
+        self.tutor = User.objects.create_user(
+            username="@tutor", email="tutor@example.com", password="Password123", role="tutor"
+        )
+        self.student = User.objects.create_user(
+            username="@student", email="student@example.com", password="Password123", role="student"
+        )
+        self.other = User.objects.create_user(
+            username="@other", email="other@example.com", password="Password123", role="student"
+        )
+        self.lesson = LessonSchedule.objects.create(
+            tutor=self.tutor, student=self.student, subject="Python", day_of_week="Monday",
+            start_time=time(10), duration=60, frequency="weekly", status="scheduled",
+        )
+
+    def test_conflict_for_tutor(self):
+        conflict = find_conflict(self.tutor.id, self.other.id, "monday", time(10, 30), 60)
+        self.assertEqual(conflict, self.lesson)
+
+    def test_conflict_for_student(self):
+        conflict = find_conflict(self.other.id, self.student.id, "monday", time(9, 30), 60)
+        self.assertEqual(conflict, self.lesson)
+
+    def test_no_conflict_back_to_back_or_other_day(self):
+        self.assertIsNone(find_conflict(self.tutor.id, self.other.id, "monday", time(11), 60))
+        self.assertIsNone(find_conflict(self.tutor.id, self.other.id, "tuesday", time(10), 60))
+
+    def test_fortnightly_lessons_conflict(self):
+        self.lesson.frequency = "fortnightly"
+        self.lesson.save()
+        self.assertEqual(find_conflict(self.tutor.id, self.other.id, "monday", time(10), 30), self.lesson)
+
+    def test_fortnightly_lessons_on_alternate_weeks_do_not_conflict(self):
+        self.lesson.frequency = "fortnightly"
+        self.lesson.starts_on = date(2026, 1, 5)
+        self.lesson.save()
+        alternate = LessonSchedule.objects.create(
+            tutor=self.tutor, student=self.other, subject="Java", day_of_week="monday", start_time=time(10),
+            duration=60, frequency="fortnightly", status="scheduled", starts_on=date(2026, 1, 12),
+        )
+        self.assertNotEqual(week_parity("monday", "fortnightly", self.lesson.starts_on),
+                            week_parity("monday", "fortnightly", alternate.starts_on))
+        self.assertIsNone(find_conflict(
+            self.tutor.id, self.other.id, "monday", time(10), 60, exclude=alternate.pk,
+            frequency="fortnightly", starts_on=alternate.starts_on,
+        ))
+        self.assertEqual(find_conflict(
+            self.tutor.id, self.other.id, "monday", time(10), 60, exclude=alternate.pk,
+            frequency="fortnightly", starts_on=date(2026, 1, 19),
+        ), self.lesson)
+        self.assertEqual(list(overlap_report()), [])
+
+    def test_fortnightly_parity_follows_first_occurrence(self):
+        # Starting on a Tuesday, a Monday lesson first runs the following week.
+        self.assertEqual(week_parity("monday", "fortnightly", date(2026, 1, 6)),
+                         week_parity("monday", "fortnightly", date(2026, 1, 12)))
+        self.assertIsNone(week_parity("monday", "weekly", date(2026, 1, 6)))
+
+    def test_cancelled_and_excluded_lessons_ignored(self):
+        self.assertIsNone(find_conflict(self.tutor.id, self.student.id, "monday", time(10), 60, exclude=self.lesson.pk))
+        self.lesson.status = "cancelled"
+        self.lesson.save()
+        self.assertIsNone(find_conflict(self.tutor.id, self.student.id, "monday", time(10), 60))
+
+    def test_reserve_detects_clashes_between_new_lessons(self):
+        index = ScheduleIndex.for_users([self.other.id])
+        first = LessonSchedule(tutor=self.other, student=self.student, day_of_week="friday", start_time=time(9), duration=60)
+        second = LessonSchedule(tutor=self.tutor, student=self.other, day_of_week="friday", start_time=time(9, 30), duration=60)
+        self.assertTrue(index.reserve(first))
+        self.assertFalse(index.reserve(second))
+
+    def test_overlap_report_lists_every_overlap(self):
+        clash = LessonSchedule.objects.create(
+            tutor=self.tutor, student=self.other, subject="Java", day_of_week="monday",
+            start_time=time(10, 30), duration=60, frequency="weekly", status="scheduled",
+        )
+        LessonSchedule.objects.create(
+            tutor=self.tutor, student=self.other, subject="Java", day_of_week="monday",
+            start_time=time(11, 30), duration=30, frequency="weekly", status="scheduled",
+        )
+        self.assertEqual(list(overlap_report()), [(self.tutor.id, "monday", self.lesson.id, clash.id)])
+
+    def test_schedule_conflicts_command(self):
+        LessonSchedule.objects.create(
+            tutor=self.tutor, student=self.other, subject="Java", day_of_week="monday",
+            start_time=time(10, 30), duration=60, frequency="weekly", status="scheduled",
+        )
+        out = StringIO()
+        call_command("schedule_conflicts", stdout=out)
+        self.assertIn("@tutor on monday", out.getvalue())
+        self.assertIn("Found 1 overlapping lesson pairs", out.getvalue())
@@ -0,0 +1,71 @@
+"""Unit tests for the feedback full-text search."""
+from django.test import TestCase
+from tutorials.models import Feedback
+from tutorials.search import fts5_query, search_feedback
+
+
+class FeedbackSearchTestCase(TestCase):
+    """Unit tests for ranking, paging and keeping the search index in sync."""
+
+    def setUp(self):
+        self.late = Feedback.objects.create(
+            name="Ann", email="ann@example.com", message="My tutor was late to the lesson."
+        )
+        self.late_twice = Feedback.objects.create(
+            name="Bob", email="bob@example.com", message="Late again, and late the week before. Late!"
+        )
+        self.praise = Feedback.objects.create(
+            name="Cat", email="cat@example.com", message="Brilliant Python lessons, thank you."
+        )
+
+    def test_fts5_query_quotes_words(self):
+        self.assertEqual(fts5_query('late "tutor'), '"late" "tutor"*')
+        self.assertEqual(fts5_query("AND OR NOT -*"), '"AND" "OR" "NOT"*')
+        self.assertEqual(fts5_query("  "), "")
+
+    def test_best_match_first(self):
+        results, has_next = search_feedback("late")
+        self.assertEqual(results, [self.late_twice, self.late])
+        self.assertFalse(has_next)
+
+    def test_every_word_must_match(self):
+        self.assertEqual(search_feedback("late tutor")[0], [self.late])
+
+    def test_last_word_matches_as_prefix(self):
+        self.assertEqual(search_feedback("pyth")[0], [self.praise])
+
+    def test_searches_name_and_email(self):
+        self.assertEqual(search_feedback("bob")[0], [self.late_twice])
+        self.assertEqual(search_feedback("cat@example.com")[0], [self.praise])
+
+    def test_empty_query_finds_nothing(self):
+        self.assertEqual(search_feedback(""), ([], False))
+        self.assertEqual(search_feedback("?!"), ([], False))
+
+    def test_pages(self):
+        first, has_next = search_feedback("example", page=1, page_size=2)
+        second, has_more = search_feedback("example", page=2, page_size=2)
+        self.assertEqual(len(first), 2)
+        self.assertTrue(has_next)
+        self.assertEqual(len(second), 1)
+        self.assertFalse(has_more)
+        self.assertFalse({feedback.id for feedback in first} & {feedback.id for feedback in second})
+
+    def test_index_follows_updates_and_deletes(self):
+        self.praise.message = "The lesson started late."
+        self.praise.save()
+        self.assertIn(self.praise, search_feedback("late")[0])
+        self.assertEqual(search_feedback("brilliant")[0], [])
+        self.late.delete()
+        self.assertNotIn(self.late.id, [feedback.id for feedback in search_feedback("late")[0]])
+
+    def test_bulk_created_rows_are_indexed(self):
+        Feedback.objects.bulk_create(
+            Feedback(name=f"Person {i}", email=f"person{i}@example.com", message="Cancelled without notice")
+            for i in range(3)
+        )
+        self.assertEqual(len(search_feedback("notice")[0]), 3)
+
+    def test_search_is_one_query(self):
+        with self.assertNumQueries(1):
+            search_feedback("late")
@@ -1,7 +1,9 @@
 from django.test import TestCase, Client
+from django.core.cache import cache
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from tutorials.models import Tutor, Student, Feedback, Invoice, LessonSchedule, StudentRequest
+from tutorials.models import Tutor, Student, Feedback, Invoice, LessonSchedule, StudentRequest, TutorRequest
+from tutorials.pairing import pair_batch
 from datetime import date
 from django.utils.timezone import now
 
@@ -9,6 +11,7 @@ User = get_user_model()
 
 class AdminAnalyticsViewTest(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.admin_user = User.objects.create_user(
             username='adminuser', email='admin@example.com', password='adminpass', role='admin'
@@ -103,3 +106,35 @@ class AdminAnalyticsViewTest(TestCase):
         self.assertEqual(analytics['monthly_revenue'], 0)
         self.assertEqual(analytics['pending_requests'], 0)
         self.assertEqual(analytics['hours_taught'], 0)
+
+    def test_admin_analytics_is_served_from_cache(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(2):  # session and user only
+            response = self.client.get(self.url)
+        self.assertEqual(response.context['analytics']['total_revenue'], 500)
+
+    def test_admin_analytics_refreshes_after_changes(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Invoice.objects.create(
+                student=Student.objects.first(), tutor=Tutor.objects.first(), amount=250, due_date=date.today()
+            )
+            request = StudentRequest.objects.get()
+            request.status = 'approved'
+            request.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['analytics']['total_revenue'], 750)
+        self.assertEqual(response.context['analytics']['pending_requests'], 0)
+
+    def test_admin_analytics_refreshes_after_batch_pairing(self):
+        self.client.get(self.url)
+        student_request = StudentRequest.objects.get()
+        tutor_request = TutorRequest.objects.create(
+            tutor=self.tutor_user, languages=student_request.language, day_of_week=student_request.day_of_week,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            pair_batch([{
+                "student_request_id": student_request.id, "tutor_request_id": tutor_request.id,
+                "start_time": "15:00", "duration": 60,
+            }])
+        self.assertEqual(self.client.get(self.url).context['analytics']['pending_requests'], 0)
@@ -1,6 +1,7 @@
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from tutorials.pagination import PAGE_SIZE
 from tutorials.models import (
     Student, Tutor, StudentRequest, TutorRequest, LessonSchedule
 )
@@ -101,3 +102,40 @@ class AdminDashboardViewTest(TestCase):
         self.client.login(username="tutor", password="testpassword")
         response = self.client.get(reverse("admin_dashboard"))
         self.assertEqual(response.status_code, 302)
+
+    def test_tables_are_paged_by_independent_cursors(self):
+        """Test each table pages through its own keyset cursor and keeps the filters."""
+        for _ in range(PAGE_SIZE + 4):
+            StudentRequest.objects.create(
+                student=self.student_user, language="Python", frequency="weekly",
+                day_of_week="monday", preferred_time="11:00:00", status="pending",
+            )
+        StudentRequest.objects.create(
+            student=self.student_user, language="Java", frequency="weekly",
+            day_of_week="monday", preferred_time="11:00:00", status="pending",
+        )
+        self.client.login(username="admin", password="adminpassword")
+        url = reverse("admin_dashboard")
+        response = self.client.get(url, {"language": "Python", "status": "pending"})
+        first_page = list(response.context["student_requests"])
+        self.assertEqual(len(first_page), PAGE_SIZE)
+        self.assertEqual(first_page[0].language, "Python")
+        self.assertEqual(response.context["student_cursor"], first_page[-1].id)
+        self.assertIsNone(response.context["tutor_cursor"])
+        self.assertIsNone(response.context["lesson_cursor"])
+        self.assertContains(response, "student_cursor=%d" % first_page[-1].id)
+
+        response = self.client.get(url, {
+            "language": "Python", "status": "pending", "student_cursor": response.context["student_cursor"],
+        })
+        second_page = list(response.context["student_requests"])
+        self.assertEqual(len(second_page), 5)
+        self.assertTrue(all(request.id < first_page[-1].id for request in second_page))
+        self.assertIsNone(response.context["student_cursor"])
+        self.assertEqual(list(response.context["lessons"]), [self.lesson])
+
+    def test_invalid_cursor_shows_first_page(self):
+        """Test a malformed cursor falls back to the first page."""
+        self.client.login(username="admin", password="adminpassword")
+        response = self.client.get(reverse("admin_dashboard"), {"lesson_cursor": "abc"})
+        self.assertEqual(list(response.context["lessons"]), [self.lesson])
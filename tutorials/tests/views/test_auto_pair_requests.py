@@ -0,0 +1,84 @@
+from unittest import mock
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from tutorials.models import Request, StudentRequest, TutorRequest, LessonSchedule
+
+User = get_user_model()
+
+
+class AutoPairRequestsViewTest(TestCase):
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username="adminuser", email="adminuser@example.com", password="adminpass", role="admin"
+        )
+        self.student_user = User.objects.create_user(
+            username="studentuser", email="studentuser@example.com", password="studentpass", role="student"
+        )
+        self.tutor_user = User.objects.create_user(
+            username="tutoruser", email="tutoruser@example.com", password="tutorpass", role="tutor"
+        )
+        StudentRequest.objects.create(
+            student=self.student_user, language="Python", status="pending", day_of_week="monday",
+            difficulty="beginner", preferred_time="10:00", frequency="weekly",
+        )
+        TutorRequest.objects.create(
+            tutor=self.tutor_user, languages="Python", status="available", day_of_week="monday",
+            level_can_teach="beginner", available_time="10:00",
+        )
+        self.url = reverse("auto_pair_requests")
+
+    def test_forbidden_for_non_admin(self):
+        self.client.login(username="studentuser", password="studentpass")
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(LessonSchedule.objects.count(), 0)
+
+    def test_get_redirects_without_pairing(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse("admin_dashboard"), target_status_code=302)
+        self.assertEqual(LessonSchedule.objects.count(), 0)
+
+    def test_dry_run_reports_without_pairing(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.post(self.url, {"dry_run": "1"})
+        messages = list(get_messages(response.wsgi_request))
+        self.assertTrue(str(messages[0]).startswith("Would pair 1 of 1 pending requests (100%)"))
+        self.assertEqual(LessonSchedule.objects.count(), 0)
+
+    def test_post_pairs_requests(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.post(self.url)
+        messages = list(get_messages(response.wsgi_request))
+        self.assertTrue(str(messages[0]).startswith("Paired 1 of 1 pending requests"))
+        self.assertEqual(LessonSchedule.objects.count(), 1)
+        self.assertEqual(StudentRequest.objects.get().status, "approved")
+
+    def test_queue_enqueues_without_pairing(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.post(self.url, {"queue": "1"})
+        messages = list(get_messages(response.wsgi_request))
+        self.assertEqual(str(messages[0]), "Auto-pairing has been queued.")
+        self.assertEqual(LessonSchedule.objects.count(), 0)
+        job = Request.objects.get()
+        self.assertEqual((job.type, job.priority, job.student), ("auto_pair", "high", self.admin_user))
+
+    def test_oversized_group_is_queued_instead_of_paired(self):
+        self.client.login(username="adminuser", password="adminpass")
+        with mock.patch("tutorials.views.INLINE_GROUP_LIMIT", 0):
+            response = self.client.post(self.url)
+        messages = list(get_messages(response.wsgi_request))
+        self.assertTrue(str(messages[0]).endswith("Auto-pairing has been queued instead."))
+        self.assertEqual(LessonSchedule.objects.count(), 0)
+        self.assertEqual(Request.objects.get().type, "auto_pair")
+
+    def test_oversized_dry_run_is_refused(self):
+        self.client.login(username="adminuser", password="adminpass")
+        with mock.patch("tutorials.views.INLINE_GROUP_LIMIT", 0):
+            response = self.client.post(self.url, {"dry_run": "1"})
+        messages = list(get_messages(response.wsgi_request))
+        self.assertIn("more than the 0 paired within a request", str(messages[0]))
+        self.assertEqual(Request.objects.count(), 0)
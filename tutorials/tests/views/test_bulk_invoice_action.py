@@ -0,0 +1,72 @@
+from datetime import date
+from decimal import Decimal
+from django.contrib.messages import get_messages
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from tutorials.models import Invoice, Student, StudentBalance, Tutor
+
+User = get_user_model()
+
+
+class BulkInvoiceActionViewTest(TestCase):
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username="adminuser", email="adminuser@example.com", password="adminpass", role="admin"
+        )
+        self.student_user = User.objects.create_user(
+            username="studentuser", email="studentuser@example.com", password="studentpass", role="student"
+        )
+        tutor_user = User.objects.create_user(
+            username="tutoruser", email="tutoruser@example.com", password="tutorpass", role="tutor"
+        )
+        self.student = Student.objects.create(user=self.student_user)
+        tutor = Tutor.objects.create(user=tutor_user)
+        self.invoices = [
+            Invoice.objects.create(student=self.student, tutor=tutor, amount=amount, due_date=date(2024, 1, 31))
+            for amount in (10, 20, 30)
+        ]
+        self.url = reverse("bulk_invoice_action")
+
+    def _post(self, action, invoices):
+        return self.client.post(self.url, {"action": action, "invoice_ids": [invoice.id for invoice in invoices]})
+
+    def _messages(self, response):
+        return [str(message) for message in get_messages(response.wsgi_request)]
+
+    def test_mark_selected_invoices_paid_and_unpaid(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self._post("mark_paid", self.invoices[:2])
+        self.assertRedirects(response, reverse("admin_invoices"), fetch_redirect_response=False)
+        self.assertEqual(self._messages(response), ["Marked 2 of 2 selected invoices as paid."])
+        self.assertEqual(list(Invoice.objects.order_by("id").values_list("status", flat=True)), ["paid", "paid", "unpaid"])
+        self.assertEqual(StudentBalance.objects.get(student=self.student).outstanding, Decimal("30"))
+        response = self._post("mark_unpaid", self.invoices)
+        self.assertEqual(self._messages(response)[-1], "Marked 2 of 3 selected invoices as unpaid.")
+        self.assertFalse(Invoice.objects.filter(status="paid").exists())
+
+    def test_delete_selected_invoices(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self._post("delete", self.invoices[1:])
+        self.assertEqual(self._messages(response), ["Deleted 2 of 2 selected invoices."])
+        self.assertEqual(list(Invoice.objects.values_list("id", flat=True)), [self.invoices[0].id])
+        self.assertEqual(StudentBalance.objects.get(student=self.student).outstanding, Decimal("10"))
+
+    def test_nothing_selected_or_unknown_action(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self._post("mark_paid", [])
+        self.assertEqual(self._messages(response), ["Select at least one invoice."])
+        response = self._post("archive", self.invoices)
+        self.assertEqual(self._messages(response)[-1], "Unknown invoice action.")
+        self.assertEqual(Invoice.objects.count(), 3)
+
+    def test_get_redirects_to_invoices(self):
+        self.client.login(username="adminuser", password="adminpass")
+        self.assertRedirects(self.client.get(self.url), reverse("admin_invoices"), fetch_redirect_response=False)
+
+    def test_forbidden_for_students(self):
+        self.client.login(username="studentuser", password="studentpass")
+        response = self._post("delete", self.invoices)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Invoice.objects.count(), 3)
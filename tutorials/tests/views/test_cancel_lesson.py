@@ -1,7 +1,9 @@
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from tutorials.models import LessonSchedule
+from django.test import override_settings
+from tutorials.models import LessonOccurrence, LessonSchedule, StudentRequest, TutorRequest
+from tutorials.scheduling import sync_occurrences
 
 User = get_user_model()
 
@@ -56,6 +58,14 @@ class CancelLessonViewTest(TestCase):
         self.assertEqual(self.lesson.status, "cancelled")
         self.assertRedirects(response, reverse("student_dashboard"))
 
+    def test_cancel_lesson_removes_upcoming_occurrences(self):
+        self.lesson.refresh_from_db()
+        sync_occurrences([self.lesson])
+        self.assertTrue(LessonOccurrence.objects.filter(lesson=self.lesson).exists())
+        self.client.login(username="studentuser", password="studentpass")
+        self.client.post(self.url)
+        self.assertFalse(LessonOccurrence.objects.filter(lesson=self.lesson).exists())
+
     def test_cancel_lesson_as_tutor(self):
         self.client.login(username="tutoruser", password="tutorpass")
         response = self.client.post(self.url, follow=True)
@@ -63,6 +73,34 @@ class CancelLessonViewTest(TestCase):
         self.assertEqual(self.lesson.status, "cancelled")
         self.assertRedirects(response, reverse("tutor_dashboard"))
 
+    def _waiting_request(self):
+        tutor_request = TutorRequest.objects.create(
+            tutor=self.tutor_user, languages="Math", day_of_week="monday", available_time="10:00",
+            level_can_teach="advanced", status="scheduled",
+        )
+        LessonSchedule.objects.filter(id=self.lesson.id).update(tutor_request=tutor_request)
+        return StudentRequest.objects.create(
+            student=self.other_user, language="Math", frequency="weekly", day_of_week="monday",
+            preferred_time="10:00", difficulty="beginner",
+        )
+
+    def test_cancel_lesson_rebooks_freed_slot(self):
+        waiting = self._waiting_request()
+        self.client.login(username="tutoruser", password="tutorpass")
+        self.client.post(self.url)
+        waiting.refresh_from_db()
+        self.assertEqual(waiting.status, "approved")
+        self.assertTrue(LessonSchedule.objects.filter(student=self.other_user, status="scheduled").exists())
+
+    @override_settings(AUTO_REMATCH=False)
+    def test_cancel_lesson_only_reopens_slot_without_auto_rematch(self):
+        waiting = self._waiting_request()
+        self.client.login(username="tutoruser", password="tutorpass")
+        self.client.post(self.url)
+        waiting.refresh_from_db()
+        self.assertEqual(waiting.status, "pending")
+        self.assertEqual(TutorRequest.objects.get().status, "available")
+
     def test_redirect_if_not_logged_in(self):
         response = self.client.get(self.url)
         login_url = f"{reverse('log_in')}?next={self.url}"
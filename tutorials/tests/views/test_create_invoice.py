@@ -60,6 +60,9 @@ class CreateInvoiceViewTest(TestCase):
         invoice = Invoice.objects.get(student=self.student, tutor=self.tutor)
         self.assertEqual(invoice.amount, float(self.valid_invoice_data["amount"]))
         self.assertEqual(str(invoice.due_date), self.valid_invoice_data["due_date"])
+        line = invoice.lines.get()
+        self.assertEqual((line.quantity, line.amount), (1, invoice.amount))
+        self.assertEqual(self.student.balance.outstanding, invoice.amount)
 
 
 
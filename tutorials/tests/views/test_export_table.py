@@ -0,0 +1,96 @@
+import csv
+import io
+import json
+from datetime import date, time
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from tutorials.models import Feedback, Invoice, LessonSchedule, Student, StudentRequest, Tutor
+
+User = get_user_model()
+
+
+class ExportTableViewTest(TestCase):
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username="adminuser", email="adminuser@example.com", password="adminpass", role="admin"
+        )
+        self.student_user = User.objects.create_user(
+            username="studentuser", email="studentuser@example.com", password="studentpass", role="student",
+            first_name="Sam", last_name="Student",
+        )
+        self.tutor_user = User.objects.create_user(
+            username="tutoruser", email="tutoruser@example.com", password="tutorpass", role="tutor",
+            first_name="Tia", last_name="Tutor",
+        )
+        student = Student.objects.create(user=self.student_user)
+        tutor = Tutor.objects.create(user=self.tutor_user)
+        for amount, status in [(100, "paid"), (50, "Paid"), (30, "unpaid")]:
+            Invoice.objects.create(student=student, tutor=tutor, amount=amount, due_date=date(2024, 1, 31), status=status)
+        for language in ["Python", "Java"]:
+            StudentRequest.objects.create(
+                student=self.student_user, language=language, frequency="weekly", day_of_week="monday",
+                status="pending",
+            )
+        LessonSchedule.objects.create(
+            tutor=self.tutor_user, student=self.student_user, subject="Python", day_of_week="monday",
+            start_time=time(10), duration=60, frequency="weekly", status="scheduled",
+        )
+        Feedback.objects.create(name="Sam", email="sam@example.com", message="Great, thanks")
+
+    def _content(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_forbidden_for_non_admin(self):
+        self.client.login(username="studentuser", password="studentpass")
+        response = self.client.get(reverse("export_table", args=["invoices"]))
+        self.assertEqual(response.status_code, 403)
+
+    def test_invoices_csv(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.get(reverse("export_table", args=["invoices"]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn('filename="invoices.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(self._content(response))))
+        self.assertEqual([row["amount"] for row in rows], ["100.00", "50.00", "30.00"])
+        self.assertEqual(rows[0]["student"], "Sam Student")
+        self.assertEqual(rows[0]["tutor"], "Tia Tutor")
+
+    def test_lessons_ndjson(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.get(reverse("export_table", args=["lessons"]), {"format": "ndjson"})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["tutor"], "Tia Tutor")
+        self.assertEqual(lines[0]["start_time"], "10:00:00")
+
+    def test_dashboard_filters_are_honoured(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.get(reverse("export_table", args=["student_requests"]), {"language": "Java"})
+        rows = list(csv.DictReader(io.StringIO(self._content(response))))
+        self.assertEqual([row["language"] for row in rows], ["Java"])
+        response = self.client.get(reverse("export_table", args=["invoices"]), {"status": "paid"})
+        rows = list(csv.DictReader(io.StringIO(self._content(response))))
+        self.assertEqual([row["status"] for row in rows], ["paid", "paid"])
+
+    def test_export_reads_joined_names_in_one_query(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.get(reverse("export_table", args=["invoices"]))
+        with self.assertNumQueries(1):
+            self._content(response)
+
+    def test_feedback_csv_quotes_commas(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.get(reverse("export_table", args=["feedback"]))
+        rows = list(csv.DictReader(io.StringIO(self._content(response))))
+        self.assertEqual(rows[0]["message"], "Great, thanks")
+
+    def test_unknown_table_and_format(self):
+        self.client.login(username="adminuser", password="adminpass")
+        self.assertEqual(self.client.get(reverse("export_table", args=["users"])).status_code, 404)
+        response = self.client.get(reverse("export_table", args=["invoices"]), {"format": "xml"})
+        self.assertEqual(response.status_code, 400)
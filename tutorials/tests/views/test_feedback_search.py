@@ -0,0 +1,56 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from tutorials.models import Feedback
+from tutorials.pagination import PAGE_SIZE
+
+User = get_user_model()
+
+
+class FeedbackSearchViewTest(TestCase):
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username="adminuser", email="adminuser@example.com", password="adminpass", role="admin"
+        )
+        User.objects.create_user(
+            username="studentuser", email="studentuser@example.com", password="studentpass", role="student"
+        )
+        Feedback.objects.create(name="John Doe", email="john@example.com", message="The lesson was cancelled.")
+        Feedback.objects.create(name="Jane Smith", email="jane@example.com", message="Great tutor.")
+        self.url = reverse("feedback_search")
+
+    def test_forbidden_for_non_admin(self):
+        self.client.login(username="studentuser", password="studentpass")
+        response = self.client.get(self.url, {"q": "lesson"})
+        self.assertEqual(response.status_code, 403)
+
+    def test_search_results(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.get(self.url, {"q": "cancelled"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "admin_feedback.html")
+        self.assertEqual([feedback.name for feedback in response.context["feedbacks"]], ["John Doe"])
+        self.assertContains(response, 'value="cancelled"')
+        self.assertNotContains(response, "Jane Smith")
+
+    def test_paging(self):
+        Feedback.objects.bulk_create(
+            Feedback(name=f"Person {i}", email=f"person{i}@example.com", message="Late again")
+            for i in range(PAGE_SIZE + 1)
+        )
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.get(self.url, {"q": "late"})
+        self.assertEqual(len(response.context["feedbacks"]), PAGE_SIZE)
+        self.assertEqual(response.context["next_page"], 2)
+        self.assertContains(response, "page=2")
+        response = self.client.get(self.url, {"q": "late", "page": "2"})
+        self.assertEqual(len(response.context["feedbacks"]), 1)
+        self.assertIsNone(response.context["next_page"])
+        self.assertEqual(response.context["previous_page"], 1)
+
+    def test_invalid_page_falls_back_to_first(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.get(self.url, {"q": "tutor", "page": "abc"})
+        self.assertEqual(response.context["page"], 1)
+        self.assertEqual(len(response.context["feedbacks"]), 1)
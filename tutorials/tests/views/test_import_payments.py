@@ -0,0 +1,76 @@
+import csv
+import io
+import tempfile
+from datetime import date
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from tutorials.models import Invoice, Student, Tutor
+
+User = get_user_model()
+
+
+class ImportPaymentsViewTest(TestCase):
+
+    def setUp(self):
+        self.report_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.report_dir.cleanup)
+        settings_override = override_settings(PAYMENT_REPORT_DIR=self.report_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.admin_user = User.objects.create_user(
+            username="adminuser", email="adminuser@example.com", password="adminpass", role="admin"
+        )
+        User.objects.create_user(
+            username="studentuser", email="studentuser@example.com", password="studentpass", role="student"
+        )
+        student = Student.objects.create(user=User.objects.create_user(
+            username="payer", email="payer@example.com", password="payerpass", role="student"
+        ))
+        tutor = Tutor.objects.create(user=User.objects.create_user(
+            username="tutoruser", email="tutoruser@example.com", password="tutorpass", role="tutor"
+        ))
+        self.invoice = Invoice.objects.create(student=student, tutor=tutor, amount="75.00", due_date=date(2024, 1, 31))
+        self.url = reverse("import_payments")
+
+    def _upload(self, content):
+        statement = SimpleUploadedFile("statement.csv", content.encode("utf-8"), content_type="text/csv")
+        return self.client.post(self.url, {"statement": statement})
+
+    def test_upload_marks_invoices_paid_and_links_the_report(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self._upload(f"reference,amount\n{self.invoice.reference},75.00\nINV-999,1.00\n")
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "import_payments.html")
+        self.assertEqual((response.context["result"].paid, response.context["result"].unmatched), (1, 1))
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.status, "paid")
+
+        report_url = reverse("payment_report", args=[response.context["report_name"]])
+        self.assertContains(response, report_url)
+        report = self.client.get(report_url)
+        self.assertEqual(report["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(io.StringIO(b"".join(report.streaming_content).decode())))
+        self.assertEqual([row["reference"] for row in rows], ["INV-999"])
+
+    def test_statement_without_the_columns_is_refused(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self._upload("ref,value\nINV-1,75.00\n")
+        self.assertRedirects(response, self.url)
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.status, "unpaid")
+
+    def test_unknown_report_is_not_found(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.get(reverse("payment_report", args=["unmatched-0.csv"]))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse("payment_report", args=["settings.py"]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_forbidden_for_students(self):
+        self.client.login(username="studentuser", password="studentpass")
+        response = self._upload(f"reference,amount\n{self.invoice.reference},75.00\n")
+        self.assertEqual(response.status_code, 403)
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.status, "unpaid")
@@ -51,7 +51,7 @@ class MarkPaidViewTest(TestCase):
         # Refresh the invoice
         self.invoice.refresh_from_db()
 
-        self.assertEqual(self.invoice.status, "Paid")
+        self.assertEqual(self.invoice.status, "paid")
         self.assertRedirects(response, reverse("admin_dashboard"))
 
         # Check success message
@@ -69,7 +69,7 @@ class MarkPaidViewTest(TestCase):
         # Refresh the invoice
         self.invoice.refresh_from_db()
 
-        self.assertEqual(self.invoice.status, "Unpaid")
+        self.assertEqual(self.invoice.status, "unpaid")
         self.assertRedirects(response, reverse("admin_dashboard"))
 
         # Check success message
@@ -0,0 +1,115 @@
+import json
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from tutorials.models import StudentRequest, TutorRequest, LessonSchedule
+
+User = get_user_model()
+
+
+class PairBatchRequestsViewTest(TestCase):
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username="adminuser", email="adminuser@example.com", password="adminpass", role="admin"
+        )
+        self.student_requests = []
+        self.tutor_requests = []
+        for i in range(3):
+            student = User.objects.create_user(
+                username=f"student{i}", email=f"student{i}@example.com", password="studentpass", role="student"
+            )
+            tutor = User.objects.create_user(
+                username=f"tutor{i}", email=f"tutor{i}@example.com", password="tutorpass", role="tutor"
+            )
+            self.student_requests.append(StudentRequest.objects.create(
+                student=student, language="Python", status="pending", day_of_week="monday",
+                difficulty="beginner", preferred_time="10:00", frequency="weekly",
+            ))
+            self.tutor_requests.append(TutorRequest.objects.create(
+                tutor=tutor, languages="Python", status="available", day_of_week="monday",
+                level_can_teach="beginner", available_time="10:00",
+            ))
+        self.url = reverse("pair_batch_requests")
+
+    def _pairs(self):
+        return [
+            {"student_request_id": sr.id, "tutor_request_id": tr.id, "start_time": "10:00", "duration": 60}
+            for sr, tr in zip(self.student_requests, self.tutor_requests)
+        ]
+
+    def _post_json(self, pairs):
+        return self.client.post(self.url, json.dumps({"pairs": pairs}), content_type="application/json")
+
+    def test_forbidden_for_non_admin(self):
+        self.client.login(username="student0", password="studentpass")
+        response = self._post_json(self._pairs())
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(LessonSchedule.objects.count(), 0)
+
+    def test_json_batch_pairs_everything_in_few_queries(self):
+        self.client.login(username="adminuser", password="adminpass")
+        with self.assertNumQueries(18):
+            response = self._post_json(self._pairs())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["created"], 3)
+        self.assertEqual(LessonSchedule.objects.count(), 3)
+        self.assertFalse(StudentRequest.objects.filter(status="pending").exists())
+        self.assertFalse(TutorRequest.objects.filter(status="available").exists())
+
+    def test_invalid_row_rejects_whole_batch(self):
+        self.client.login(username="adminuser", password="adminpass")
+        pairs = self._pairs()
+        pairs[2]["tutor_request_id"] = self.tutor_requests[0].id
+        response = self._post_json(pairs)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"][0]["row"], 3)
+        self.assertEqual(LessonSchedule.objects.count(), 0)
+        self.assertEqual(StudentRequest.objects.filter(status="pending").count(), 3)
+
+    def test_overlapping_rows_are_rejected(self):
+        self.client.login(username="adminuser", password="adminpass")
+        second = StudentRequest.objects.create(
+            student=self.student_requests[0].student, language="Python", status="pending", day_of_week="monday",
+            difficulty="beginner", preferred_time="10:00", frequency="weekly",
+        )
+        pairs = self._pairs()[:2]
+        pairs[1]["student_request_id"] = second.id
+        response = self._post_json(pairs)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("overlaps", response.json()["errors"][0]["error"])
+        self.assertEqual(LessonSchedule.objects.count(), 0)
+
+    def test_malformed_json(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.post(self.url, "not json", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_pairs_must_be_a_list_of_objects(self):
+        self.client.login(username="adminuser", password="adminpass")
+        for pairs in [5, "1,2,10:00,60", {"student_request_id": 1}, [[1, 2, "10:00", 60]], None]:
+            with self.subTest(pairs=pairs):
+                response = self.client.post(self.url, json.dumps({"pairs": pairs}), content_type="application/json")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.json())
+        self.assertEqual(LessonSchedule.objects.count(), 0)
+
+    def test_form_batch(self):
+        self.client.login(username="adminuser", password="adminpass")
+        lines = "\n".join(
+            f"{sr.id}, {tr.id}, 1{i}:00, 30"
+            for i, (sr, tr) in enumerate(zip(self.student_requests, self.tutor_requests))
+        )
+        response = self.client.post(self.url, {"pairs": lines})
+        self.assertRedirects(response, reverse("admin_request_list"))
+        messages = list(get_messages(response.wsgi_request))
+        self.assertEqual(str(messages[0]), "Paired 3 requests.")
+        self.assertEqual(LessonSchedule.objects.filter(duration=30).count(), 3)
+
+    def test_form_batch_reports_bad_lines(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.post(self.url, {"pairs": "1, 2, noon, 60"})
+        messages = list(get_messages(response.wsgi_request))
+        self.assertTrue(str(messages[0]).startswith("Line 1:"))
+        self.assertEqual(LessonSchedule.objects.count(), 0)
@@ -1,8 +1,10 @@
+from datetime import time
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
-from tutorials.models import StudentRequest, TutorRequest, LessonSchedule
+from tutorials.models import StudentRequest, TutorRequest, LessonSchedule, LessonOccurrence
 
 User = get_user_model()
 
@@ -65,6 +67,16 @@ class PairRequestViewTest(TestCase):
             response, reverse("dashboard"), status_code=302, target_status_code=302
         )
 
+    # Test: Start time suggestions
+    def test_pair_request_suggests_free_start_times(self):
+        """Test that each candidate tutor lists start times free for both sides."""
+        cache.clear()
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.get(self.url)
+        candidate = response.context["tutor_requests"][0]
+        self.assertEqual(candidate.suggested_times, [time(10), time(10, 30), time(11)])
+        self.assertContains(response, "free at 10:00, 10:30, 11:00")
+
     # Test: Student request not in pending state
     def test_pair_request_invalid_student_status(self):
         """Test that pairing fails if the student request is not pending."""
@@ -127,3 +139,55 @@ class PairRequestViewTest(TestCase):
         self.assertEqual(str(lesson.start_time), "10:00:00")
         self.assertEqual(lesson.duration, 60)
         self.assertEqual(lesson.status, "scheduled")
+        self.assertTrue(LessonOccurrence.objects.filter(lesson=lesson).exists())
+
+    # Test: Double booking
+    def test_pair_request_rejects_overlapping_lesson(self):
+        """Test that pairing fails if the tutor is already booked at that time."""
+        other_student = User.objects.create_user(
+            username="otherstudent", email="otherstudent@example.com", password="studentpass", role="student"
+        )
+        LessonSchedule.objects.create(
+            tutor=self.tutor_user,
+            student=other_student,
+            subject="Python",
+            day_of_week="monday",
+            start_time="09:30",
+            duration=60,
+            frequency="weekly",
+            status="scheduled",
+        )
+        self.client.login(username="adminuser", password="adminpass")
+
+        response = self.client.post(self.url, {
+            "tutor_request_id": self.tutor_request.id,
+            "start_time": "10:00",
+            "duration": "60"
+        })
+
+        messages = list(get_messages(response.wsgi_request))
+        self.assertEqual(str(messages[0]), "This lesson overlaps with Python on monday at 09:30.")
+        self.assertRedirects(response, self.url, fetch_redirect_response=False)
+        self.assertEqual(LessonSchedule.objects.count(), 1)
+        self.student_request.refresh_from_db()
+        self.assertEqual(self.student_request.status, "pending")
+
+    # Test: Double submission
+    def test_resubmitted_form_pairs_once(self):
+        """Test that a retried or double-clicked submission creates one lesson."""
+        self.client.login(username="adminuser", password="adminpass")
+        key = self.client.get(self.url).context["idempotency_key"]
+        data = {
+            "tutor_request_id": self.tutor_request.id,
+            "start_time": "10:00",
+            "duration": "60",
+            "idempotency_key": key,
+        }
+
+        first = self.client.post(self.url, data)
+        second = self.client.post(self.url, data)
+
+        self.assertEqual(LessonSchedule.objects.count(), 1)
+        for response in (first, second):
+            messages = list(get_messages(response.wsgi_request))
+            self.assertEqual(str(messages[-1]), "Student and tutor paired successfully!")
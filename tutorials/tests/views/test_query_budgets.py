@@ -0,0 +1,178 @@
+"""Every named URL must stay within its query budget on a large dataset."""
+from datetime import date, time, timedelta
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import URLPattern, resolve, reverse
+from code_tutors import urls
+from tutorials.models import (
+    Feedback, Invoice, LessonSchedule, Request, Student, StudentRequest, Tutor, TutorLanguage, TutorRequest, User,
+)
+from tutorials.query_budget import budget_for, count_queries
+from tutorials.scheduling import sync_occurrences
+
+ROWS = 40
+DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# URL names visited as the student or tutor instead of the admin, or logged out.
+STUDENT_URLS = {"student_dashboard", "student_invoices", "student_requests", "submit_student_request",
+                "cancel_student_request", "cancel_lesson"}
+TUTOR_URLS = {"tutor_dashboard", "tutor_requests", "submit_tutor_request", "cancel_tutor_request"}
+ANONYMOUS_URLS = {"home", "log_in", "sign_up", "tutor_sign_up", "submit_feedback"}
+
+
+def seed(count):
+    """Create ``count`` rows of every kind around one admin, student and tutor."""
+    password = make_password("Password123")  # hashed once rather than once per user
+    admin = User.objects.create(
+        username="@admin", email="admin@example.com", password=password, role="admin",
+        first_name="Ada", last_name="Admin", is_staff=True, is_superuser=True,
+    )
+    students = User.objects.bulk_create(
+        [User(username="@student", email="student@example.com", password=password, role="student",
+              first_name="Sam", last_name="Student")]
+        + [
+            User(username=f"@student{i}", email=f"student{i}@example.com", password=password, role="student",
+                 first_name=f"Student{i}", last_name="Example")
+            for i in range(count)
+        ]
+    )
+    tutors = User.objects.bulk_create(
+        [User(username="@tutor", email="tutor@example.com", password=password, role="tutor",
+              first_name="Tia", last_name="Tutor")]
+        + [
+            User(username=f"@tutor{i}", email=f"tutor{i}@example.com", password=password, role="tutor",
+                 first_name=f"Tutor{i}", last_name="Example")
+            for i in range(count)
+        ]
+    )
+    student, tutor = students[0], tutors[0]
+    student_profiles = Student.objects.bulk_create([Student(user=user) for user in students])
+    tutor_profiles = Tutor.objects.bulk_create([Tutor(user=user) for user in tutors])
+
+    StudentRequest.objects.bulk_create(
+        StudentRequest(
+            student=students[i % 2 and i % len(students)], language="Python", frequency="weekly",
+            day_of_week="monday", preferred_time=time(9 + i % 8), difficulty="beginner", status="pending",
+        )
+        for i in range(count)
+    )
+    TutorRequest.objects.bulk_create(
+        TutorRequest(
+            tutor=tutors[i % 2 and i % len(tutors)], languages="Python, Java", day_of_week="monday",
+            available_time=time(8 + i % 10), level_can_teach="advanced", status="available",
+        )
+        for i in range(count)
+    )
+    TutorLanguage.rebuild(TutorRequest.objects.all())
+    lessons = LessonSchedule.objects.bulk_create(
+        LessonSchedule(
+            tutor=tutors[i % 2 and i % len(tutors)], student=students[i % 3 and i % len(students)],
+            subject="Python", day_of_week=DAYS[i % 7], start_time=time(i % 24), duration=45,
+            frequency="weekly", status="scheduled",
+        )
+        for i in range(count)
+    )
+    sync_occurrences(lessons)
+    Invoice.objects.bulk_create(
+        Invoice(
+            student=student_profiles[i % 2 and i % len(student_profiles)],
+            tutor=tutor_profiles[i % 2 and i % len(tutor_profiles)],
+            amount=50 + i, status="unpaid", due_date=date.today() + timedelta(days=i),
+        )
+        for i in range(count)
+    )
+    Feedback.objects.bulk_create(
+        Feedback(user=students[i % len(students)], name=f"Person {i}", email=f"person{i}@example.com",
+                 message="Great lessons.")
+        for i in range(count)
+    )
+    Request.objects.bulk_create(Request(student=student, type="Python") for _ in range(count))
+    return admin, student, tutor
+
+
+class QueryBudgetTestCase(TestCase):
+    """Visit every named URL and compare its query count with its declared budget."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin, cls.student, cls.tutor = seed(ROWS)
+
+    def setUp(self):
+        cache.clear()
+
+    def _kwargs(self, pattern):
+        """URL arguments pointing at rows the visiting user may see."""
+        values = {
+            "invoice_id": Invoice.objects.filter(student__user=self.student).values_list("id", flat=True).first(),
+            "pk": LessonSchedule.objects.values_list("id", flat=True).first(),
+            "lesson_id": LessonSchedule.objects.filter(student=self.student).values_list("id", flat=True).first(),
+            "student_request_id": StudentRequest.objects.filter(student=self.student).values_list("id", flat=True).first(),
+            "tutor_request_id": 0,
+            "table": "invoices",
+            "name": "unmatched-0.csv",
+        }
+        if pattern.name == "cancel_student_request":
+            values["request_id"] = StudentRequest.objects.filter(student=self.student).values_list("id", flat=True).first()
+        elif pattern.name == "cancel_tutor_request":
+            values["request_id"] = TutorRequest.objects.filter(tutor=self.tutor).values_list("id", flat=True).first()
+        return {name: values[name] for name in pattern.pattern.converters}
+
+    def _user(self, name):
+        if name in ANONYMOUS_URLS:
+            return None
+        if name in STUDENT_URLS:
+            return self.student
+        if name in TUTOR_URLS:
+            return self.tutor
+        return self.admin
+
+    def test_every_named_url_is_within_budget(self):
+        patterns = [pattern for pattern in urls.urlpatterns if isinstance(pattern, URLPattern) and pattern.name]
+        self.assertGreater(len(patterns), 20)
+        for pattern in patterns:
+            with self.subTest(url=pattern.name):
+                user = self._user(pattern.name)
+                if user is None:
+                    self.client.logout()
+                else:
+                    self.client.force_login(user)
+                url = reverse(pattern.name, kwargs=self._kwargs(pattern))
+                with count_queries() as counter:
+                    response = self.client.get(url)
+                self.assertLess(response.status_code, 500)
+                budget = budget_for(pattern.callback)
+                self.assertLessEqual(
+                    counter.count, budget,
+                    f"{pattern.name} made {counter.count} queries, over its budget of {budget}",
+                )
+
+
+@override_settings(DEBUG=True)
+class QueryBudgetMiddlewareTestCase(TestCase):
+    """The development middleware reports query counts and flags overruns."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="@student", email="student@example.com", password="Password123", role="student"
+        )
+        self.client.force_login(self.user)
+
+    def test_response_reports_query_count(self):
+        response = self.client.get(reverse("student_requests"))
+        self.assertGreater(int(response["X-Query-Count"]), 0)
+        self.assertNotIn("X-Query-Budget-Exceeded", response)
+
+    def test_overrun_is_logged_and_flagged(self):
+        callback = resolve(reverse("student_requests")).func
+        original = getattr(callback, "query_budget", None)
+        callback.query_budget = 1
+        try:
+            with self.assertLogs("tutorials.query_budget", level="WARNING"):
+                response = self.client.get(reverse("student_requests"))
+        finally:
+            if original is None:
+                del callback.query_budget
+            else:
+                callback.query_budget = original
+        self.assertIn("X-Query-Budget-Exceeded", response)
@@ -0,0 +1,83 @@
+"""The main query of each list view must be served by a composite index."""
+from unittest import skipUnless
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from tutorials.models import StudentRequest
+from tutorials.reminders import overdue_invoices
+from tutorials.tests.views.test_query_budgets import ROWS, seed
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite specific")
+class QueryPlanTestCase(TestCase):
+    """Each test EXPLAINs the SQL a view really runs, captured around client.get()."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin, cls.student, cls.tutor = seed(ROWS)
+
+    def _plan(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return "\n".join(row[-1] for row in cursor.fetchall())
+
+    def view_plan(self, user, url, table):
+        """Return the query plan of the first query the view runs against ``table``."""
+        cache.clear()  # cached page fragments would skip the queries
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        queries = [query["sql"] for query in context.captured_queries if f'FROM "{table}"' in query["sql"]]
+        self.assertTrue(queries, f"{url} ran no query against {table}")
+        return self._plan(queries[0])
+
+    def assertUsesIndex(self, plan, index_name):
+        self.assertRegex(plan, rf"USING (COVERING )?INDEX {index_name}\b", plan)
+        self.assertNotIn("USE TEMP B-TREE FOR ORDER BY", plan)
+
+    def test_student_requests(self):
+        plan = self.view_plan(self.student, reverse("student_requests"), "tutorials_studentrequest")
+        self.assertUsesIndex(plan, "studentrequest_student_idx")
+
+    def test_admin_request_list(self):
+        plan = self.view_plan(self.admin, reverse("admin_request_list"), "tutorials_studentrequest")
+        self.assertUsesIndex(plan, "studentrequest_status_idx")
+
+    def test_student_dashboard(self):
+        plan = self.view_plan(self.student, reverse("student_dashboard"), "tutorials_lessonschedule")
+        self.assertUsesIndex(plan, "lesson_student_start_idx")
+
+    def test_tutor_dashboard(self):
+        plan = self.view_plan(self.tutor, reverse("tutor_dashboard"), "tutorials_lessonschedule")
+        self.assertUsesIndex(plan, "lesson_tutor_start_idx")
+
+    def test_tutor_requests(self):
+        plan = self.view_plan(self.tutor, reverse("tutor_requests"), "tutorials_tutorrequest")
+        self.assertUsesIndex(plan, "tutorrequest_tutor_status_idx")
+
+    def test_pair_request_slots(self):
+        student_request = StudentRequest.objects.filter(student=self.student, status="pending").first()
+        url = reverse("pair_request", args=[student_request.id, 0])
+        self.assertUsesIndex(self.view_plan(self.admin, url, "tutorials_tutorrequest"), "tutorlanguage_lookup_idx")
+
+    def test_student_invoices(self):
+        plan = self.view_plan(self.student, reverse("student_invoices"), "tutorials_invoice")
+        self.assertUsesIndex(plan, "invoice_student_due_date_idx")
+
+    def test_admin_invoices(self):
+        plan = self.view_plan(self.admin, reverse("admin_invoices"), "tutorials_invoice")
+        self.assertUsesIndex(plan, "invoice_created_at_idx")
+
+    def test_revenue_series(self):
+        plan = self.view_plan(self.admin, reverse("revenue_series"), "tutorials_invoice")
+        self.assertUsesIndex(plan, "invoice_due_date_status_idx")
+
+    def test_overdue_invoice_scan(self):
+        self.assertUsesIndex(overdue_invoices().explain(), "invoice_unpaid_due_idx")
+
+    def test_admin_feedback(self):
+        plan = self.view_plan(self.admin, reverse("admin_feedback"), "tutorials_feedback")
+        self.assertUsesIndex(plan, "feedback_posted_idx")
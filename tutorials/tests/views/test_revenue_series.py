@@ -0,0 +1,73 @@
+from datetime import date
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from tutorials.models import Invoice, Student, Tutor
+
+User = get_user_model()
+
+
+class RevenueSeriesViewTest(TestCase):
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username="adminuser", email="adminuser@example.com", password="adminpass", role="admin"
+        )
+        student_user = User.objects.create_user(
+            username="studentuser", email="studentuser@example.com", password="studentpass", role="student"
+        )
+        tutor_user = User.objects.create_user(
+            username="tutoruser", email="tutoruser@example.com", password="tutorpass", role="tutor"
+        )
+        student = Student.objects.create(user=student_user)
+        tutor = Tutor.objects.create(user=tutor_user)
+        for amount, due_date, status in [
+            (100, date(2024, 1, 15), "paid"),
+            (50, date(2024, 1, 31), "Paid"),
+            (30, date(2024, 3, 1), "unpaid"),
+            (999, date(2025, 1, 10), "paid"),  # same month, different year
+        ]:
+            Invoice.objects.create(student=student, tutor=tutor, amount=amount, due_date=due_date, status=status)
+        self.url = reverse("revenue_series")
+
+    def test_forbidden_for_non_admin(self):
+        self.client.login(username="studentuser", password="studentpass")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_series_by_month_and_status(self):
+        self.client.login(username="adminuser", password="adminpass")
+        response = self.client.get(self.url, {"start": "2024-01-01", "end": "2024-04-01"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            "start": "2024-01-01",
+            "end": "2024-04-01",
+            "months": ["2024-01", "2024-02", "2024-03"],
+            "series": {
+                "paid": {"total": [150.0, 0.0, 0.0], "invoices": [2, 0, 0]},
+                "unpaid": {"total": [0.0, 0.0, 30.0], "invoices": [0, 0, 1]},
+            },
+        })
+
+    def test_default_range_is_last_twelve_months(self):
+        self.client.login(username="adminuser", password="adminpass")
+        data = self.client.get(self.url).json()
+        self.assertEqual(len(data["months"]), 12)
+        self.assertEqual(data["months"][-1], date.today().strftime("%Y-%m"))
+
+    def test_invalid_ranges_are_rejected(self):
+        self.client.login(username="adminuser", password="adminpass")
+        for params in ({"start": "yesterday"}, {"start": "2024-02-30"},
+                       {"start": "2024-03-01", "end": "2024-01-01"}, {"start": "2000-01-01", "end": "2024-01-01"}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, 400)
+
+    def test_range_query_uses_due_date_index(self):
+        sql, params = Invoice.objects.filter(
+            due_date__gte=date(2024, 1, 1), due_date__lt=date(2024, 4, 1)
+        ).values("status").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn("invoice_due_date_status_idx", plan)
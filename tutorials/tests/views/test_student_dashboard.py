@@ -1,9 +1,12 @@
 # tutorials/tests/views/test_student_dashboard.py
 
+from django.core.cache import cache
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from tutorials.models import LessonSchedule, Student, Tutor
+from tutorials.scheduling import DAYS, sync_occurrences
+from datetime import time, timedelta
 from django.utils import timezone
 
 User = get_user_model()
@@ -11,6 +14,7 @@ User = get_user_model()
 class StudentDashboardViewTest(TestCase):
 
     def setUp(self):
+        cache.clear()  # table fragments cached by earlier tests may belong to a user with the same id
         self.client = Client()
 
         # Create a student user
@@ -67,3 +71,25 @@ class StudentDashboardViewTest(TestCase):
         self.assertEqual(lessons.count(), 2)
         self.assertContains(response, "Python")
         self.assertContains(response, "C++")
+
+
+    def test_dashboard_shows_next_lesson(self):
+        """Ensure the next materialised occurrence is shown."""
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        lesson = LessonSchedule.objects.create(
+            student=self.student.user,
+            tutor=self.tutor_user,
+            subject="Scala",
+            day_of_week=DAYS[tomorrow.weekday()],
+            start_time=time(9, 30),
+            duration=60,
+            frequency="weekly",
+            status="scheduled",
+        )
+        sync_occurrences([lesson])
+        self.client.login(username="@teststudent", password="testpassword")
+        response = self.client.get(self.url)
+        next_lesson = response.context["next_lesson"]
+        self.assertEqual(next_lesson.lesson, lesson)
+        self.assertEqual(next_lesson.date, tomorrow)
+        self.assertContains(response, "Next lesson: <strong>Scala</strong>")
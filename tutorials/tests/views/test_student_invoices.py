@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from tutorials.models import Student, Tutor, Invoice
@@ -7,6 +8,7 @@ User = get_user_model()
 
 class StudentInvoicesViewTest(TestCase):
     def setUp(self):
+        cache.clear()  # table fragments cached by earlier tests may belong to a user with the same id
         # Ensure unique emails and usernames
         self.student_user = User.objects.create_user(
             username="student_test",
@@ -45,3 +47,10 @@ class StudentInvoicesViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "unpaid")
         self.assertTemplateUsed(response, "student_invoices.html")
+
+    def test_student_invoices_shows_outstanding_balance(self):
+        Invoice.objects.create(student=self.student, tutor=self.tutor, amount=25, status="paid", due_date=date.today())
+        self.client.login(username="student_test", password="testpass123")
+        response = self.client.get("/student/invoices/")
+        self.assertEqual(response.context["outstanding"], 100)
+        self.assertContains(response, "Outstanding: <strong>$100.00</strong>")
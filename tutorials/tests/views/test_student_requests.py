@@ -1,5 +1,6 @@
 # tutorials/tests/views/test_student_requests.py
 
+from django.core.cache import cache
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
@@ -12,6 +13,7 @@ User = get_user_model()
 class StudentRequestsViewTest(TestCase):
 
     def setUp(self):
+        cache.clear()  # table fragments cached by earlier tests may belong to a user with the same id
         # Create a student user
         self.client = Client()
         self.user = User.objects.create_user(
@@ -0,0 +1,80 @@
+from datetime import date, time
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from tutorials.models import Invoice, LessonSchedule, Student, StudentRequest, Tutor
+
+User = get_user_model()
+
+
+class TableRowsViewTest(TestCase):
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username="adminuser", email="adminuser@example.com", password="adminpass", role="admin"
+        )
+        student_user = User.objects.create_user(
+            username="studentuser", email="studentuser@example.com", password="studentpass", role="student",
+            first_name="Sam", last_name="Student",
+        )
+        tutor_user = User.objects.create_user(
+            username="tutoruser", email="tutoruser@example.com", password="tutorpass", role="tutor",
+            first_name="Tia", last_name="Tutor",
+        )
+        student = Student.objects.create(user=student_user)
+        tutor = Tutor.objects.create(user=tutor_user)
+        for day, status in [(5, "unpaid"), (1, "paid"), (3, "Paid"), (2, "unpaid")]:
+            Invoice.objects.create(student=student, tutor=tutor, amount=day * 10, due_date=date(2024, 1, day), status=status)
+        for language, status in [("Python", "pending"), ("Java", "pending"), ("Python", "approved")]:
+            StudentRequest.objects.create(
+                student=student_user, language=language, frequency="weekly", day_of_week="monday", status=status,
+            )
+        LessonSchedule.objects.create(
+            tutor=tutor_user, student=student_user, subject="Python", day_of_week="monday",
+            start_time=time(10), duration=60, frequency="weekly", status="scheduled",
+        )
+        self.client.login(username="adminuser", password="adminpass")
+
+    def _get(self, table, **params):
+        return self.client.get(reverse("table_rows", args=[table]), params)
+
+    def test_forbidden_for_non_admin(self):
+        self.client.login(username="studentuser", password="studentpass")
+        self.assertEqual(self._get("invoices").status_code, 403)
+
+    def test_default_page_is_newest_first(self):
+        data = self._get("invoices").json()
+        self.assertEqual(data["sort"], "-id")
+        self.assertEqual([row["amount"] for row in data["rows"]], ["20.00", "30.00", "10.00", "50.00"])
+        self.assertEqual(data["rows"][0]["student"], "Sam Student")
+        self.assertIsNone(data["next_cursor"])
+
+    def test_sort_and_cursor(self):
+        data = self._get("invoices", sort="due_date", limit=3).json()
+        self.assertEqual([row["due_date"] for row in data["rows"]], ["2024-01-01", "2024-01-02", "2024-01-03"])
+        data = self._get("invoices", sort="due_date", limit=3, cursor=data["next_cursor"]).json()
+        self.assertEqual([row["due_date"] for row in data["rows"]], ["2024-01-05"])
+        self.assertIsNone(data["next_cursor"])
+
+    def test_filters(self):
+        data = self._get("student_requests", language="Python", status="pending").json()
+        self.assertEqual(len(data["rows"]), 1)
+        data = self._get("invoices", status="paid").json()
+        self.assertEqual([row["status"] for row in data["rows"]], ["paid", "paid"])
+
+    def test_lessons(self):
+        data = self._get("lessons").json()
+        self.assertEqual(data["rows"][0]["tutor"], "Tia Tutor")
+        self.assertEqual(data["rows"][0]["start_time"], "10:00:00")
+
+    def test_page_is_one_query_after_authentication(self):
+        with self.assertNumQueries(3):  # session, user and the page
+            self._get("invoices", sort="-created_at", limit=2)
+
+    def test_rejects_bad_parameters(self):
+        self.assertEqual(self._get("users").status_code, 404)
+        self.assertEqual(self._get("invoices", sort="student__user__password").status_code, 400)
+        self.assertEqual(self._get("invoices", limit="many").status_code, 400)
+        self.assertEqual(self._get("invoices", cursor="garbage").status_code, 400)
+        cursor = self._get("invoices", sort="amount", limit=1).json()["next_cursor"]
+        self.assertEqual(self._get("invoices", sort="due_date", cursor=cursor).status_code, 400)
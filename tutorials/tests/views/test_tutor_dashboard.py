@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -9,6 +10,7 @@ User = get_user_model()
 class TutorDashboardViewTest(TestCase):
 
     def setUp(self):
+        cache.clear()  # table fragments cached by earlier tests may belong to a user with the same id
         # Create a test user and tutor profile
         self.tutor_user = User.objects.create_user(
             username="tutortest", email="tutor@example.com", password="testpassword"
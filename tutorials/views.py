@@ -3,7 +3,7 @@ from django.contrib import messages
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied, ValidationError
 from django.shortcuts import redirect, render, get_object_or_404
 from django.views import View
 from django.views.generic.edit import FormView, UpdateView
@@ -14,13 +14,36 @@ from tutorials.forms import TutorSignUpForm
 from django.contrib.auth.decorators import user_passes_test
 
 
-from .models import Request, Tutor, Invoice, Student, LessonSchedule, StudentRequest, TutorRequest, Feedback
-from django.db import models
-from django.db.models import Sum
+from .models import Request, Tutor, Invoice, InvoiceLine, Student, StudentBalance, LessonSchedule, LessonOccurrence, StudentRequest, TutorRequest, Feedback, IdempotencyKey
+from django.db import models, transaction
 
 from .forms import LessonScheduleForm, StudentRequestForm, TutorRequestForm
-from django.http import HttpResponseRedirect, HttpResponseForbidden, HttpResponseNotFound
+from . import fragments
+from .exports import EXPORT_FORMATS, stream_export
+from .filters import dashboard_filters, student_requests as filter_student_requests, tutor_requests as filter_tutor_requests
+from .analytics import MAX_SERIES_MONTHS, add_months, month_start, revenue_series as analytics_revenue_series, summary as analytics_summary
+from .availability import suggest_start_times, warm as warm_availability
+from .billing import delete_invoices, set_invoice_status
+from .jobs import enqueue
+from .matching import (
+    DEFAULT_DURATION, INLINE_GROUP_LIMIT, GroupTooLargeError, auto_pair, rematch_cancelled_lesson, reopen_slot,
+)
+from .pagination import PAGE_SIZE, decode_cursor, keyset_page, parse_cursor, sorted_keyset_page
+from .pairing import BatchPairingError, PairingError, pair_batch, pair_requests
+from .payments import PaymentImportError, import_payments as import_payment_statement
+from .query_budget import query_budget
+from .scheduling import sync_occurrences
+from .search import search_feedback
+from .tables import TABLES
+from django.http import FileResponse, HttpResponseBadRequest, HttpResponseRedirect, HttpResponseForbidden, HttpResponseNotFound, JsonResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_date, parse_time
 from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
+import io
+import json
+import re
 
 
 
@@ -40,8 +63,9 @@ def admin_required(view_func):
 @login_required
 def student_dashboard(request):
     student = request.user
-    lessons = LessonSchedule.objects.filter(student=student).order_by('start_time')
-    context = {"lessons": lessons}
+    lessons = LessonSchedule.objects.filter(student=student).select_related('tutor').order_by('start_time')
+    next_lesson = LessonOccurrence.objects.filter(student=student).upcoming().select_related('lesson').first()
+    context = {"lessons": lessons, "next_lesson": next_lesson, **fragments.context(fragments.LESSONS, student.id)}
     return render(request, "student_dashboard.html", context)
 
 
@@ -51,7 +75,7 @@ def student_requests(request):
     student = request.user
     # Query student requests
     student_requests = StudentRequest.objects.filter(student=student).order_by('-created_at')
-    context = {"student_requests": student_requests}
+    context = {"student_requests": student_requests, **fragments.context(fragments.REQUESTS, student.id)}
     return render(request, "student_requests.html", context)
 
 
@@ -66,18 +90,27 @@ def student_invoices(request):
         messages.error(request, "You are not registered as a student.")
         return redirect("home")
 
-    invoices = Invoice.objects.filter(student=student_profile).order_by("-due_date")
+    invoices = Invoice.objects.filter(student=student_profile).select_related("tutor__user").order_by("-due_date")
+    # One indexed row, kept current by the invoice rollups, instead of a sum over every invoice.
+    outstanding = StudentBalance.objects.filter(student=student_profile).values_list("outstanding", flat=True).first()
 
-    context = {"invoices": invoices}
+    context = {
+        "invoices": invoices,
+        "outstanding": outstanding or Decimal("0.00"),
+        **fragments.context(fragments.INVOICES, student_profile.id),
+    }
     return render(request, "student_invoices.html", context)
 
 
 
+@query_budget(5)
 @login_required
 def tutor_dashboard(request):
     """Tutor Dashboard showing allocated lessons."""
-    lessons = LessonSchedule.objects.filter(tutor=request.user).order_by('start_time')
-    context = {'lessons': lessons, 'tutor_name': request.user.get_full_name() }
+    lessons = LessonSchedule.objects.filter(tutor=request.user).select_related('student').order_by('start_time')
+    next_lesson = LessonOccurrence.objects.filter(tutor=request.user).upcoming().select_related('lesson').first()
+    context = {'lessons': lessons, 'next_lesson': next_lesson, 'tutor_name': request.user.get_full_name(),
+               **fragments.context(fragments.LESSONS, request.user.id)}
     return render(request, 'tutor_dashboard.html', context)
 
 
@@ -86,41 +119,35 @@ def tutor_dashboard(request):
 def tutor_requests(request):
     """Tutor Requests page."""
     tutor_requests = TutorRequest.objects.filter(tutor=request.user).order_by('-status')
-    context = {'tutor_requests': tutor_requests}
+    context = {'tutor_requests': tutor_requests, **fragments.context(fragments.REQUESTS, request.user.id)}
     return render(request, 'tutor_requests.html', context)
 
 
 
 
+@query_budget(10)
 @login_required
 @user_passes_test(lambda user: user.is_superuser)
 def admin_dashboard(request):
     """Admin Dashboard showing requests and lesson scheduling."""
-    filters = {
-        "language": request.GET.get("language", ""),
-        "status": request.GET.get("status", ""),
-    }
-
-    student_requests = StudentRequest.objects.all()
-    tutor_requests = TutorRequest.objects.all()
+    filters = dashboard_filters(request.GET)
+    student_requests = filter_student_requests(StudentRequest.objects.select_related('student'), filters)
+    tutor_requests = filter_tutor_requests(TutorRequest.objects.select_related('tutor'), filters)
 
-    if filters["language"]:
-        student_requests = student_requests.filter(language=filters["language"])
-    if filters["status"] and filters["status"] in ["pending", "approved"]:
-        student_requests = student_requests.filter(status=filters["status"])
+    lessons = LessonSchedule.objects.select_related('tutor', 'student')
 
-    if filters["language"]:
-        tutor_requests = tutor_requests.filter(languages__icontains=filters["language"])
-    if filters["status"] and filters["status"] in ["available", "scheduled"]:
-        tutor_requests = tutor_requests.filter(status=filters["status"])
-
-
-    lessons = LessonSchedule.objects.all()
+    # Each table pages independently through its own cursor.
+    student_requests, student_cursor = keyset_page(student_requests, parse_cursor(request.GET.get("student_cursor")))
+    tutor_requests, tutor_cursor = keyset_page(tutor_requests, parse_cursor(request.GET.get("tutor_cursor")))
+    lessons, lesson_cursor = keyset_page(lessons, parse_cursor(request.GET.get("lesson_cursor")))
     context = {
         'student_requests': student_requests,
         'tutor_requests': tutor_requests,
         'lessons': lessons,
         'filters': filters,
+        'student_cursor': student_cursor,
+        'tutor_cursor': tutor_cursor,
+        'lesson_cursor': lesson_cursor,
     }
     return render(request, 'admin_dashboard.html', context)
 
@@ -130,7 +157,7 @@ def admin_dashboard(request):
 def admin_invoices(request):
     """Admin view for invoices."""
     tutors = Tutor.objects.select_related('user')
-    invoices = Invoice.objects.select_related('student', 'tutor__user').order_by('-created_at')
+    invoices = Invoice.objects.select_related('student__user', 'student__balance', 'tutor__user').order_by('-created_at')
     students = Student.objects.select_related('user')
     
     context = {
@@ -150,43 +177,165 @@ def admin_feedback(request):
     return render(request, 'admin_feedback.html', context)
 
 
+@query_budget(4)
+@login_required
+@admin_required
+def feedback_search(request):
+    """Feedback matching ?q=, best match first, one page (?page=) at a time."""
+    query = request.GET.get('q', '').strip()
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    feedbacks, has_next = search_feedback(query, page)
+    context = {
+        'feedbacks': feedbacks,
+        'query': query,
+        'page': page,
+        'next_page': page + 1 if has_next else None,
+        'previous_page': page - 1 if page > 1 else None,
+    }
+    return render(request, 'admin_feedback.html', context)
+
+
+@query_budget(4)
 @login_required
 def admin_analytics(request):
     """Admin view for analytics."""
-    
-    # Tutor and student data
-    tutors = Tutor.objects.select_related('user')
-    students = Student.objects.select_related('user')
+    context = {'analytics': analytics_summary()}
+    return render(request, 'admin_analytics.html', context)
 
-    # Feedback analytics
-    feedbacks = Feedback.objects.all().order_by('-posted')
-
-    # Invoices analytics
-    invoices = Invoice.objects.select_related('student', 'tutor__user').order_by('-created_at')
-    total_revenue = invoices.aggregate(total_revenue=Sum('amount'))['total_revenue'] or 0
-    monthly_revenue = invoices.filter(due_date__month=date.today().month).aggregate(
-        monthly_revenue=Sum('amount'))['monthly_revenue'] or 0
-
-    # Lesson and request analytics
-    lessons = LessonSchedule.objects.all()
-    pending_requests = StudentRequest.objects.filter(status='pending').count()
-
-
-    # Analytics summary
-    analytics = {
-        "total_tutors": tutors.count(),
-        "total_students": students.count(),
-        "active_tutors": tutors.filter(user__is_active=True).count(),
-        "active_students": students.filter(user__is_active=True).count(),
-        "hours_taught": lessons.aggregate(total_hours=Sum('duration'))['total_hours'] or 0,
-        "total_feedback": feedbacks.count(),
-        "total_revenue": total_revenue,
-        "monthly_revenue": monthly_revenue,
-        "pending_requests": pending_requests,
-    }
 
-    context = {'analytics': analytics}
-    return render(request, 'admin_analytics.html', context)
+@query_budget(4)
+@login_required
+@admin_required
+def revenue_series(request):
+    """Monthly revenue per invoice status between ?start= and ?end= (ISO dates), as chart-ready JSON.
+
+    Defaults to the twelve months up to and including the current one.
+    """
+    end = add_months(month_start(date.today()), 1)
+    start = add_months(end, -12)
+    try:
+        start = parse_date(request.GET['start']) if request.GET.get('start') else start
+        end = parse_date(request.GET['end']) if request.GET.get('end') else end
+    except ValueError:
+        start = None
+    if start is None or end is None:
+        return JsonResponse({'error': 'start and end must be dates in YYYY-MM-DD format.'}, status=400)
+    if not start < end <= add_months(start, MAX_SERIES_MONTHS):
+        return JsonResponse(
+            {'error': f'end must be after start and at most {MAX_SERIES_MONTHS} months later.'}, status=400
+        )
+    return JsonResponse(analytics_revenue_series(start, end))
+
+
+@login_required
+@admin_required
+def export_table(request, table):
+    """Stream an admin table as ?format=csv (the default) or ndjson, filtered like the dashboard."""
+    if table not in TABLES:
+        return HttpResponseNotFound(f"There is no {table} export.")
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest(f"format must be one of {', '.join(EXPORT_FORMATS)}.")
+    content_type, _ = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(
+        stream_export(table, export_format, dashboard_filters(request.GET)), content_type=content_type
+    )
+    response['Content-Disposition'] = f'attachment; filename="{table}.{export_format}"'
+    return response
+
+
+PAYMENT_REPORT_NAME = re.compile(r"unmatched-[0-9a-f]{32}\.csv")
+
+
+@login_required
+@admin_required
+def import_payments(request):
+    """Upload a bank statement CSV and mark the invoices it pays as paid.
+
+    The upload is streamed row by row; payments that match no unpaid
+    invoice are written to a report in PAYMENT_REPORT_DIR to download.
+    """
+    if request.method == 'POST':
+        statement = request.FILES.get('statement')
+        if statement is None:
+            messages.error(request, "Choose a statement file to upload.")
+            return redirect('import_payments')
+        report_dir = Path(settings.PAYMENT_REPORT_DIR)
+        report_dir.mkdir(parents=True, exist_ok=True)
+        report_name = f"unmatched-{uuid4().hex}.csv"
+        try:
+            with open(report_dir / report_name, 'w', newline='', encoding='utf-8') as report:
+                result = import_payment_statement(
+                    io.TextIOWrapper(statement.file, encoding='utf-8-sig', newline=''), report
+                )
+        except PaymentImportError as error:
+            messages.error(request, str(error))
+        except UnicodeDecodeError:
+            messages.error(request, "The statement must be a UTF-8 CSV file.")
+        else:
+            messages.success(request, f"Marked {result.paid} invoices paid from {result.rows} payments.")
+            return render(request, 'import_payments.html', {'result': result, 'report_name': report_name})
+        (report_dir / report_name).unlink(missing_ok=True)
+        return redirect('import_payments')
+    return render(request, 'import_payments.html')
+
+
+@login_required
+@admin_required
+def payment_report(request, name):
+    """Download the unmatched payments report of a statement upload."""
+    path = Path(settings.PAYMENT_REPORT_DIR) / name
+    if not PAYMENT_REPORT_NAME.fullmatch(name) or not path.is_file():
+        return HttpResponseNotFound("There is no such report.")
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=name, content_type='text/csv')
+
+
+MAX_TABLE_PAGE_SIZE = 100
+
+
+@query_budget(4)
+@login_required
+@admin_required
+def table_rows(request, table):
+    """One page of an admin table as JSON, for tables that load rows as they scroll.
+
+    Takes the dashboard filters, ?sort= (a sort key of the table, "-" for
+    descending, default "-id"), ?limit= (at most MAX_TABLE_PAGE_SIZE) and
+    the ?cursor= returned as next_cursor by the previous page.
+    """
+    if table not in TABLES:
+        return JsonResponse({'error': f'There is no {table} table.'}, status=404)
+    definition = TABLES[table]
+    sort = request.GET.get('sort', '-id')
+    if sort.lstrip('-') not in definition.sorts:
+        return JsonResponse(
+            {'error': f'sort must be one of {", ".join(definition.sorts)}, optionally prefixed with "-".'}, status=400
+        )
+    try:
+        limit = min(max(int(request.GET.get('limit', PAGE_SIZE)), 1), MAX_TABLE_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({'error': 'limit must be a number.'}, status=400)
+    cursor = None
+    if request.GET.get('cursor'):
+        cursor = decode_cursor(request.GET['cursor'])
+        if cursor is None:
+            return JsonResponse({'error': 'cursor is not valid.'}, status=400)
+
+    queryset = definition.filter(definition.queryset(), dashboard_filters(request.GET))
+    try:
+        rows, next_cursor = sorted_keyset_page(queryset, sort, cursor, limit)
+    except (TypeError, ValueError, ValidationError):
+        return JsonResponse({'error': 'cursor does not match the sort.'}, status=400)
+    headers = [header for header, _ in definition.columns]
+    return JsonResponse({
+        'table': table,
+        'sort': sort,
+        'rows': [dict(zip(headers, [getter(row) for _, getter in definition.columns])) for row in rows],
+        'next_cursor': next_cursor,
+    })
 
 
 @login_required
@@ -201,46 +350,82 @@ def create_invoice(request):
         # Validate required fields
         if not student_id or not tutor_id:
             messages.error(request, "Both student and tutor are required.")
-            students = Student.objects.all()
-            tutors = Tutor.objects.all()
+            students = Student.objects.select_related("user")
+            tutors = Tutor.objects.select_related("user")
             return render(
                 request, "create_invoice.html", {"students": students, "tutors": tutors}
             )
 
-        # Create the invoice
-        Invoice.objects.create(
-            student=get_object_or_404(Student, id=student_id),
-            tutor=get_object_or_404(Tutor, id=tutor_id),
-            amount=amount,
-            due_date=due_date,
-        )
+        # Create the invoice with a single line; its signals update the student's balance in the same transaction
+        with transaction.atomic():
+            invoice = Invoice.objects.create(
+                student=get_object_or_404(Student, id=student_id),
+                tutor=get_object_or_404(Tutor, id=tutor_id),
+                amount=amount,
+                due_date=due_date,
+            )
+            InvoiceLine.objects.create(invoice=invoice, description="Tuition", unit_price=amount, amount=amount)
 
         messages.success(request, "Invoice created successfully!")
         return redirect("create_invoice")
 
-    students = Student.objects.all()  # Ensure all students are fetched
-    tutors = Tutor.objects.all()
+    students = Student.objects.select_related("user")  # Ensure all students are fetched
+    tutors = Tutor.objects.select_related("user")
     return render(request, "create_invoice.html", {"students": students, "tutors": tutors})
 
 
+@query_budget(15)  # the stored row read for its rollup contribution, the update and, at worst, new rollup rows
 @login_required
 def mark_paid(request, invoice_id):
     """Mark an invoice as paid."""
-    invoice = get_object_or_404(Invoice, id=invoice_id)
-    if invoice.status == 'Paid':
-        invoice.status = 'Unpaid'
-        messages.success(request, f"Invoice {invoice.id} marked as Unpaid.")
-    else:
-        invoice.status = 'Paid'
-        messages.success(request, f"Invoice {invoice.id} marked as paid.")
-    invoice.save()
+    with transaction.atomic():
+        invoice = get_object_or_404(Invoice.objects.select_for_update(), id=invoice_id)
+        if invoice.status == 'paid':
+            invoice.status = 'unpaid'
+            messages.success(request, f"Invoice {invoice.id} marked as Unpaid.")
+        else:
+            invoice.status = 'paid'
+            messages.success(request, f"Invoice {invoice.id} marked as paid.")
+        invoice.save()
     return redirect('admin_dashboard')
 
 
+# bulk action -> status it sets, or None for deletion
+BULK_INVOICE_ACTIONS = {"mark_paid": "paid", "mark_unpaid": "unpaid", "delete": None}
+
+
+@login_required
+@admin_required
+def bulk_invoice_action(request):
+    """Mark paid, mark unpaid or delete every invoice ticked on the invoices page at once.
+
+    Each action is a single set-based UPDATE or DELETE over the selected
+    IDs; the message reports how many invoices it changed.
+    """
+    if request.method != "POST":
+        return redirect("admin_invoices")
+    action = request.POST.get("action")
+    invoice_ids = [value for value in request.POST.getlist("invoice_ids") if value.isdigit()]
+    if action not in BULK_INVOICE_ACTIONS:
+        messages.error(request, "Unknown invoice action.")
+    elif not invoice_ids:
+        messages.error(request, "Select at least one invoice.")
+    elif action == "delete":
+        deleted = delete_invoices(invoice_ids)
+        messages.success(request, f"Deleted {deleted} of {len(invoice_ids)} selected invoices.")
+    else:
+        status = BULK_INVOICE_ACTIONS[action]
+        changed = set_invoice_status(invoice_ids, status)
+        messages.success(request, f"Marked {changed} of {len(invoice_ids)} selected invoices as {status}.")
+    return redirect("admin_invoices")
+
+
 @login_required
 def view_invoice(request, invoice_id):
     """View the details of an invoice."""
-    invoice = get_object_or_404(Invoice, id=invoice_id)
+    invoice = get_object_or_404(
+        Invoice.objects.select_related('student__user').prefetch_related('lines'), id=invoice_id
+    )
     return render(request, 'view_invoice.html', {'invoice': invoice})
 
 
@@ -300,8 +485,9 @@ class LoginProhibitedMixin:
 @login_required
 @admin_required
 def delete_invoice(request, invoice_id):
-    invoice = get_object_or_404(Invoice, pk=invoice_id)
-    invoice.delete()
+    with transaction.atomic():
+        invoice = get_object_or_404(Invoice, pk=invoice_id)
+        invoice.delete()
     messages.success(request, "Invoice deleted successfully.")
     return redirect("admin_dashboard")
 
@@ -318,7 +504,8 @@ def edit_lesson(request, pk):
     if request.method == "POST":
         form = LessonScheduleForm(request.POST, instance=lesson)
         if form.is_valid():
-            form.save()
+            lesson = form.save()
+            sync_occurrences([lesson])
             messages.success(request, "Lesson updated successfully!")
             return redirect("admin_dashboard")  # Ensure proper redirection
     else:
@@ -334,7 +521,7 @@ def delete_lesson(request, pk):
     # Allow deletion by admin only
     if request.user.role != "admin":
         return HttpResponseForbidden("You are not authorized to delete this lesson.")
-    lesson.delete()
+    lesson.delete()  # its LessonOccurrence rows go with it via the cascade
     messages.success(request, "Lesson deleted successfully!")
     return redirect("admin_dashboard")
 
@@ -489,13 +676,14 @@ class FeedbackView(FormView):
         return reverse('dashboard')
 
     
+@query_budget(5)
 @login_required
 def admin_request_list(request):
     if not request.user.role == 'admin':
         return redirect('dashboard')
 
-    student_requests = StudentRequest.objects.filter(status='pending').order_by('created_at')
-    tutor_requests = TutorRequest.objects.all()  # show all tutor requests
+    student_requests = StudentRequest.objects.filter(status='pending').select_related('student').order_by('created_at')
+    tutor_requests = TutorRequest.objects.select_related('tutor')  # show all tutor requests
 
     return render(request, 'request_list.html', {
         'student_requests': student_requests,
@@ -503,58 +691,100 @@ def admin_request_list(request):
     })
 
 
+def _parse_pair_lines(text):
+    """Turn 'student_request_id, tutor_request_id, HH:MM, duration' lines into pair rows."""
+    fields = ('student_request_id', 'tutor_request_id', 'start_time', 'duration')
+    return [
+        dict(zip(fields, (value.strip() for value in line.split(','))))
+        for line in text.splitlines()
+        if line.strip()
+    ]
+
+
+@login_required
+@admin_required
+def pair_batch_requests(request):
+    """Pair many student requests with tutor slots in one request.
+
+    Accepts either a JSON body {"pairs": [{...}, ...]} and answers in JSON,
+    or the batch form on the request list with one pair per line.
+    """
+    if request.method != 'POST':
+        return redirect('admin_request_list')
+
+    wants_json = request.content_type == 'application/json'
+    try:
+        rows = json.loads(request.body)['pairs'] if wants_json else _parse_pair_lines(request.POST.get('pairs', ''))
+    except (ValueError, KeyError, TypeError):
+        rows = None
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        return JsonResponse({'error': 'Expected a JSON object with a "pairs" list of objects.'}, status=400)
+
+    try:
+        lessons = pair_batch(rows)
+    except BatchPairingError as error:
+        if wants_json:
+            return JsonResponse({'created': 0, 'errors': [{'row': row, 'error': message} for row, message in error.errors]}, status=400)
+        for row, message in error.errors:
+            messages.error(request, f"Line {row}: {message}")
+        return redirect('admin_request_list')
+
+    if wants_json:
+        return JsonResponse({'created': len(lessons), 'lessons': [lesson.id for lesson in lessons]})
+    messages.success(request, f"Paired {len(lessons)} requests.")
+    return redirect('admin_request_list')
+
+
+@query_budget(8)
 @login_required
 def pair_request(request, student_request_id, tutor_request_id):
     if not request.user.role == 'admin':
         return redirect('dashboard')
 
-    student_request = get_object_or_404(StudentRequest, id=student_request_id)
+    student_request = get_object_or_404(StudentRequest.objects.select_related('student'), id=student_request_id)
+    idempotency_key = request.POST.get('idempotency_key', '')
+    replayed = bool(idempotency_key) and IdempotencyKey.objects.filter(key=idempotency_key).exists()
 
-    if student_request.status != 'pending':
+    if student_request.status != 'pending' and not replayed:
         messages.error(request, "This student request cannot be paired as it is not in 'pending' status.")
         return redirect('admin_dashboard')
     
-    tutor_requests = TutorRequest.objects.filter(
-        status='available',
+    tutor_requests = TutorRequest.objects.filter(status='available').teaching(
+        student_request.language,
         day_of_week=student_request.day_of_week,
-        languages__icontains=student_request.language, 
-        level_can_teach=student_request.difficulty
+        level_can_teach=student_request.difficulty,
     )
-    tutor_request = None
     if request.method == 'POST':
         tutor_request_id = request.POST.get('tutor_request_id')
         start_time = request.POST.get('start_time')
         duration = request.POST.get('duration') # as string
-        day_of_week = student_request.day_of_week
-        frequency = student_request.frequency
 
         if tutor_request_id and start_time and duration:
             try:
                 duration = int(duration)
             except ValueError:
                 messages.error(request, "Duration must be an integer.")
-                return redirect('pair_request', student_request_id=student_request_id)
+                return redirect(request.path)
 
             tutor_request = get_object_or_404(TutorRequest, id=tutor_request_id)
 
-            
-            # create lesson schedule after pairing
-            LessonSchedule.objects.create(
-                tutor=tutor_request.tutor,
-                student=student_request.student,
-                subject=student_request.language,
-                day_of_week=day_of_week,
-                start_time=request.POST.get('start_time'),
-                duration=duration,
-                frequency=student_request.frequency,
-                status='scheduled'
-            )
-
-            student_request.status = 'approved'
-            student_request.save()
+            try:
+                start_time = parse_time(start_time)
+            except ValueError:
+                start_time = None
+            if start_time is None:
+                messages.error(request, "Start time must be a valid time.")
+                return redirect(request.path)
 
-            tutor_request.status = 'scheduled'
-            tutor_request.save()
+            # create lesson schedule after pairing, at most once per form submission
+            try:
+                pair_requests(
+                    student_request.id, tutor_request.id, start_time, duration,
+                    idempotency_key=idempotency_key or None,
+                )
+            except PairingError as error:
+                messages.error(request, str(error))
+                return redirect(request.path)
 
             messages.success(request, "Student and tutor paired successfully!")
             return redirect('admin_dashboard')
@@ -562,12 +792,55 @@ def pair_request(request, student_request_id, tutor_request_id):
             messages.error(request, "Please fill all fields.")
     
 
+    tutor_requests = list(tutor_requests.select_related('tutor'))
+    warm_availability([t_req.tutor_id for t_req in tutor_requests] + [student_request.student_id])
+    for t_req in tutor_requests:
+        t_req.suggested_times = suggest_start_times(
+            t_req.tutor_id, student_request.student_id, student_request.day_of_week, DEFAULT_DURATION, limit=4
+        )
+
     return render(request, 'pair_request.html', {
         'student_request': student_request,
         'tutor_requests': tutor_requests,
+        'idempotency_key': uuid4().hex,
     }) 
 
 
+@login_required
+@admin_required
+def auto_pair_requests(request):
+    """Pair every pending student request with an available tutor slot.
+
+    Small runs are solved within the request; a (language, day) group over
+    INLINE_GROUP_LIMIT is handed to the job queue instead.
+    """
+    if request.method != "POST":
+        return redirect('admin_dashboard')
+
+    if request.POST.get('queue'):
+        enqueue(request.user, 'auto_pair', priority='high')
+        messages.success(request, "Auto-pairing has been queued.")
+        return redirect('admin_dashboard')
+
+    dry_run = bool(request.POST.get('dry_run'))
+    try:
+        result = auto_pair(dry_run=dry_run, max_group=INLINE_GROUP_LIMIT)
+    except GroupTooLargeError as error:
+        if dry_run:
+            messages.error(request, f"{error} Queue auto-pairing to run it in the background.")
+        else:
+            enqueue(request.user, 'auto_pair', priority='high')
+            messages.success(request, f"{error} Auto-pairing has been queued instead.")
+        return redirect('admin_dashboard')
+    verb = "Would pair" if result.dry_run else "Paired"
+    messages.success(
+        request,
+        f"{verb} {result.matched} of {result.pending} pending requests "
+        f"({result.match_rate:.0%}) in {result.seconds:.2f}s."
+    )
+    return redirect('admin_dashboard')
+
+
 @login_required
 def submit_student_request(request):
     if request.method == "POST":
@@ -602,14 +875,20 @@ def submit_tutor_request(request):
 
 @login_required
 def cancel_lesson(request, lesson_id):
-    lesson = get_object_or_404(LessonSchedule, id=lesson_id)
+    lesson = get_object_or_404(LessonSchedule.objects.select_related('tutor', 'student'), id=lesson_id)
 
     if request.user != lesson.student and request.user != lesson.tutor:
         messages.error(request, "You are not authorised to cancel this lesson.")
         return redirect('dashboard')
     if request.method == "POST":
+        was_scheduled = lesson.status == 'scheduled'
         lesson.status = 'cancelled'
         lesson.save()
+        sync_occurrences([lesson])
+        if was_scheduled and settings.AUTO_REMATCH:
+            rematch_cancelled_lesson(lesson)
+        elif was_scheduled:
+            reopen_slot(lesson)  # the slot waits for the next pairing run
 
         messages.success(request, f"Lesson '{lesson.subject}' has been cancelled.")
         return redirect('dashboard')
@@ -617,6 +896,7 @@ def cancel_lesson(request, lesson_id):
     return render(request, 'cancel_lesson.html', {'lesson': lesson})
 
 
+@query_budget(12)
 @login_required
 def cancel_student_request(request, request_id):
     student_request = get_object_or_404(StudentRequest, id=request_id, student=request.user)